@@ -14,6 +14,9 @@ from ..crawlers.dedup import today_news_cache
 from ..crawlers.url_cache import url_cache
 from ..crawlers.source_tester import SourceTester
 from ..storage.timeline_db import TimelineDB
+from ..crawlers.tokenizer import tokenizer
+from ..crawlers.workers import worker_pool
+from ..scheduler.store import CrawlSpanStore
 from fastapi_cache import FastAPICache
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -83,11 +86,45 @@ async def get_cache_stats() -> Dict[str, Any]:
         "data": {
             "backend": type(backend).__name__,
             "prefix": "sfapi-cache",
-            "note": "InMemoryBackend does not provide detailed stats"
+            "note": "InMemoryBackend does not provide detailed stats; see /metrics for crawler cache hit ratios"
         }
     }
 
 
+@router.get("/metrics")
+async def get_crawl_metrics(runs: int = 20, run_id: str = None) -> Dict[str, Any]:
+    """获取抓取各阶段耗时与条数
+
+    Args:
+        runs: 汇总最近几轮抓取（默认 20）
+        run_id: 可选，返回指定一轮的全部 span（默认最近一轮）
+    """
+    store = CrawlSpanStore()
+    recent = store.get_recent_runs(runs)
+    run_id = run_id or (recent[0] if recent else None)
+    return {
+        "code": 200,
+        "data": {
+            "runs": len(recent),
+            "stages": store.get_stage_stats(runs),
+            "run_id": run_id,
+            "spans": store.get_run_spans(run_id) if run_id else [],
+        }
+    }
+
+
+@router.get("/tokenizer/stats")
+async def get_tokenizer_stats() -> Dict[str, Any]:
+    """获取分词服务统计（词典预加载状态、分词缓存命中率）
+
+    命中统计为服务进程与各工作进程合计（工作进程计数截至其最近一次指纹任务）
+    """
+    return {
+        "code": 200,
+        "data": tokenizer.stats(worker_pool.tokenizer_stats())
+    }
+
+
 @router.post("/cache/clear")
 async def clear_api_cache() -> Dict[str, Any]:
     """清除 API 缓存"""
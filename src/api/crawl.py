@@ -4,15 +4,25 @@
 """
 
 import asyncio
-from datetime import date, datetime
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException
 
 from ..config import ConfigReader
+from ..crawlers.body_fetcher import BodyFetcher
 from ..crawlers.dedup import TextDeduplicator
+from ..crawlers.pipeline import Pipeline
+from ..crawlers.resilient import CircuitOpenError, breaker_states, request_metrics
+from ..crawlers.response_cache import response_cache
+from ..crawlers.spans import SpanRecorder, article_bytes
+from ..crawlers.watermark import WatermarkStore
+from ..crawlers.workers import worker_pool
 from ..crawlers.universal import UniversalCrawler
+from ..metrics import crawl_source_fetches_total
 from ..models import Article
+from ..scheduler.store import CrawlSpanStore
 from ..storage import TimelineDB
 
 router = APIRouter(prefix="/api/crawl", tags=["crawl"])
@@ -21,21 +31,30 @@ router = APIRouter(prefix="/api/crawl", tags=["crawl"])
 _last_crawl_time: Optional[datetime] = None
 # 最小抓取间隔（秒）
 MIN_CRAWL_INTERVAL = 30  # 30秒
+# 正文抓取模式：survivors 只抓去重筛选后的新文章 | all 抓全部 | none 不抓
+FETCH_BODIES_MODES = ("survivors", "all", "none")
 
 
-async def run_crawl(source_id: str = None) -> Dict[str, Any]:
+async def run_crawl(source_id: str = None, fetch_bodies: str = None) -> Dict[str, Any]:
     """执行抓取任务
 
     使用通用爬虫框架，支持动态加载解析器。
 
-    流程：
-    1. 并发抓取所有启用的新闻源
+    流程（流式，见 crawlers.pipeline）：
+    1. 并发抓取所有启用的新闻源（只抓列表）
     2. 四层去重（时间、URL、标题相似度、批次内）
     3. keywords 筛选
-    4. 统一入库
+    4. 只为筛选后的新文章抓取正文
+    5. 入库并推进水位
+
+    每个新闻源的列表到达后立即进入 2~5，不等待最慢的新闻源；
+    阶段之间是有界队列，下游处理不过来时上游等待。
+    去重与筛选只用标题/URL/时间，通常会丢弃大部分文章，
+    正文放在最后抓取可省去绝大多数正文请求。
 
     Args:
         source_id: 指定新闻源ID，None表示抓取所有启用的源
+        fetch_bodies: 正文抓取模式 survivors / all / none（默认从配置读取）
 
     Returns:
         抓取结果统计
@@ -45,6 +64,10 @@ async def run_crawl(source_id: str = None) -> Dict[str, Any]:
     sources_config = reader.load_news_sources_config()
     crawler_config = reader.load_crawler_config()
 
+    fetch_bodies = fetch_bodies or crawler_config.content_fetch.fetch_bodies
+    if fetch_bodies not in FETCH_BODIES_MODES:
+        raise ValueError(f"未知的正文抓取模式: {fetch_bodies}，可选 {', '.join(FETCH_BODIES_MODES)}")
+
     # 获取启用的新闻源
     enabled_sources = [s for s in sources_config.sources if s.enabled]
     if source_id:
@@ -52,20 +75,37 @@ async def run_crawl(source_id: str = None) -> Dict[str, Any]:
 
     # 并发数配置
     concurrent_limit = crawler_config.strategy.concurrent
+    # 各新闻源共用一个正文抓取器（全局并发与每主机限速跨源统一计算）
+    body_fetcher = BodyFetcher(crawler_config.content_fetch)
+
+    # 增量抓取：各新闻源水位
+    watermarks = WatermarkStore(crawler_config.storage.db_path) if crawler_config.strategy.incremental else None
+
+    def _create_crawler(source, since: datetime = None) -> UniversalCrawler:
+        return UniversalCrawler(
+            source,
+            news_batch_limit=crawler_config.strategy.news_batch_limit,
+            body_fetcher=body_fetcher,
+            network=crawler_config.network,
+            since=since,
+        )
 
     # 统计数据
-    all_articles: List[Article] = []
-    source_results = []
+    source_results: Dict[str, Dict[str, Any]] = {}
+    totals = {"fetched": 0, "after_dedup": 0, "bodies_fetched": 0, "saved": 0}
+    # 各阶段耗时与条数（结束后写入调度器数据库，见 /admin/metrics）
+    spans = SpanRecorder()
 
     async def fetch_single_source(source):
         """抓取单个新闻源"""
         crawler = None
         try:
             print(f"[Crawl] 开始抓取: {source.name} ({source.id})")
-            crawler = UniversalCrawler(source)
+            since = watermarks.since(source.id) if watermarks else None
+            crawler = _create_crawler(source, since=since)
 
-            # 抓取文章
-            articles = await crawler.fetch()
+            # 抓取文章（survivors / none 模式下只抓列表）
+            articles = await crawler.fetch(fetch_contents=fetch_bodies == "all")
 
             print(f"[Crawl] {source.name}: 抓取 {len(articles)} 条")
             # 打印每篇文章的详细信息
@@ -76,10 +116,21 @@ async def run_crawl(source_id: str = None) -> Dict[str, Any]:
                 "source": source.name,
                 "id": source.id,
                 "fetched": len(articles),
+                "bytes": crawler.http.bytes_received,
                 "status": "success",
                 "articles": articles
             }
 
+        except CircuitOpenError as e:
+            print(f"[Crawl] 跳过: {source.name} - {e}")
+            return {
+                "source": source.name,
+                "id": source.id,
+                "status": "skipped",
+                "error": str(e),
+                "articles": []
+            }
+
         except ImportError as e:
             print(f"[Crawl] 解析器不存在: {source.id} - {e}")
             return {
@@ -106,125 +157,225 @@ async def run_crawl(source_id: str = None) -> Dict[str, Any]:
             if crawler:
                 await crawler.close()
 
-    # 并发抓取（限制并发数）
-    semaphore = asyncio.Semaphore(concurrent_limit)
-
-    async def fetch_with_semaphore(source):
-        async with semaphore:
-            return await fetch_single_source(source)
-
-    results = await asyncio.gather(
-        *[fetch_with_semaphore(s) for s in enabled_sources],
-        return_exceptions=True
-    )
-
-    # 整理结果
-    for result in results:
-        if isinstance(result, Exception):
-            print(f"[Crawl] 任务异常: {result}")
-            continue
-
-        source_results.append({
-            "source": result["source"],
-            "id": result["id"],
-            "fetched": result["fetched"],
-            "status": result["status"]
-        })
-
-        if result["status"] == "success":
-            all_articles.extend(result["articles"])
-
-    print(f"[Crawl] 总抓取: {len(all_articles)} 条")
-
-    # 四层去重：时间 → URL → 标题 → 批次内
-    original_count = len(all_articles)
-    if all_articles:
-        deduplicator = TextDeduplicator()
-        deduped_articles = deduplicator.dedup(all_articles)
-        print(f"[Crawl] 去重: {original_count} -> {len(deduped_articles)} 条")
-    else:
-        deduped_articles = []
-
-    # 第五层：keywords 筛选
-    if deduped_articles:
-        from ..crawlers.keywords_filter import filter_by_keywords
-        keyword_filtered = filter_by_keywords(deduped_articles)
-        print(f"[Crawl] keywords筛选: {len(deduped_articles)} -> {len(keyword_filtered)} 条")
-        deduped_articles = keyword_filtered
-
-    # 统一入库
-    saved_count = 0
+    # 流式处理：每个新闻源的列表到达后立即去重、筛选、抓正文、入库，
+    # 不等待其他新闻源；去重经 today_news_cache 的锁保证跨批次一致
     db = TimelineDB(date.today())
     db.init_db()
-
-    # 读取存储配置（已在开头读取 crawler_config）
+    deduplicator = TextDeduplicator()
+    sources_by_id = {s.id: s for s in enabled_sources}
     save_content = crawler_config.storage.save_content
 
-    for article in deduped_articles:
+    async def fetch_stage(source) -> Dict[str, Any]:
+        response_cache.discard(source.id)  # 上轮未入库的暂存校验信息作废
+        with spans.span("list_fetch", source.id) as span:
+            result = await fetch_single_source(source)
+            span.items_out = result.get("fetched", 0)
+            span.bytes = result.get("bytes", 0)
+            if result["status"] != "success":
+                span.status = result["status"]
+                span.error = result.get("error")
+        crawl_source_fetches_total.inc(source=source.id, status=result["status"])
+        source_results[source.id] = {
+            "source": result["source"],
+            "id": result["id"],
+            "fetched": result.get("fetched", 0),
+            "status": result["status"]
+        }
+        if result["status"] != "success":
+            return None
+        totals["fetched"] += len(result["articles"])
+        return result
+
+    async def dedup_stage(result: Dict[str, Any]) -> Dict[str, Any]:
+        articles = result["articles"]
+        # 四层去重：时间 → URL → 标题 → 批次内（标题指纹在进程池中计算）
+        if articles:
+            fingerprints = None
+            if worker_pool.enabled:
+                with spans.span("dedup.fingerprint", result["id"], items_in=len(articles)) as span:
+                    values = await worker_pool.fingerprint_titles([a.title for a in articles])
+                    span.items_out = len(values)
+                    span.bytes = article_bytes(articles)
+                fingerprints = {id(a): fp for a, fp in zip(articles, values)}
+            deduped = deduplicator.dedup(articles, fingerprints, spans=spans)
+            print(f"[Crawl] {result['source']} 去重: {len(articles)} -> {len(deduped)} 条")
+        else:
+            deduped = []
+
+        # 第五层：keywords 筛选
+        if deduped:
+            from ..crawlers.keywords_filter import filter_by_keywords
+            with spans.span("keyword_filter", result["id"], items_in=len(deduped)) as span:
+                span.bytes = article_bytes(deduped)
+                keyword_filtered = filter_by_keywords(deduped)
+                span.items_out = len(keyword_filtered)
+            print(f"[Crawl] {result['source']} keywords筛选: {len(deduped)} -> {len(keyword_filtered)} 条")
+            deduped = keyword_filtered
+        totals["after_dedup"] += len(deduped)
+
+        # 一次集合查询找出新文章（走 url UNIQUE 索引）
+        existing_urls = db.existing_urls([a.url for a in deduped])
+        result["new_articles"] = [a for a in deduped if a.url not in existing_urls]
+        return result
+
+    async def body_stage(result: Dict[str, Any]) -> Dict[str, Any]:
+        # 只为幸存的新文章抓取正文
+        new_articles = result["new_articles"]
+        if fetch_bodies == "survivors" and new_articles:
+            with spans.span("body_fetch", result["id"], items_in=len(new_articles)) as span:
+                span.bytes = await _fetch_survivor_bodies(new_articles, sources_by_id, _create_crawler)
+                span.items_out = sum(1 for a in new_articles if a.content)
+        return result
+
+    async def store_stage(result: Dict[str, Any]) -> Dict[str, Any]:
+        new_articles = result["new_articles"]
+        for article in new_articles:
+            print(f"[Crawl] 准备入库: {article.title[:40]}..., content={'有' if article.content else '无'}")
+
+        # 保存正文文件
+        with_content = [a for a in new_articles if a.content]
+        if save_content and with_content:
+            with spans.span("file_write", result["id"], items_in=len(with_content)) as span:
+                for article in with_content:
+                    try:
+                        article.file_path = _save_content_file(article)
+                        span.items_out += 1
+                        span.bytes += Path(article.file_path).stat().st_size
+                    except Exception as e:
+                        print(f"[Crawl] 正文保存失败: {article.title} - {e}")
+        totals["bodies_fetched"] += len(with_content)
+
+        # 按新闻源单事务批量入库（到达即提交）
+        insert_ok = True
+        saved = 0
         try:
-            # 检查是否已存在
-            if not db.article_exists(article.url):
-                print(f"[Crawl] 准备入库: {article.title[:40]}..., content={'有' if article.content else '无'}")
-
-                # 保存正文文件
-                if save_content and article.content:
-                    from pathlib import Path
-
-                    # 生成文件路径: data/articles/YYYY/MM/DD/标题.md
-                    article_date = (
-                        article.publish_time.date()
-                        if hasattr(article.publish_time, 'date')
-                        else date.today()
-                    )
-                    filename = (
-                        article.title[:50]
-                        .replace('/', '-')
-                        .replace('\\', '-')
-                        .replace(':', '-')
-                        .replace('*', '-')
-                        .replace('?', '-')
-                        .replace('"', '-')
-                        .replace('<', '-')
-                        .replace('>', '-')
-                        .replace('|', '-')
-                    )
-                    filename = filename.strip()
-                    file_dir = Path(f"data/articles/{article_date.strftime('%Y/%m/%d')}")
-                    file_dir.mkdir(parents=True, exist_ok=True)
-                    file_path = file_dir / f"{filename}.md"
-
-                    # 写入正文
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(f"# {article.title}\n\n")
-                        f.write(f"> 来源: {article.source}\n")
-                        f.write(f"> 时间: {article.publish_time}\n")
-                        f.write(f"> URL: {article.url}\n\n")
-                        f.write(article.content)
-
-                    article.file_path = str(file_path)
-
-                db.insert_article(article)
-                saved_count += 1
+            with spans.span("db_insert", result["id"], items_in=len(new_articles)) as span:
+                span.bytes = article_bytes(new_articles, content=True)
+                bulk_result = db.insert_articles_bulk(new_articles)
+                saved = span.items_out = len(bulk_result["inserted"])
         except Exception as e:
-            print(f"[Crawl] 入库失败: {article.title} - {e}")
+            insert_ok = False
+            print(f"[Crawl] {result['source']} 入库失败: {e}")
+        totals["saved"] += saved
+        print(f"[Crawl] {result['source']} 入库: {saved} 条")
+
+        # 入库成功后推进该新闻源水位、列表校验信息生效（入库失败时都不推进，下轮重新解析）
+        if insert_ok:
+            response_cache.commit(result["id"])
+            if watermarks:
+                watermarks.advance(result["id"], result["articles"])
+        else:
+            response_cache.discard(result["id"])
+        return result
+
+    pipeline = Pipeline(queue_size=crawler_config.strategy.queue_size)
+    pipeline.add_stage("fetch", fetch_stage, workers=concurrent_limit)
+    pipeline.add_stage("dedup", dedup_stage)
+    pipeline.add_stage("bodies", body_stage, workers=concurrent_limit)
+    pipeline.add_stage("store", store_stage)
+    await pipeline.run(enabled_sources)
+    # 抓取失败、或在去重/正文阶段出错而未入库的新闻源：丢弃暂存的列表校验信息
+    for source in enabled_sources:
+        response_cache.discard(source.id)
+
+    print(f"[Crawl] 总抓取: {totals['fetched']} 条，入库: {totals['saved']} 条")
 
-    print(f"[Crawl] 入库: {saved_count} 条")
+    try:
+        CrawlSpanStore(crawler_config.storage.db_path).record_spans(spans)
+    except Exception as e:
+        print(f"[Crawl] 阶段记录保存失败: {e}")
 
     return {
-        "total_fetched": original_count,
-        "after_dedup": len(deduped_articles),
-        "total_saved": saved_count,
-        "sources": source_results,
+        "run_id": spans.run_id,
+        "total_fetched": totals["fetched"],
+        "after_dedup": totals["after_dedup"],
+        "bodies_fetched": totals["bodies_fetched"],
+        "total_saved": totals["saved"],
+        "sources": [source_results[s.id] for s in enabled_sources if s.id in source_results],
     }
 
 
+async def _fetch_survivor_bodies(articles: List[Article], sources_by_id: Dict[str, Any],
+                                 create_crawler) -> int:
+    """按新闻源分组抓取正文（各源并发，共用正文抓取器的限速）
+
+    Returns:
+        下载的正文页字节数
+    """
+    groups: Dict[str, List[Article]] = {}
+    for article in articles:
+        source_id = getattr(article.source, "value", article.source)
+        groups.setdefault(source_id, []).append(article)
+
+    async def fetch_group(source_id: str, group: List[Article]):
+        source = sources_by_id.get(source_id)
+        if source is None:
+            return
+        try:
+            async with create_crawler(source) as crawler:
+                try:
+                    await crawler.fetch_contents(group)
+                finally:
+                    received.append(crawler.http.bytes_received)
+        except Exception as e:
+            print(f"[Crawl] 正文抓取失败: {source.name} - {e}")
+
+    received: List[int] = []
+    await asyncio.gather(*(fetch_group(sid, group) for sid, group in groups.items()))
+    fetched = sum(1 for a in articles if a.content)
+    print(f"[Crawl] 正文抓取: {fetched}/{len(articles)} 条")
+    return sum(received)
+
+
+def _save_content_file(article: Article) -> str:
+    """保存正文到 data/articles/YYYY/MM/DD/标题.md
+
+    Returns:
+        文件路径
+    """
+    # 生成文件路径: data/articles/YYYY/MM/DD/标题.md
+    article_date = (
+        article.publish_time.date()
+        if hasattr(article.publish_time, 'date')
+        else date.today()
+    )
+    filename = (
+        article.title[:50]
+        .replace('/', '-')
+        .replace('\\', '-')
+        .replace(':', '-')
+        .replace('*', '-')
+        .replace('?', '-')
+        .replace('"', '-')
+        .replace('<', '-')
+        .replace('>', '-')
+        .replace('|', '-')
+    )
+    filename = filename.strip()
+    file_dir = Path(f"data/articles/{article_date.strftime('%Y/%m/%d')}")
+    file_dir.mkdir(parents=True, exist_ok=True)
+    file_path = file_dir / f"{filename}.md"
+
+    # 写入正文
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(f"# {article.title}\n\n")
+        f.write(f"> 来源: {article.source}\n")
+        f.write(f"> 时间: {article.publish_time}\n")
+        f.write(f"> URL: {article.url}\n\n")
+        f.write(article.content)
+
+    return str(file_path)
+
+
 @router.post("/trigger")
-async def trigger_crawl(source_id: str = None, force: bool = False) -> Dict[str, Any]:
+async def trigger_crawl(source_id: str = None, force: bool = False,
+                        fetch_bodies: str = None) -> Dict[str, Any]:
     """手动触发抓取
 
     Args:
         source_id: 可选，指定抓取的新闻源ID
         force: 是否强制跳过频率限制（默认否）
+        fetch_bodies: 可选，正文抓取模式 survivors / all / none（默认从配置读取）
 
     Returns:
         抓取结果统计
@@ -245,8 +396,11 @@ async def trigger_crawl(source_id: str = None, force: bool = False) -> Dict[str,
                 },
             }
 
+    if fetch_bodies and fetch_bodies not in FETCH_BODIES_MODES:
+        raise HTTPException(status_code=400, detail=f"未知的正文抓取模式: {fetch_bodies}")
+
     try:
-        result = await run_crawl(source_id)
+        result = await run_crawl(source_id, fetch_bodies=fetch_bodies)
 
         # 更新最后刷新时间
         _last_crawl_time = datetime.now()
@@ -278,15 +432,20 @@ async def get_crawl_status() -> Dict[str, Any]:
 
     db = TimelineDB(date.today())
     db.init_db()
-    articles = db.list_articles(limit=1000)
+    # 使用北京时间（UTC+8）获取今日日期，COUNT 走 publish_time 索引范围扫描
+    today = datetime.now(timezone(timedelta(hours=8))).date().isoformat()
+    today_count = db.count_articles(start_date=today, end_date=today)
 
     return {
         "code": 200,
         "message": "success",
         "data": {
-            "today_count": len(articles),
+            "today_count": today_count,
             "date": date.today().isoformat(),
             "last_crawl_time": _last_crawl_time.isoformat() if _last_crawl_time else None,
+            "circuit_breakers": breaker_states(),
+            "requests": request_metrics.snapshot(),
+            "response_cache": response_cache.stats(),
         },
     }
 
@@ -315,3 +474,20 @@ async def clear_cache() -> Dict[str, Any]:
         "message": "缓存已清空",
         "data": {"cache_date": str(url_cache.cache_date), "url_count": url_cache.count},
     }
+
+
+@router.get("/watermarks")
+async def get_watermarks() -> Dict[str, Any]:
+    """获取各新闻源增量抓取水位"""
+    return {"code": 200, "message": "success", "data": WatermarkStore().get_all()}
+
+
+@router.post("/watermarks/reset")
+async def reset_watermarks(source_id: str = None) -> Dict[str, Any]:
+    """清除增量抓取水位（下次抓取全量解析）
+
+    Args:
+        source_id: 可选，指定新闻源ID，默认清除全部
+    """
+    removed = WatermarkStore().reset(source_id)
+    return {"code": 200, "message": f"已清除 {removed} 个水位", "data": {"removed": removed}}
@@ -89,6 +89,8 @@ class StrategyConfig(BaseModel):
     min_interval: int  # 最小抓取间隔限制
     concurrent: int  # 并发抓取数量
     news_batch_limit: int = 20  # 每个新闻源每次抓取的条数限制
+    incremental: bool = True  # 增量抓取：按新闻源水位跳过已见过的条目
+    queue_size: int = 4  # 流水线阶段间队列长度（下游处理不过来时上游等待）
 
 
 class NetworkConfig(BaseModel):
@@ -96,7 +98,42 @@ class NetworkConfig(BaseModel):
     timeout: int = 30
     retry: int = 3
     retry_delay: int = 5
+    retry_backoff_max: float = 30.0  # 指数退避的最大间隔（秒）
+    retry_budget: float = 25.0  # 单次请求（含全部重试与退避）的总时长上限（秒）
+    circuit_failure_threshold: int = 3  # 连续失败多少次后熔断该新闻源
+    circuit_cooldown: int = 300  # 熔断冷却时间（秒），期间跳过该新闻源
     user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    # 共享连接池（跨抓取轮次复用）
+    http2: bool = True  # 需安装 h2，未安装时自动回退 HTTP/1.1
+    max_connections: int = 50  # 全局连接上限
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 120.0  # 空闲连接保持时间（秒）
+    per_host_connections: int = 6  # 每主机并发请求上限
+    dns_cache_ttl: int = 300  # DNS 缓存时间（秒）
+
+
+class ContentFetchConfig(BaseModel):
+    """正文抓取配置（并发抓取文章正文）"""
+    fetch_bodies: str = "survivors"  # survivors: 只抓去重筛选后的新文章 | all: 抓取全部 | none: 不抓
+    concurrency: int = 8  # 全局并发上限
+    per_host: int = 4  # 每主机并发上限
+    rate_per_host: float = 5.0  # 每主机每秒请求数（令牌桶，<=0 不限速）
+    burst: int = 5  # 令牌桶容量（允许的瞬时突发）
+    request_timeout: float = 15.0  # 单篇正文请求截止时间（秒）
+    total_timeout: float = 60.0  # 单个新闻源正文抓取总截止时间（秒），超时未完成的请求被取消
+
+
+class WorkersConfig(BaseModel):
+    """进程池配置（正文解析与标题指纹计算移出事件循环）"""
+    enabled: bool = True
+    max_workers: int = 2  # 工作进程数（0 表示禁用，在当前进程内执行）
+    batch_size: int = 16  # 每个任务处理的条数
+
+
+class TokenizerConfig(BaseModel):
+    """分词配置（jieba 词典预加载与分词结果缓存）"""
+    cache_size: int = 4096  # 分词结果缓存条数（0 表示不缓存）
+    dict_cache: Optional[str] = None  # 前缀词典缓存文件（为空时使用 jieba 默认的系统临时目录）
 
 
 class StorageConfig(BaseModel):
@@ -120,3 +157,6 @@ class CrawlerConfig(BaseModel):
     network: NetworkConfig
     storage: StorageConfig
     logging: LoggingConfig
+    content_fetch: ContentFetchConfig = Field(default_factory=ContentFetchConfig)
+    workers: WorkersConfig = Field(default_factory=WorkersConfig)
+    tokenizer: TokenizerConfig = Field(default_factory=TokenizerConfig)
@@ -7,11 +7,17 @@ import asyncio
 import sys
 
 from src.api.crawl import run_crawl
+from src.crawlers.http_client import http_client_manager
+from src.crawlers.workers import worker_pool
 
 
 async def main():
     """运行爬虫（独立 CLI 入口）"""
-    result = await run_crawl()
+    try:
+        result = await run_crawl()
+    finally:
+        await http_client_manager.aclose()
+        worker_pool.shutdown()
 
     # 打印结果摘要
     print(f"\n抓取完成:")
@@ -1,63 +1,38 @@
 """爬虫基类"""
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Set
+from typing import List, Dict
 import httpx
 from pathlib import Path
 
 from ..models import Article
-from ..config import ConfigReader
+from .keyword_index import get_keyword_index
+from .http_client import http_client_manager
 
 
 class BaseCrawler(ABC):
     """爬虫基类"""
 
-    def __init__(self, timeout: int = 30, config_dir: str = "config"):
+    def __init__(self, timeout: int = 30, config_dir: str = "config", client: httpx.AsyncClient = None):
         self.timeout = timeout
-        self.client = httpx.AsyncClient(
-            timeout=timeout,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-        )
-        # 加载关键词配置
-        self._keywords = self._load_keywords(config_dir)
-
-    def _load_keywords(self, config_dir: str) -> Dict[str, List[str]]:
-        """从配置文件加载关键词"""
-        try:
-            reader = ConfigReader(config_dir)
-            config = reader.load_news_keywords_config()
-
-            # 展平所有关键词
-            all_keywords: Set[str] = set()
-
-            # 人物关键词
-            for person_keywords in config.get("people", {}).values():
-                all_keywords.update(person_keywords)
-
-            # 公司关键词
-            for company_keywords in config.get("companies", {}).values():
-                all_keywords.update(company_keywords)
-
-            # 话题关键词
-            for topic_group in config.get("topics", []):
-                all_keywords.update(topic_group)
-
-            return {
-                "people": config.get("people", {}),
-                "companies": config.get("companies", {}),
-                "topics": config.get("topics", []),
-                "all": list(all_keywords)
-            }
-        except Exception as e:
-            print(f"Warning: Failed to load keywords config: {e}")
-            return {"all": []}
+        # 借用进程级共享客户端（超时在请求时按 self.timeout 指定）
+        self.client = client or http_client_manager.get_client()
+        # 关键词由关键词索引统一维护（可热更新），不再每次解析 YAML
+        self._keyword_index = get_keyword_index(config_dir)
+
+    def _load_keywords(self) -> Dict[str, List[str]]:
+        """获取关键词索引当前版本的关键词"""
+        snapshot = self._keyword_index.snapshot()
+        return {
+            "legend": snapshot.original.get("legend", {}),
+            "front": snapshot.original.get("front", []),
+            "all": snapshot.all_keywords,
+        }
 
     @property
     def keywords(self) -> List[str]:
         """获取所有关键词（用于过滤）"""
-        return self._keywords.get("all", [])
+        return self._keyword_index.snapshot().all_keywords
 
     @abstractmethod
     async def fetch(self) -> List[Article]:
@@ -166,8 +141,8 @@ class BaseCrawler(ABC):
         return True
 
     async def close(self):
-        """关闭 HTTP 客户端"""
-        await self.client.aclose()
+        """释放爬虫（客户端为借用的共享客户端，不在此关闭）"""
+        self.client = None
 
     async def __aenter__(self):
         return self
@@ -0,0 +1,120 @@
+"""文章正文并发抓取
+
+把逐篇串行的 fetch_content 改为有界并发：
+- 全局并发上限 + 每主机并发上限（信号量）
+- 每主机令牌桶限速，避免并发后对单个站点突发请求
+- 单篇请求截止时间；整体截止时间到达后取消未完成的请求
+
+一个新闻源的正文抓取耗时从"各篇往返时间之和"降为接近"最慢的一篇"。
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from ..config.models import ContentFetchConfig
+from ..models import Article
+
+
+class TokenBucket:
+    """令牌桶限速器（rate 个/秒，容量 capacity）"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """取一个令牌（不足时等待补充）"""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class BodyFetcher:
+    """正文并发抓取器
+
+    同一轮抓取的各新闻源共用一个实例，限速按主机统一计算
+    """
+
+    def __init__(self, config: ContentFetchConfig = None):
+        self.config = config or ContentFetchConfig()
+        self._global = asyncio.Semaphore(max(1, self.config.concurrency))
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _host_limits(self, url: str):
+        """获取主机的 (信号量, 令牌桶)"""
+        host = urlsplit(url).hostname or ""
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(max(1, self.config.per_host))
+            self._buckets[host] = TokenBucket(self.config.rate_per_host, self.config.burst)
+        return semaphore, self._buckets[host]
+
+    async def _fetch_one(self, article: Article, fetch: Callable[[str], Awaitable[Optional[str]]]) -> bool:
+        """抓取单篇正文（结果写入 article.content）"""
+        host_semaphore, bucket = self._host_limits(article.url)
+        async with self._global, host_semaphore:
+            await bucket.acquire()
+            try:
+                article.content = await asyncio.wait_for(
+                    fetch(article.url), timeout=self.config.request_timeout
+                )
+                return True
+            except asyncio.TimeoutError:
+                print(f"Timeout fetching content for {article.url} ({self.config.request_timeout}s)")
+            except Exception as e:
+                print(f"Error fetching content for {article.url}: {e}")
+            article.content = None
+            return False
+
+    async def fetch_all(
+        self,
+        articles: List[Article],
+        fetch: Callable[[str], Awaitable[Optional[str]]],
+    ) -> Dict[str, int]:
+        """并发抓取一批文章的正文
+
+        Args:
+            articles: 文章列表（正文写入 article.content）
+            fetch: 抓取函数 url -> 正文
+
+        Returns:
+            {"fetched": 成功数, "failed": 失败/超时数, "cancelled": 因总截止时间取消数}
+        """
+        stats = {"fetched": 0, "failed": 0, "cancelled": 0}
+        if not articles:
+            return stats
+
+        tasks = {asyncio.create_task(self._fetch_one(a, fetch)): a for a in articles}
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=self.config.total_timeout)
+        finally:
+            # 总截止时间到达或外层被取消：取消所有未完成的请求
+            unfinished = [t for t in tasks if not t.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+
+        for task in done:
+            stats["fetched" if task.result() else "failed"] += 1
+        for task in pending:
+            tasks[task].content = None
+            stats["cancelled"] += 1
+
+        if stats["cancelled"]:
+            print(f"[BodyFetcher] 超过总截止时间 {self.config.total_timeout}s，取消 {stats['cancelled']} 篇")
+        return stats
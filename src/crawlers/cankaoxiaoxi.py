@@ -24,7 +24,7 @@ class CankaoxiaoxiCrawler(BaseCrawler):
 
         for channel in self.channels:
             try:
-                response = await self.client.get(self.base_url.format(channel))
+                response = await self.client.get(self.base_url.format(channel), timeout=self.timeout)
                 response.raise_for_status()
                 data = response.json()
 
@@ -3,24 +3,51 @@
 实现4层去重策略：
 1. 时间排重：只保留今天的文章
 2. URL排重：与 today_news 中的 URL 对比
-3. 标题近似排重：与 today_news 中的标题做 SimHash 对比
+3. 标题近似排重：与 today_news 中的标题做 SimHash 对比（分段索引查找）
 4. 批次内排重：本批次内的文章再互相做标题近似排重
 """
 
 from datetime import date, datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 from simhash import Simhash
-import jieba
 import threading
 
 from ..models import Article
 from ..storage import TimelineDB
 from ..tools import TitleCleaner
+from .tokenizer import tokenizer
 from .url_cache import url_cache
+from .simhash_index import SimhashIndex
+from .simhash_backend import HAS_NUMPY, HammingMatrix, greedy_unique
+from .spans import SpanRecorder, article_bytes
+from ..metrics import dedup_dropped_total
+
+
+# SimHash 汉明距离阈值（越大越宽松）
+# 对于20字的中文标题，汉明距离15表示前半部分相同
+SIMHASH_THRESHOLD = 15
+
+
+def compute_simhash(text: str) -> Simhash:
+    """计算标题的 SimHash 值
+
+    使用 jieba 分词提取关键词作为特征（分词结果按清理后的标题缓存）
+    只取前20个字用于去重，只保留中英文数字
+    """
+    # 使用 TitleCleaner 清理标题（默认20个字）
+    text = TitleCleaner.for_dedup(text)
+    # 使用 jieba 分词
+    words = tokenizer.cut(text)
+    return Simhash(words)
+
+
+def title_fingerprint(title: str) -> int:
+    """标题的 64 位 SimHash 指纹"""
+    return compute_simhash(title).value
 
 
 class TodayNewsCache:
-    """今日新闻缓存 - 存储 {url: title}，每天0点清空"""
+    """今日新闻缓存 - 存储 {url: title} 及标题指纹索引，每天0点清空"""
 
     _instance = None
     _lock = threading.Lock()
@@ -41,6 +68,10 @@ class TodayNewsCache:
 
         self._cache_date: date = date.today()
         self._news: Dict[str, str] = {}  # {url: title}
+        self._index = SimhashIndex(threshold=SIMHASH_THRESHOLD)  # {url: 标题指纹}
+        self._matrix: Optional[HammingMatrix] = None  # numpy 后端的指纹矩阵（懒构建）
+        # 查重 + 写入需原子执行：多个批次（流式抓取的各新闻源、并发的抓取任务）共用同一索引
+        self.lock = threading.RLock()
         self._initialized = True
 
     def _check_and_reset(self):
@@ -49,18 +80,35 @@ class TodayNewsCache:
         if self._cache_date != today:
             self._cache_date = today
             self._news.clear()
+            self._index.clear()
+            self._matrix = None
             print(f"[TodayNewsCache] 缓存已清零，新日期: {today}")
 
-    def add(self, url: str, title: str):
+    def _put(self, url: str, title: str, fingerprint: Optional[int] = None):
+        """写入一条（指纹只在入缓存时计算一次）"""
+        if fingerprint is None:
+            fingerprint = title_fingerprint(title)
+        self._news[url] = title
+        self._index.add(url, fingerprint)
+        self._matrix = None
+
+    def add(self, url: str, title: str, fingerprint: Optional[int] = None):
         """添加新闻到缓存"""
         self._check_and_reset()
-        self._news[url] = title
+        self._put(url, title, fingerprint)
+
+    def add_batch(self, articles: List[Article], fingerprints: Optional[List[int]] = None):
+        """批量添加新闻到缓存
 
-    def add_batch(self, articles: List[Article]):
-        """批量添加新闻到缓存"""
+        Args:
+            articles: 文章列表
+            fingerprints: 与 articles 一一对应的标题指纹（已算好则直接复用）
+        """
         self._check_and_reset()
-        for article in articles:
-            self._news[article.url] = article.title
+        if fingerprints is None:
+            fingerprints = [None] * len(articles)
+        for article, fingerprint in zip(articles, fingerprints):
+            self._put(article.url, article.title, fingerprint)
 
     def exists_url(self, url: str) -> bool:
         """检查 URL 是否已存在"""
@@ -72,9 +120,28 @@ class TodayNewsCache:
         self._check_and_reset()
         return list(self._news.values())
 
+    def has_similar_title(self, fingerprint: int, threshold: int = SIMHASH_THRESHOLD) -> bool:
+        """缓存中是否存在相似标题（汉明距离 <= threshold）"""
+        self._check_and_reset()
+        return self._index.has_near(fingerprint, threshold)
+
+    def find_similar_urls(self, fingerprint: int, threshold: int = SIMHASH_THRESHOLD) -> List[str]:
+        """查找标题相似的缓存新闻 URL"""
+        self._check_and_reset()
+        return self._index.near(fingerprint, threshold)
+
+    def similar_title_mask(self, fingerprints: List[int], threshold: int = SIMHASH_THRESHOLD) -> List[bool]:
+        """批量判断每个指纹在缓存中是否有相似标题（numpy 向量化）"""
+        self._check_and_reset()
+        if self._matrix is None:
+            self._matrix = HammingMatrix(self._index.fingerprints())
+        return self._matrix.any_within(fingerprints, threshold)
+
     def clear(self):
         """手动清空缓存"""
         self._news.clear()
+        self._index.clear()
+        self._matrix = None
         self._cache_date = date.today()
 
     @property
@@ -95,7 +162,7 @@ class TodayNewsCache:
         articles = db.list_articles_latest(limit=limit)
 
         for article in articles:
-            self._news[article['url']] = article['title']
+            self._put(article['url'], article['title'])
 
         print(f"[TodayNewsCache] 从数据库加载了 {len(articles)} 条到缓存")
 
@@ -108,28 +175,51 @@ class TodayNewsCache:
 today_news_cache = TodayNewsCache()
 
 
+def _batch_source(articles: List[Article]) -> Optional[str]:
+    """批次内文章的新闻源（全部来自同一新闻源时），否则为 None"""
+    sources = {getattr(a.source, "value", a.source) for a in articles}
+    return sources.pop() if len(sources) == 1 else None
+
+
 class TextDeduplicator:
     """文本去重器 - 四层去重策略"""
 
     # SimHash 汉明距离阈值（越大越宽松）
-    # 对于20字的中文标题，汉明距离15表示前半部分相同
-    SIMHASH_THRESHOLD = 15
+    SIMHASH_THRESHOLD = SIMHASH_THRESHOLD
+
+    # 相似度比较后端：index=分段索引，numpy=向量化矩阵，auto=有 numpy 则用 numpy
+    BACKENDS = ("auto", "index", "numpy")
 
-    def __init__(self, target_date: date = None):
+    def __init__(self, target_date: date = None, backend: str = "auto"):
         """初始化去重器
 
         Args:
             target_date: 目标日期，默认为今天
+            backend: 相似度比较后端，见 BACKENDS（判定结果与后端无关）
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"未知的去重后端: {backend}，可选: {', '.join(self.BACKENDS)}")
+        if backend == "numpy" and not HAS_NUMPY:
+            raise ImportError("numpy 后端需要安装 numpy")
+        if backend == "auto":
+            backend = "numpy" if HAS_NUMPY else "index"
+
+        self.backend = backend
         self.target_date = target_date or date.today()
         self.db = TimelineDB(self.target_date)
         self.db.init_db()
 
-    def dedup(self, articles: List[Article]) -> List[Article]:
+    def dedup(self, articles: List[Article], fingerprints: Optional[Dict[int, int]] = None,
+              spans: Optional[SpanRecorder] = None) -> List[Article]:
         """执行四层去重
 
+        每篇文章的标题指纹只计算一次，在各层之间传递并最终写入缓存
+
         Args:
             articles: 待去重的文章列表
+            fingerprints: 预先算好的标题指纹 {id(article): fingerprint}（可选，
+                如由进程池批量计算），缺失的按需计算
+            spans: 阶段记录（可选），每层记录一个 span（dedup.date / url / title / batch）
 
         Returns:
             去重后的文章列表
@@ -137,27 +227,51 @@ class TextDeduplicator:
         print(f"[Dedup] 开始去重，原始文章数: {len(articles)}")
         print(f"[Dedup] url_cache.count={url_cache.count}, today_news_cache.count={today_news_cache.count}")
 
-        # 第一层：时间排重 - 只保留今天的文章
-        today_articles = self._filter_by_date(articles)
-        print(f"[Dedup] 时间排重后: {len(today_articles)}")
-
-        # 第二层：URL 排重 - 与 today_news_cache 对比 URL
-        url_unique = self._filter_by_url(today_articles)
-        print(f"[Dedup] URL排重后: {len(url_unique)}")
+        # 标题指纹 {id(article): fingerprint}，按需计算
+        fingerprints = dict(fingerprints) if fingerprints else {}
 
-        # 第三层：标题近似排重 - 与 today_news_cache 中的标题对比
-        title_unique = self._filter_by_cache_title(url_unique)
-        print(f"[Dedup] 标题排重后: {len(title_unique)}")
+        spans = spans if spans is not None else SpanRecorder()
 
-        # 第四层：批次内排重 - 本批次内的文章互相做标题近似排重
-        deduped = self._filter_by_batch_similarity(title_unique)
-        print(f"[Dedup] 批次内排重后: {len(deduped)}")
+        # 第一层：时间排重 - 只保留今天的文章
+        today_articles = self._run_layer(spans, "dedup.date", articles, self._filter_by_date)
+        print(f"[Dedup] 时间排重后: {len(today_articles)}")
 
-        # 将最终留存的新闻添加到缓存
-        today_news_cache.add_batch(deduped)
+        # 第二~四层与写入缓存在锁内执行，保证并发批次之间不会互相漏判
+        with today_news_cache.lock:
+            # 第二层：URL 排重 - 与 today_news_cache 对比 URL
+            url_unique = self._run_layer(spans, "dedup.url", today_articles, self._filter_by_url)
+            print(f"[Dedup] URL排重后: {len(url_unique)}")
+
+            # 第三层：标题近似排重 - 与 today_news_cache 中的标题对比
+            title_unique = self._run_layer(
+                spans, "dedup.title", url_unique, lambda items: self._filter_by_cache_title(items, fingerprints)
+            )
+            print(f"[Dedup] 标题排重后: {len(title_unique)}")
+
+            # 第四层：批次内排重 - 本批次内的文章互相做标题近似排重
+            deduped = self._run_layer(
+                spans, "dedup.batch", title_unique, lambda items: self._filter_by_batch_similarity(items, fingerprints)
+            )
+            print(f"[Dedup] 批次内排重后: {len(deduped)}")
+
+            # 将最终留存的新闻连同指纹添加到缓存
+            today_news_cache.add_batch(
+                deduped, [self._fingerprint(a, fingerprints) for a in deduped]
+            )
 
         return deduped
 
+    @staticmethod
+    def _run_layer(spans: SpanRecorder, stage: str, articles: List[Article], layer) -> List[Article]:
+        """执行一层去重并记录 span（输入/输出条数、标题字节数）"""
+        source_id = _batch_source(articles)
+        with spans.span(stage, source_id, items_in=len(articles)) as span:
+            span.bytes = article_bytes(articles)
+            result = layer(articles)
+            span.items_out = len(result)
+        dedup_dropped_total.inc(len(articles) - len(result), layer=stage)
+        return result
+
     def _filter_by_date(self, articles: List[Article]) -> List[Article]:
         """时间排重：只保留目标日期及之后的文章（财经新闻会提前发次日新闻）"""
         result = []
@@ -176,62 +290,70 @@ class TextDeduplicator:
         """URL 排重：与 today_news_cache 中的 URL 对比"""
         return [a for a in articles if not today_news_cache.exists_url(a.url)]
 
-    def _filter_by_cache_title(self, articles: List[Article]) -> List[Article]:
-        """标题近似排重：与 today_news_cache 中已有的标题对比"""
-        # 获取缓存中所有标题的 SimHash
-        cached_titles = today_news_cache.get_all_titles()
-        if not cached_titles:
+    def _filter_by_cache_title(
+        self, articles: List[Article], fingerprints: Optional[Dict[int, int]] = None
+    ) -> List[Article]:
+        """标题近似排重：在 today_news_cache 的指纹索引中查找相似标题"""
+        if today_news_cache.count == 0:
             return articles
 
-        cached_hashes = [self._compute_simhash(t) for t in cached_titles]
+        if fingerprints is None:
+            fingerprints = {}
+
+        if self.backend == "numpy":
+            values = [self._fingerprint(a, fingerprints) for a in articles]
+            similar = today_news_cache.similar_title_mask(values, self.SIMHASH_THRESHOLD)
+            return [a for a, is_similar in zip(articles, similar) if not is_similar]
 
         unique = []
         for article in articles:
-            hash_value = self._compute_simhash(article.title)
-
-            # 检查是否与缓存中的标题相似
-            is_similar = False
-            for cached_hash in cached_hashes:
-                if hash_value.distance(cached_hash) <= self.SIMHASH_THRESHOLD:
-                    is_similar = True
-                    break
-
-            if not is_similar:
+            fingerprint = self._fingerprint(article, fingerprints)
+            if not today_news_cache.has_similar_title(fingerprint, self.SIMHASH_THRESHOLD):
                 unique.append(article)
 
         return unique
 
-    def _filter_by_batch_similarity(self, articles: List[Article]) -> List[Article]:
-        """批次内排重：本批次内的文章互相做标题近似排重"""
+    def _filter_by_batch_similarity(
+        self, articles: List[Article], fingerprints: Optional[Dict[int, int]] = None
+    ) -> List[Article]:
+        """批次内排重：本批次内的文章互相做标题近似排重
+
+        index 后端：已保留文章的指纹放入临时索引，每篇只查一次索引
+        numpy 后端：一次算出批次内两两距离矩阵后顺序扫描
+        """
+        if fingerprints is None:
+            fingerprints = {}
+
+        if self.backend == "numpy":
+            values = [self._fingerprint(a, fingerprints) for a in articles]
+            return [articles[i] for i in greedy_unique(values, self.SIMHASH_THRESHOLD)]
+
         deduped = []
+        kept = SimhashIndex(threshold=self.SIMHASH_THRESHOLD)
 
         for article in articles:
-            hash_value = self._compute_simhash(article.title)
+            fingerprint = self._fingerprint(article, fingerprints)
 
             # 检查是否与本次批次中已保留的标题相似
-            is_similar = False
-            for kept_article in deduped:
-                kept_hash = self._compute_simhash(kept_article.title)
-                if hash_value.distance(kept_hash) <= self.SIMHASH_THRESHOLD:
-                    is_similar = True
-                    break
+            if kept.has_near(fingerprint):
+                continue
 
-            if not is_similar:
-                deduped.append(article)
+            kept.add(str(len(deduped)), fingerprint)
+            deduped.append(article)
 
         return deduped
 
-    def _compute_simhash(self, text: str) -> Simhash:
-        """计算文本的 SimHash 值
+    def _fingerprint(self, article: Article, fingerprints: Dict[int, int]) -> int:
+        """获取文章标题指纹（同一批次内只计算一次）"""
+        key = id(article)
+        fingerprint = fingerprints.get(key)
+        if fingerprint is None:
+            fingerprint = fingerprints[key] = self._compute_simhash(article.title).value
+        return fingerprint
 
-        使用 jieba 分词提取关键词作为特征
-        只取前20个字用于去重，只保留中英文数字
-        """
-        # 使用 TitleCleaner 清理标题（默认20个字）
-        text = TitleCleaner.for_dedup(text)
-        # 使用 jieba 分词
-        words = list(jieba.cut(text))
-        return Simhash(words)
+    def _compute_simhash(self, text: str) -> Simhash:
+        """计算文本的 SimHash 值"""
+        return compute_simhash(text)
 
     def get_stats(self, original_count: int, final_count: int) -> dict:
         """获取去重统计信息"""
@@ -0,0 +1,224 @@
+"""进程级共享 HTTP 客户端
+
+所有抓取（调度任务、手动触发、源测试）共用一个长连接的 httpx.AsyncClient：
+- keep-alive 连接跨抓取轮次复用，省去每轮重新建立 TCP/TLS
+- 安装了 h2 时启用 HTTP/2（同一主机多路复用）
+- 全局连接上限 + 每主机并发上限（限流以主机为单位，而非以新闻源为单位）
+- DNS 解析结果按 TTL 缓存
+
+生命周期由 FastAPI lifespan 管理（start / aclose）；未启动时按需创建，
+借用方（UniversalCrawler 等）不负责关闭共享客户端。
+"""
+
+import asyncio
+import socket
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpcore
+import httpx
+
+from ..config.models import NetworkConfig
+
+try:
+    import h2  # noqa: F401  HTTP/2 依赖（pip install httpx[http2]）
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+
+class CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """带 DNS 缓存的网络后端
+
+    先用缓存的 IP 建立 TCP 连接；TLS 的 SNI 与证书校验仍使用原主机名（由 httpcore 传入）
+    """
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, ttl: float = 300):
+        self._backend = backend
+        self.ttl = ttl
+        self._cache: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def _resolve(self, host: str, port: int) -> List[str]:
+        """解析主机名（命中缓存时不发起查询）"""
+        key = (host, port)
+        cached = self._cache.get(key)
+        now = time.monotonic()
+        if cached and cached[0] > now:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._cache[key] = (now + self.ttl, addresses)
+        return addresses
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await self._resolve(host, port)
+        except OSError:
+            addresses = [host]  # 解析失败交给底层后端处理（报出原始错误）
+
+        last_error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout,
+                    local_address=local_address, socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        # 所有地址都失败：可能是缓存过期的地址，清掉缓存
+        self._cache.pop((host, port), None)
+        raise last_error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """响应体读完/关闭时释放每主机并发名额"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, semaphore: asyncio.Semaphore):
+        self._stream = stream
+        self._semaphore = semaphore
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._semaphore.release()
+
+
+class PerHostLimitTransport(httpx.AsyncBaseTransport):
+    """每主机并发上限（从发出请求到响应体关闭占用一个名额）"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, per_host: int):
+        self._transport = transport
+        self.per_host = per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.per_host)
+        return semaphore
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        semaphore = self._semaphore(request.url.host)
+        await semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        if response.is_closed:
+            # 传输层已读完响应体（如测试用 MockTransport），直接归还名额
+            semaphore.release()
+            return response
+        response.stream = _ReleasingStream(response.stream, semaphore)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HTTPClientManager:
+    """共享 HTTP 客户端管理器"""
+
+    def __init__(self):
+        self._config = NetworkConfig()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._dns: Optional[CachingDNSBackend] = None
+
+    def configure(self, config: NetworkConfig) -> None:
+        """设置网络配置（下次创建客户端时生效）"""
+        self._config = config
+
+    async def start(self, config: NetworkConfig = None) -> httpx.AsyncClient:
+        """启动（服务启动时调用）"""
+        if config is not None:
+            self.configure(config)
+        await self.aclose()
+        return self.get_client()
+
+    def _create_client(self) -> httpx.AsyncClient:
+        config = self._config
+        http2 = config.http2 and HAS_HTTP2
+        transport = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+        )
+        # httpx 未开放 network_backend 参数，替换底层连接池的网络后端以缓存 DNS
+        pool = getattr(transport, "_pool", None)
+        if pool is not None and hasattr(pool, "_network_backend"):
+            self._dns = CachingDNSBackend(pool._network_backend, ttl=config.dns_cache_ttl)
+            pool._network_backend = self._dns
+
+        print(f"[HTTP] 创建共享客户端: http2={http2}, 每主机并发={config.per_host_connections}")
+        return httpx.AsyncClient(
+            transport=PerHostLimitTransport(transport, config.per_host_connections),
+            timeout=config.timeout,
+            headers={"User-Agent": config.user_agent},
+        )
+
+    def get_client(self) -> httpx.AsyncClient:
+        """获取共享客户端（不存在或所属事件循环已变化时重新创建）"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if self._client is not None and not self._client.is_closed:
+            if loop is None or self._loop is None or loop is self._loop:
+                self._loop = self._loop or loop
+                return self._client
+            # 连接与信号量绑定在旧事件循环上，不能跨循环复用
+            self._client = None
+
+        self._client = self._create_client()
+        self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """关闭共享客户端（服务关闭时调用）"""
+        client, self._client = self._client, None
+        self._loop = None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    def stats(self) -> Dict[str, object]:
+        """连接与 DNS 缓存统计"""
+        return {
+            "active": self._client is not None and not self._client.is_closed,
+            "http2": self._config.http2 and HAS_HTTP2,
+            "dns_cache_hits": self._dns.hits if self._dns else 0,
+            "dns_cache_misses": self._dns.misses if self._dns else 0,
+        }
+
+
+# 全局单例
+http_client_manager = HTTPClientManager()
@@ -0,0 +1,281 @@
+"""关键词索引服务（可热更新）
+
+统一管理新闻筛选关键词的来源与编译结果：
+- config/news_keywords.yaml（legend 与 新星/涟漪/中国 分类）
+- LegendDB.legend_keywords（由 legend 档案同步的关键词，并入对应 legend）
+
+任一来源变化（文件 mtime / 表签名）时在后台线程重新编译自动机，
+整体替换为新的只读快照并递增版本号。读取方每次取一个快照使用，
+不会看到构建到一半的状态，也无需重启服务。
+"""
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from ..config.reader import ConfigReader
+from .keyword_matcher import KeywordMatcher
+
+# 关键词分类（front = 三者合并）
+FRONT_CATEGORIES = ("新星", "涟漪", "中国")
+
+
+def _flatten_groups(groups: Any) -> List[str]:
+    """展平分组关键词 [[a, b], c, ...] → [a, b, c]（去除空白项）"""
+    result: List[str] = []
+    if not isinstance(groups, list):
+        return result
+    for group in groups:
+        if isinstance(group, list):
+            result.extend(kw for kw in group if isinstance(kw, str) and kw.strip())
+        elif isinstance(group, str) and group.strip():
+            result.append(group)
+    return result
+
+
+@dataclass(frozen=True)
+class KeywordSnapshot:
+    """某一版本的关键词及编译好的自动机（只读）"""
+
+    version: int
+    signature: Tuple = ()
+    legend: Dict[str, FrozenSet[str]] = field(default_factory=dict)  # 小写，按配置顺序
+    categories: Dict[str, FrozenSet[str]] = field(default_factory=dict)  # 小写
+    front: FrozenSet[str] = frozenset()  # = 新星 ∪ 涟漪 ∪ 中国（小写）
+    original: Dict[str, Any] = field(default_factory=dict)  # 保留大小写的原始关键词
+    matcher: KeywordMatcher = field(default_factory=KeywordMatcher)
+    legend_order: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def all_keywords(self) -> List[str]:
+        """全部原始关键词（legend + front，去重保序）"""
+        seen = dict.fromkeys(
+            kw for kws in self.original.get("legend", {}).values() for kw in kws
+        )
+        seen.update(dict.fromkeys(self.original.get("front", [])))
+        return list(seen)
+
+
+class KeywordIndex:
+    """关键词索引：监视来源变化，后台重建并原子替换快照"""
+
+    POLL_INTERVAL = 5.0  # 后台检查间隔（秒）
+
+    def __init__(
+        self,
+        config_dir: str = "config",
+        legend_db_path: str = "data/db/legend.sqlite",
+    ):
+        self.config_dir = config_dir
+        self.legend_db_path = Path(legend_db_path)
+        self._snapshot: Optional[KeywordSnapshot] = None
+        self._build_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # 来源签名
+    # ------------------------------------------------------------------
+
+    def _yaml_signature(self) -> Optional[Tuple[int, int]]:
+        """news_keywords.yaml 的 (mtime_ns, size)"""
+        try:
+            stat = (Path(self.config_dir) / "news_keywords.yaml").stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _legend_db_signature(self) -> Optional[Tuple]:
+        """legend_keywords 表签名 (行数, 最大 id, 最近更新时间)
+
+        set_keywords 是先删后插，任何修改都会改变最大 id 或行数
+        """
+        if not self.legend_db_path.exists():
+            return None
+        try:
+            conn = sqlite3.connect(f"file:{self.legend_db_path}?mode=ro", uri=True)
+            try:
+                row = conn.execute(
+                    "SELECT COUNT(*), MAX(id), MAX(updated_at) FROM legend_keywords"
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return None  # 表尚未创建
+        return tuple(row)
+
+    def _signature(self) -> Tuple:
+        return self._yaml_signature(), self._legend_db_signature()
+
+    # ------------------------------------------------------------------
+    # 构建
+    # ------------------------------------------------------------------
+
+    def _load_legend_db_keywords(self) -> Dict[str, List[str]]:
+        """读取 LegendDB 中的 legend 关键词 {legend_id: [关键词, ...]}"""
+        if not self.legend_db_path.exists():
+            return {}
+        try:
+            conn = sqlite3.connect(f"file:{self.legend_db_path}?mode=ro", uri=True)
+            try:
+                rows = conn.execute(
+                    "SELECT legend_id, keywords FROM legend_keywords ORDER BY id"
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return {}
+
+        result: Dict[str, List[str]] = {}
+        for legend_id, keywords_json in rows:
+            try:
+                keywords = json.loads(keywords_json)
+            except (TypeError, ValueError):
+                continue
+            if isinstance(keywords, str):
+                keywords = [keywords]
+            result.setdefault(legend_id, []).extend(_flatten_groups(keywords))
+        return result
+
+    def _build(self, signature: Tuple, version: int) -> KeywordSnapshot:
+        """从来源构建新快照"""
+        config = ConfigReader(self.config_dir).load_news_keywords_config() or {}
+
+        # legend：YAML 在前，LegendDB 补充（DB 中独有的 legend 追加在后）
+        legend_original: Dict[str, List[str]] = {}
+        for legend_id, groups in (config.get("legend") or {}).items():
+            legend_original[legend_id] = _flatten_groups(groups)
+        for legend_id, keywords in self._load_legend_db_keywords().items():
+            existing = legend_original.setdefault(legend_id, [])
+            existing.extend(kw for kw in keywords if kw not in existing)
+
+        original: Dict[str, Any] = {"legend": legend_original}
+        categories: Dict[str, FrozenSet[str]] = {}
+        front_original: List[str] = []
+        for category in FRONT_CATEGORIES:
+            keywords = _flatten_groups(config.get(category, []))
+            original[category] = keywords
+            categories[category] = frozenset(kw.lower() for kw in keywords)
+            front_original.extend(keywords)
+        original["front"] = front_original
+
+        legend = {
+            legend_id: frozenset(kw.lower() for kw in keywords)
+            for legend_id, keywords in legend_original.items()
+        }
+
+        matcher = KeywordMatcher()
+        for legend_id, keywords in legend.items():
+            for kw in keywords:
+                matcher.add(kw, ("legend", legend_id))
+        for category, keywords in categories.items():
+            for kw in keywords:
+                matcher.add(kw, ("category", category))
+        matcher.build()
+
+        return KeywordSnapshot(
+            version=version,
+            signature=signature,
+            legend=legend,
+            categories=categories,
+            front=frozenset().union(*categories.values()),
+            original=original,
+            matcher=matcher,
+            legend_order={legend_id: i for i, legend_id in enumerate(legend)},
+        )
+
+    def refresh(self, force: bool = False) -> bool:
+        """来源有变化时重建快照
+
+        构建失败时保留旧快照（首次构建失败则使用空快照）
+
+        Returns:
+            是否替换了快照
+        """
+        with self._build_lock:
+            signature = self._signature()
+            current = self._snapshot
+            if not force and current is not None and current.signature == signature:
+                return False
+
+            version = current.version + 1 if current else 1
+            try:
+                snapshot = self._build(signature, version)
+            except Exception as e:
+                print(f"Warning: Failed to load keywords config: {e}")
+                if current is not None:
+                    return False
+                snapshot = KeywordSnapshot(version=version, signature=signature)
+
+            # 引用赋值是原子的，读取方要么拿到旧快照，要么拿到新快照
+            self._snapshot = snapshot
+
+        total_legend_kw = sum(len(kws) for kws in snapshot.legend.values())
+        print(
+            f"[KeywordIndex] v{snapshot.version}: Legend 关键词 {total_legend_kw}，"
+            f"Front 关键词 {len(snapshot.front)}"
+        )
+        return True
+
+    def snapshot(self) -> KeywordSnapshot:
+        """获取当前快照（首次调用时同步构建）"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.refresh()
+            snapshot = self._snapshot
+        return snapshot
+
+    @property
+    def version(self) -> int:
+        """当前快照版本号（尚未构建为 0）"""
+        return self._snapshot.version if self._snapshot else 0
+
+    # ------------------------------------------------------------------
+    # 后台监视
+    # ------------------------------------------------------------------
+
+    def start(self, interval: float = None) -> None:
+        """启动后台监视线程（重复调用无副作用）"""
+        if self._thread and self._thread.is_alive():
+            return
+        interval = interval or self.POLL_INTERVAL
+        self._stop_event.clear()
+        self.snapshot()
+        self._thread = threading.Thread(
+            target=self._watch, args=(interval,), name="keyword-index", daemon=True
+        )
+        self._thread.start()
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop_event.wait(interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[KeywordIndex] 检查关键词变化失败: {e}")
+
+    def stop(self) -> None:
+        """停止后台监视线程"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+_indexes: Dict[str, KeywordIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_keyword_index(config_dir: str = "config") -> KeywordIndex:
+    """按配置目录获取关键词索引（同一目录共享一个实例）"""
+    with _indexes_lock:
+        index = _indexes.get(config_dir)
+        if index is None:
+            index = _indexes[config_dir] = KeywordIndex(config_dir)
+        return index
+
+
+# 全局单例（默认配置目录）
+keyword_index = get_keyword_index("config")
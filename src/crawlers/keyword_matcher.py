@@ -0,0 +1,92 @@
+"""多模式关键词匹配（Aho-Corasick 自动机）
+
+把全部关键词编译进一个自动机，对每个标题只扫描一遍，
+即可得到所有命中的关键词及其标签，耗时与关键词总数无关。
+"""
+
+from collections import deque
+from typing import Dict, Hashable, Iterator, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """Aho-Corasick 多模式匹配器
+
+    用法:
+        matcher = KeywordMatcher()
+        matcher.add("马斯克", ("legend", "musk"))
+        matcher.add("大模型", ("category", "新星"))
+        matcher.build()
+        matcher.labels("马斯克谈大模型")  # {("legend", "musk"), ("category", "新星")}
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]  # 状态转移表
+        self._fail: List[int] = [0]  # 失败指针
+        self._own: List[List[Tuple[str, Hashable]]] = [[]]  # 以该状态结尾的 (关键词, 标签)
+        self._output: List[List[Tuple[str, Hashable]]] = [[]]  # 含后缀状态的全部命中
+        self._built = True
+        self._size = 0
+
+    def add(self, keyword: str, label: Hashable) -> None:
+        """添加关键词（同一关键词可挂多个标签）"""
+        if not keyword:
+            return
+
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+            node = nxt
+
+        if (keyword, label) not in self._own[node]:
+            self._own[node].append((keyword, label))
+            self._size += 1
+        self._built = False
+
+    def build(self) -> None:
+        """构建失败指针（BFS），并把后缀状态的输出合并到当前状态"""
+        self._output = [list(own) for own in self._own]
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                # BFS 保证后缀状态已处理完毕，其输出已包含更短的后缀
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str, Hashable]]:
+        """扫描文本，依次产出 (起始偏移, 关键词, 标签)"""
+        if not self._built:
+            self.build()
+
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for keyword, label in output[node]:
+                yield i - len(keyword) + 1, keyword, label
+
+    def labels(self, text: str) -> Set[Hashable]:
+        """文本命中的全部标签"""
+        return {label for _, _, label in self.iter_matches(text)}
+
+    def __len__(self) -> int:
+        """关键词-标签对数量"""
+        return self._size
@@ -1,18 +1,23 @@
-"""关键词筛选模块"""
-from typing import List, Dict, Optional
-from functools import lru_cache
+"""关键词筛选模块
 
-from ..models import Article
-from ..config.reader import ConfigReader
+关键词与编译好的自动机由 keyword_index 统一维护（可热更新），
+每次筛选取一个快照使用，保证同一批文章按同一版本关键词匹配。
+"""
+from typing import List, Dict, Optional, Set, Hashable
 
+from ..metrics import keyword_hits_total
+from ..models import Article, KeywordHit
+from .keyword_index import FRONT_CATEGORIES, KeywordSnapshot, keyword_index
 
-# 全局缓存关键词（小写版本，用于快速匹配）
+
+# 关键词缓存（小写版本，兼容旧代码读取；随索引版本同步）
 _KEYWORDS_CACHE = {
     "legend": {},
     "新星": set(),
     "涟漪": set(),
     "中国": set(),
     "front": set(),  # = 新星 ∪ 涟漪 ∪ 中国（保持向后兼容）
+    "version": 0,  # 对应的关键词索引版本
     "initialized": False
 }
 
@@ -26,98 +31,102 @@ _ORIGINAL_KEYWORDS = {
 }
 
 
-def _init_keywords():
-    """初始化关键词缓存（只执行一次）"""
-    if _KEYWORDS_CACHE["initialized"]:
-        return
-
-    try:
-        reader = ConfigReader()
-        config = reader.load_news_keywords_config()
-
-        # 解析 legend 关键词
-        legend_config = config.get("legend", {})
-        for legend_id, keyword_groups in legend_config.items():
-            keywords_lower = set()  # 小写版本用于匹配
-            keywords_original = []  # 原始版本保留
-            if isinstance(keyword_groups, list):
-                for group in keyword_groups:
-                    if isinstance(group, list):
-                        for kw in group:
-                            if kw and kw.strip():
-                                keywords_lower.add(kw.lower())
-                                keywords_original.append(kw)
-                    elif isinstance(group, str):
-                        if group and group.strip():
-                            keywords_lower.add(group.lower())
-                            keywords_original.append(group)
-            _KEYWORDS_CACHE["legend"][legend_id] = keywords_lower
-            _ORIGINAL_KEYWORDS["legend"][legend_id] = keywords_original
-
-        # 解析新星、涟漪、中国三个分类
-        front_all_lower = set()  # 合并后的 front（小写）
-        front_all_original = []  # 合并后的 front（原始）
-
-        for category in ("新星", "涟漪", "中国"):
-            category_config = config.get(category, [])
-            category_lower = set()
-            category_original = []
-
-            if isinstance(category_config, list):
-                for group in category_config:
-                    if isinstance(group, list):
-                        for kw in group:
-                            if kw and kw.strip():
-                                category_lower.add(kw.lower())
-                                category_original.append(kw)
-                    elif isinstance(group, str):
-                        if group and group.strip():
-                            category_lower.add(group.lower())
-                            category_original.append(group)
-
-            _KEYWORDS_CACHE[category] = category_lower
-            _ORIGINAL_KEYWORDS[category] = category_original
-
-            # 合并到 front
-            front_all_lower.update(category_lower)
-            front_all_original.extend(category_original)
-
-        # front = 三个分类的合并
-        _KEYWORDS_CACHE["front"] = front_all_lower
-        _ORIGINAL_KEYWORDS["front"] = front_all_original
-
-        _KEYWORDS_CACHE["initialized"] = True
-
-        # 打印调试信息
-        total_legend_kw = sum(len(kws) for kws in _KEYWORDS_CACHE["legend"].values())
-        print(f"[Debug] Legend 关键词数: {total_legend_kw}")
-        print(f"[Debug] 新星关键词数: {len(_KEYWORDS_CACHE['新星'])}")
-        print(f"[Debug] 涟漪关键词数: {len(_KEYWORDS_CACHE['涟漪'])}")
-        print(f"[Debug] 中国关键词数: {len(_KEYWORDS_CACHE['中国'])}")
-        print(f"[Debug] Front 关键词数: {len(_KEYWORDS_CACHE['front'])}")
-    except Exception as e:
-        print(f"Warning: Failed to load keywords config: {e}")
-        import traceback
-        traceback.print_exc()
+def _init_keywords() -> KeywordSnapshot:
+    """同步关键词缓存到索引的当前版本
+
+    Returns:
+        当前关键词快照
+    """
+    snapshot = keyword_index.snapshot()
+    if _KEYWORDS_CACHE["version"] == snapshot.version:
+        return snapshot
+
+    _KEYWORDS_CACHE["legend"] = {k: set(v) for k, v in snapshot.legend.items()}
+    for category in FRONT_CATEGORIES:
+        _KEYWORDS_CACHE[category] = set(snapshot.categories.get(category, ()))
+        _ORIGINAL_KEYWORDS[category] = list(snapshot.original.get(category, []))
+    _KEYWORDS_CACHE["front"] = set(snapshot.front)
+    _ORIGINAL_KEYWORDS["legend"] = {k: list(v) for k, v in snapshot.original.get("legend", {}).items()}
+    _ORIGINAL_KEYWORDS["front"] = list(snapshot.original.get("front", []))
+    _KEYWORDS_CACHE["version"] = snapshot.version
+    _KEYWORDS_CACHE["initialized"] = True
+    return snapshot
+
+
+def _match_labels(text: str, snapshot: KeywordSnapshot = None) -> Set[Hashable]:
+    """单次扫描文本，返回命中的全部标签
+
+    Args:
+        text: 要匹配的文本（已小写）
+        snapshot: 关键词快照，默认取当前版本
+
+    Returns:
+        {("legend", legend_id), ("category", 分类), ...}
+    """
+    snapshot = snapshot or keyword_index.snapshot()
+    return snapshot.matcher.labels(text)
+
+
+def _collect_hits(text: str, snapshot: KeywordSnapshot = None) -> List[KeywordHit]:
+    """单次扫描文本，返回全部关键词命中（含偏移，按出现顺序）"""
+    snapshot = snapshot or keyword_index.snapshot()
+    return [
+        KeywordHit(kind=kind, label=label, keyword=keyword, offset=offset)
+        for offset, keyword, (kind, label) in snapshot.matcher.iter_matches(text)
+    ]
+
+
+def _apply_labels(article: Article, hits: List[KeywordHit], snapshot: KeywordSnapshot) -> None:
+    """把全部命中写入文章
+
+    - keyword_hits: 结构化命中记录（入库时写入 article_labels 关联表）
+    - tags: 命中的全部 legend（按配置顺序）与分类（新星/涟漪/中国）
+    - entities: 命中的关键词及偏移，格式 "关键词@偏移"
+    """
+    order = snapshot.legend_order
+    legends = sorted(
+        {h.label for h in hits if h.kind == "legend"},
+        key=lambda legend_id: order.get(legend_id, len(order)),
+    )
+    categories = [c for c in FRONT_CATEGORIES if any(h.kind == "category" and h.label == c for h in hits)]
+
+    article.keyword_hits = hits
+    article.tags = list(dict.fromkeys([*article.tags, *legends, *categories]))
+    article.entities = list(dict.fromkeys(
+        [*article.entities, *(f"{h.keyword}@{h.offset}" for h in hits)]
+    ))
+
+
+def _pick_legend(labels: Set[Hashable], snapshot: KeywordSnapshot = None) -> Optional[str]:
+    """从命中标签中选出配置顺序最靠前的 legend"""
+    snapshot = snapshot or keyword_index.snapshot()
+    order = snapshot.legend_order
+    legends = [name for kind, name in labels if kind == "legend"]
+    if not legends:
+        return None
+    return min(legends, key=lambda legend_id: order.get(legend_id, len(order)))
+
+
+def _is_front(labels: Set[Hashable]) -> bool:
+    """命中标签中是否包含 front 分类"""
+    return any(kind == "category" for kind, _ in labels)
 
 
 def _match_legend(text: str) -> Optional[str]:
-    """匹配 legend 关键词（使用生成器 + any，短路优化）
+    """匹配 legend 关键词
 
     Args:
         text: 要匹配的文本（已小写）
 
     Returns:
-        命中的 legend_id，未命中返回 None
+        命中的 legend_id（多个命中取配置中靠前的），未命中返回 None
     """
-    for legend_id, keywords in _KEYWORDS_CACHE["legend"].items():
-        if any(kw in text for kw in keywords):
-            return legend_id
-    return None
+    snapshot = keyword_index.snapshot()
+    return _pick_legend(_match_labels(text, snapshot), snapshot)
 
 
 def _match_front(text: str) -> bool:
-    """匹配 front 关键词（使用 any，短路优化）
+    """匹配 front 关键词
 
     Args:
         text: 要匹配的文本（已小写）
@@ -125,31 +134,30 @@ def _match_front(text: str) -> bool:
     Returns:
         是否命中
     """
-    return any(kw in text for kw in _KEYWORDS_CACHE["front"])
+    return _is_front(_match_labels(text))
 
 
 def filter_by_keywords(articles: List[Article]) -> List[Article]:
     """根据关键词过滤文章并标注 legend
 
-    匹配逻辑:
+    每个标题只用自动机扫描一遍，得到全部命中标签后按优先级判定:
     1. 先匹配 legend 关键词组 → 命中则设置 article.legend = 对应的 legend_id
     2. 再匹配 front 关键词组 → 命中则 article.legend = None
     3. 都未命中 → 丢弃文章
 
+    保留的文章同时记录全部命中（多个 legend、分类、关键词及偏移），见 _apply_labels
+
     Args:
         articles: 待过滤的文章列表
 
     Returns:
         匹配关键词的文章列表，legend 字段已标注
     """
-    # 确保关键词已初始化
-    _init_keywords()
-
-    legend_keywords = _KEYWORDS_CACHE["legend"]
-    front_keywords = _KEYWORDS_CACHE["front"]
+    # 整批使用同一版本的关键词
+    snapshot = keyword_index.snapshot()
 
     # 统计信息
-    legend_counts = {legend_id: 0 for legend_id in legend_keywords.keys()}
+    legend_counts = {legend_id: 0 for legend_id in snapshot.legend.keys()}
     front_count = 0
     unmatched_count = 0
 
@@ -158,18 +166,23 @@ def filter_by_keywords(articles: List[Article]) -> List[Article]:
         # 只匹配标题，不匹配 URL（URL 可能包含随机字符串导致误匹配）
         text_to_check = article.title.lower()
 
+        hits = _collect_hits(text_to_check, snapshot)
+        labels = {(h.kind, h.label) for h in hits}
+
         # 1. 先匹配 legend 关键词
-        matched_legend_id = _match_legend(text_to_check)
+        matched_legend_id = _pick_legend(labels, snapshot)
 
         if matched_legend_id:
             article.legend = matched_legend_id
+            _apply_labels(article, hits, snapshot)
             legend_counts[matched_legend_id] += 1
             filtered.append(article)
             continue
 
         # 2. 再匹配 front 关键词
-        if _match_front(text_to_check):
+        if _is_front(labels):
             article.legend = None
+            _apply_labels(article, hits, snapshot)
             front_count += 1
             filtered.append(article)
         else:
@@ -177,6 +190,12 @@ def filter_by_keywords(articles: List[Article]) -> List[Article]:
             if unmatched_count <= 5:  # 打印前5个没匹配的
                 print(f"[Filter] 未匹配: {article.title[:50]}...")
 
+    for legend_id, count in legend_counts.items():
+        if count:
+            keyword_hits_total.inc(count, legend=legend_id)
+    if front_count:
+        keyword_hits_total.inc(front_count, legend="front")
+
     # 打印统计信息
     total_legend = sum(legend_counts.values())
     print(f"[Filter] Legend 匹配: {total_legend} (详情: {legend_counts})")
@@ -188,7 +207,7 @@ def filter_by_keywords(articles: List[Article]) -> List[Article]:
 
 
 def _load_keywords() -> Dict:
-    """从配置文件加载关键词（保留用于兼容旧代码）
+    """获取当前版本的原始关键词（保留用于兼容旧代码）
 
     返回:
         {
@@ -6,12 +6,21 @@ API: https://www.36kr.com/newsflashes
 from typing import List, Dict, Any
 from httpx import Response, AsyncClient
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
 
 from ...models import Article, SourceType
+from .base import NotModified, compile_selector, extract_paragraphs, get_list, make_soup, older_than
 
+# 36氪快讯正文容器（按优先级）
+CONTENT_SELECTORS = ("div.newsflash-detail-content", "div.article-content")
 
-async def parse(response: Response, source_config: Dict[str, Any], client: AsyncClient = None, limit: int = 20) -> List[Article]:
+# 快讯列表选择器（预编译）
+ITEM_SELECTOR = compile_selector(".newsflash-item")
+TITLE_SELECTOR = compile_selector("a.item-title")
+TIME_SELECTOR = compile_selector(".time")
+
+
+async def parse(response: Response, source_config: Dict[str, Any], client: AsyncClient = None, limit: int = 20,
+                since: datetime = None) -> List[Article]:
     """解析36氪快讯响应
 
     Args:
@@ -19,6 +28,7 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
         source_config: 新闻源配置
         client: HTTP 客户端
         limit: 抓取的条数限制
+        since: 水位（上次抓取到的最新发布时间），早于它的条目不再解析
 
     Returns:
         文章列表
@@ -31,18 +41,18 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
 
     try:
         url = "https://www.36kr.com/newsflashes"
-        resp = await client.get(url, headers={
+        resp = await get_list(client, url, headers={
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }, timeout=30)
+        })
         resp.raise_for_status()
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        items = soup.select(".newsflash-item")[:limit]
+        soup = make_soup(resp.text)
+        items = ITEM_SELECTOR.select(soup, limit=limit)
 
         for item in items:
             try:
                 # 获取标题和链接
-                title_el = item.select_one("a.item-title")
+                title_el = TITLE_SELECTOR.select_one(item)
                 if not title_el:
                     continue
 
@@ -53,7 +63,7 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
                     continue
 
                 # 获取相对时间
-                time_el = item.select_one(".time")
+                time_el = TIME_SELECTOR.select_one(item)
                 relative_time = time_el.get_text(strip=True) if time_el else ""
 
                 # 解析相对时间（如 "3小时前"）
@@ -63,6 +73,10 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
                 if not publish_time:
                     continue
 
+                # 列表按时间倒序，到达水位即停止
+                if older_than(publish_time, since):
+                    break
+
                 article = Article(
                     title=title,
                     url=f"https://www.36kr.com{url_path}",
@@ -75,6 +89,8 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
                 print(f"[36kr] Error parsing item: {e}")
                 continue
 
+    except NotModified:
+        return []  # 列表未变化（304 或内容相同），跳过解析
     except Exception as e:
         print(f"[36kr] Error: {e}")
 
@@ -112,6 +128,18 @@ def _parse_relative_time(time_str: str) -> datetime | None:
     return None
 
 
+def extract_content(html: str) -> str:
+    """从正文页 HTML 提取正文
+
+    Args:
+        html: 正文页 HTML
+
+    Returns:
+        正文内容
+    """
+    return extract_paragraphs(html, CONTENT_SELECTORS) or "无法提取文章内容"
+
+
 async def fetch_content(url: str, client: AsyncClient) -> str:
     """获取文章正文内容
 
@@ -123,20 +151,8 @@ async def fetch_content(url: str, client: AsyncClient) -> str:
         正文内容
     """
     try:
-        response = await client.get(url, timeout=15)
+        response = await client.get(url)
         response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # 36氪快讯正文选择器
-        content_div = soup.find("div", class_="newsflash-detail-content") or \
-                      soup.find("div", class_="article-content")
-
-        if content_div:
-            paragraphs = content_div.find_all("p")
-            if paragraphs:
-                return "\n\n".join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
-
-        return "无法提取文章内容"
+        return extract_content(response.text)
     except Exception as e:
         return f"获取内容失败: {e}"
@@ -5,6 +5,11 @@
 解析器标准接口：
     async def parse(response: httpx.Response, source_config: dict) -> List[Article]
 
+可选参数：client（HTTP 客户端）、limit（条数限制）、
+since（水位，早于它的条目不再解析，支持增量的 API 可作为游标传给服务端）
+
+正文提取拆为纯函数 extract_content(html) -> str，fetch_content 只负责请求
+
 示例：
     # parsers/cankaoxiaoxi.py
     async def parse(response, source_config):
@@ -12,10 +17,22 @@
         return [Article(...)]
 """
 
-from .base import get_features, parse_html, parse_json
+from .base import (
+    extract_paragraphs,
+    get_features,
+    get_list,
+    make_soup,
+    older_than,
+    parse_html,
+    parse_json,
+)
 
 __all__ = [
+    "extract_paragraphs",
     "get_features",
+    "get_list",
+    "make_soup",
+    "older_than",
     "parse_html",
     "parse_json",
 ]
@@ -1,13 +1,275 @@
 """解析器基类和工具函数
 
 提供解析器开发中常用的工具函数
+
+HTML 解析后端（按可用性自动选择，可用 set_parse_backend 切换）：
+- selectolax：最快（可选依赖，pip install selectolax）
+- lxml：默认（libxml2 解析 + 预编译 XPath）
+- html.parser：BeautifulSoup 纯 Python 解析，仅作兜底
+
+正文提取只需要一个容器里的段落，extract_paragraphs 直接在后端的
+原生树上用预编译选择器查找，不构建 BeautifulSoup 树；
+stream=True 时边解析边查找，找到最优先的容器即停止解析。
 """
 
-from typing import List, Dict, Any, Optional
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, List, Dict, Any, Optional, Sequence, Tuple
 from httpx import Response
 from bs4 import BeautifulSoup
 import json
 
+from ..response_cache import NotModified  # noqa: F401  解析器从此处导入
+
+try:
+    from lxml import etree
+    import lxml.html
+except ImportError:  # pragma: no cover - 取决于环境
+    etree = None
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # pragma: no cover - 取决于环境
+    HTMLParser = None
+
+HAS_LXML = etree is not None
+HAS_SELECTOLAX = HTMLParser is not None
+
+PARSE_BACKENDS = ("selectolax", "lxml", "html.parser")
+_parse_backend = "selectolax" if HAS_SELECTOLAX else "lxml" if HAS_LXML else "html.parser"
+
+
+def get_parse_backend() -> str:
+    """当前 HTML 解析后端"""
+    return _parse_backend
+
+
+def set_parse_backend(name: str) -> str:
+    """切换 HTML 解析后端
+
+    Returns:
+        切换前的后端名称
+
+    Raises:
+        ValueError: 未知后端
+        ImportError: 后端依赖未安装
+    """
+    global _parse_backend
+    if name not in PARSE_BACKENDS:
+        raise ValueError(f"未知的解析后端: {name}，可选 {', '.join(PARSE_BACKENDS)}")
+    if name == "selectolax" and not HAS_SELECTOLAX:
+        raise ImportError("selectolax 未安装")
+    if name == "lxml" and not HAS_LXML:
+        raise ImportError("lxml 未安装")
+    previous, _parse_backend = _parse_backend, name
+    return previous
+
+
+def make_soup(markup: str, parse_only=None) -> BeautifulSoup:
+    """构建 BeautifulSoup（有 lxml 时用 lxml 解析器，比 html.parser 快数倍）
+
+    Args:
+        markup: HTML 文本
+        parse_only: 可选 SoupStrainer，只保留匹配的标签
+    """
+    features = "html.parser" if _parse_backend == "html.parser" or not HAS_LXML else "lxml"
+    return BeautifulSoup(markup, features, parse_only=parse_only)
+
+
+@lru_cache(maxsize=256)
+def compile_selector(selector: str):
+    """预编译 CSS 选择器（soupsieve，供 BeautifulSoup 树使用）"""
+    import soupsieve
+    return soupsieve.compile(selector)
+
+
+# ----------------------------------------------------------------------
+# 正文提取
+# ----------------------------------------------------------------------
+
+# 正文容器选择器只支持 "tag" / "tag.class" / ".class"
+_SIMPLE_SELECTOR = re.compile(r"^([a-zA-Z][a-zA-Z0-9]*)?(?:\.([\w-]+))?$")
+
+
+@lru_cache(maxsize=256)
+def _parse_simple_selector(selector: str) -> Tuple[Optional[str], Optional[str]]:
+    """解析简单选择器为 (tag, class)"""
+    match = _SIMPLE_SELECTOR.match(selector.strip())
+    if not match or not any(match.groups()):
+        raise ValueError(f"正文容器只支持 tag / tag.class / .class 选择器: {selector}")
+    tag, cls = match.groups()
+    return (tag.lower() if tag else None), cls
+
+
+@lru_cache(maxsize=256)
+def _compile_xpath(selector: str):
+    """简单选择器 → 预编译 XPath（取文档顺序第一个匹配）"""
+    tag, cls = _parse_simple_selector(selector)
+    path = f"//{tag or '*'}"
+    if cls:
+        path += f"[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+    return etree.XPath(f"({path})[1]")
+
+
+def _join_paragraphs(texts, max_paragraphs: Optional[int]) -> Optional[str]:
+    """合并段落文本（与 BeautifulSoup get_text(strip=True) 一致：各文本节点去空白后直接拼接）"""
+    if max_paragraphs is not None:
+        texts = texts[:max_paragraphs]
+    result = "\n\n".join(text for text in texts if text)
+    return result or None
+
+
+def _lxml_text(element) -> str:
+    """元素文本（跳过注释、script、style）"""
+    parts = []
+    for node in element.iter():
+        if not isinstance(node.tag, str):
+            # 注释 / 处理指令：自身文本不计，尾随文本属于父元素
+            if node is not element and node.tail:
+                parts.append(node.tail.strip())
+            continue
+        if node.tag in ("script", "style"):
+            if node is not element and node.tail:
+                parts.append(node.tail.strip())
+            continue
+        if node.text:
+            parts.append(node.text.strip())
+        if node is not element and node.tail:
+            parts.append(node.tail.strip())
+    return "".join(parts)
+
+
+def _lxml_paragraphs(container, max_paragraphs: Optional[int]) -> Optional[str]:
+    paragraphs = container.iter("p")
+    return _join_paragraphs([_lxml_text(p) for p in paragraphs], max_paragraphs)
+
+
+def _extract_lxml(html: str, containers: Sequence[str], max_paragraphs) -> Optional[str]:
+    try:
+        root = lxml.html.fromstring(html)
+    except ValueError:
+        # 带编码声明的字符串（<?xml ... encoding=...?>）需以字节解析
+        root = lxml.html.fromstring(html.encode("utf-8"))
+    except etree.ParserError:
+        return None  # 空文档
+    for selector in containers:
+        found = _compile_xpath(selector)(root)
+        if found:
+            return _lxml_paragraphs(found[0], max_paragraphs)
+    return None
+
+
+def _element_matches(element, tag: Optional[str], cls: Optional[str]) -> bool:
+    if tag and element.tag != tag:
+        return False
+    if cls and cls not in (element.get("class") or "").split():
+        return False
+    return True
+
+
+def _extract_lxml_stream(html: str, containers: Sequence[str], max_paragraphs,
+                         chunk_size: int = 65536) -> Optional[str]:
+    """边解析边查找容器（不保留完整文档树）
+
+    每个选择器记录文档顺序中第一个匹配的容器；最优先的容器一结束就停止解析。
+    容器之外已结束的元素立即释放，内存只与当前打开的路径有关。
+    """
+    patterns = [_parse_simple_selector(sel) for sel in containers]
+    found: Dict[int, Optional[str]] = {}
+    open_containers: Dict[Any, List[int]] = {}  # 元素 → 匹配的选择器序号
+    parser = etree.HTMLPullParser(events=("start", "end"))
+
+    for offset in range(0, max(len(html), 1), chunk_size):
+        parser.feed(html[offset:offset + chunk_size])
+        for event, element in parser.read_events():
+            if not isinstance(element.tag, str):
+                continue
+            if event == "start":
+                matched = [
+                    i for i, (tag, cls) in enumerate(patterns)
+                    if i not in found and i not in _claimed(open_containers)
+                    and _element_matches(element, tag, cls)
+                ]
+                if matched:
+                    open_containers[element] = matched
+                continue
+
+            matched = open_containers.pop(element, None)
+            if matched:
+                text = _lxml_paragraphs(element, max_paragraphs)
+                for i in matched:
+                    found[i] = text
+                if 0 in found:
+                    parser.close()
+                    return found[0]
+            if not open_containers:
+                # 不在任何候选容器内：释放已处理的元素
+                element.clear(keep_tail=True)
+                parent = element.getparent()
+                if parent is not None:
+                    while element.getprevious() is not None:
+                        del parent[0]
+    parser.close()
+
+    for i in range(len(patterns)):
+        if i in found:
+            return found[i]
+    return None
+
+
+def _claimed(open_containers: Dict[Any, List[int]]) -> set:
+    return {i for matched in open_containers.values() for i in matched}
+
+
+def _extract_selectolax(html: str, containers: Sequence[str], max_paragraphs) -> Optional[str]:
+    tree = HTMLParser(html)
+    for selector in containers:
+        node = tree.css_first(selector)
+        if node is not None:
+            texts = [p.text(deep=True, separator="", strip=True) for p in node.css("p")]
+            return _join_paragraphs(texts, max_paragraphs)
+    return None
+
+
+def _extract_soup(html: str, containers: Sequence[str], max_paragraphs) -> Optional[str]:
+    soup = make_soup(html)
+    for selector in containers:
+        node = compile_selector(selector).select_one(soup)
+        if node is not None:
+            texts = [p.get_text(strip=True) for p in node.find_all("p")]
+            return _join_paragraphs(texts, max_paragraphs)
+    return None
+
+
+_EXTRACTORS: Dict[str, Callable] = {
+    "selectolax": _extract_selectolax,
+    "lxml": _extract_lxml,
+    "html.parser": _extract_soup,
+}
+
+
+def extract_paragraphs(html: str, containers: Sequence[str], max_paragraphs: int = None,
+                       stream: bool = False) -> Optional[str]:
+    """提取正文段落
+
+    按优先级依次查找容器，使用第一个存在的容器，合并其中 <p> 的文本。
+
+    Args:
+        html: 正文页 HTML
+        containers: 容器选择器（按优先级），如 ("div.content", "article")
+        max_paragraphs: 最多取多少段（可选）
+        stream: 边解析边查找，最优先的容器出现后即停止（仅 lxml 后端）
+
+    Returns:
+        段落文本（以空行分隔），找不到容器或容器内无段落时为 None
+    """
+    if not html:
+        return None
+    if stream and _parse_backend == "lxml":
+        return _extract_lxml_stream(html, containers, max_paragraphs)
+    return _EXTRACTORS[_parse_backend](html, containers, max_paragraphs)
+
 
 def get_features(text: str, top_k: int = 20) -> List[tuple]:
     """提取文本特征用于 SimHash
@@ -23,6 +285,48 @@ def get_features(text: str, top_k: int = 20) -> List[tuple]:
     return jieba.analyse.extract_tags(text, topK=top_k, withWeight=True)
 
 
+async def get_list(client, url: str, cache_ignore_params: Sequence[str] = (), **kwargs) -> Response:
+    """请求列表接口（条件请求）
+
+    client 为 ResilientClient 时带上 ETag / Last-Modified 校验，
+    列表未变化时抛出 NotModified；普通 httpx 客户端直接 GET
+
+    Args:
+        client: HTTP 客户端
+        url: 列表接口 URL
+        cache_ignore_params: 不计入缓存键的查询参数（每轮都会变化的游标等）
+        **kwargs: 传给 client.get 的参数
+
+    Returns:
+        HTTP 响应
+    """
+    if hasattr(client, "get_list"):
+        return await client.get_list(url, cache_ignore_params=cache_ignore_params, **kwargs)
+    return await client.get(url, **kwargs)
+
+
+def older_than(publish_time: Optional[datetime], since: Optional[datetime]) -> bool:
+    """条目是否早于水位（since 为 None 时总是 False）
+
+    与水位同一时刻的条目不算旧条目（可能是同一秒内发布的新条目），交给后续去重。
+    只用于按时间倒序的单一列表；热榜等按热度排序的列表中，新上榜的条目可能早于水位，
+    不按水位过滤（交给 URL 缓存与去重）
+
+    Args:
+        publish_time: 条目发布时间
+        since: 水位（上次抓取到的最新发布时间）
+
+    Returns:
+        是否早于水位
+    """
+    if since is None or publish_time is None:
+        return False
+    if (publish_time.tzinfo is None) != (since.tzinfo is None):
+        publish_time = publish_time.replace(tzinfo=None)
+        since = since.replace(tzinfo=None)
+    return publish_time < since
+
+
 def parse_html(response: Response, selector: str, **fields) -> List[Dict[str, Any]]:
     """解析 HTML 响应
 
@@ -43,8 +347,8 @@ def parse_html(response: Response, selector: str, **fields) -> List[Dict[str, An
             time=".time"
         )
     """
-    soup = BeautifulSoup(response.text, "html.parser")
-    items = soup.select(selector)
+    soup = make_soup(response.text)
+    items = compile_selector(selector).select(soup)
     results = []
 
     for item in items:
@@ -53,10 +357,10 @@ def parse_html(response: Response, selector: str, **fields) -> List[Dict[str, An
             # 处理属性选择器，如 "a@href"
             if "@" in field_selector:
                 elem_selector, attr = field_selector.split("@", 1)
-                elem = item.select_one(elem_selector)
+                elem = compile_selector(elem_selector).select_one(item)
                 value = elem.get(attr) if elem else None
             else:
-                elem = item.select_one(field_selector)
+                elem = compile_selector(field_selector).select_one(item)
                 value = elem.get_text(strip=True) if elem else None
 
             row[field_name] = value
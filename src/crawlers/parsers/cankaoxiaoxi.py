@@ -5,16 +5,21 @@ API: https://china.cankaoxiaoxi.com/json/channel/{channel}/list.json
 
 from typing import List, Dict, Any
 from httpx import Response, AsyncClient
-from bs4 import BeautifulSoup
 from datetime import datetime
 
 from ...models import Article, SourceType
+from .base import NotModified, extract_paragraphs, get_list
 
 
 # 参考消息频道
+# 各频道更新频率不同，共用一个新闻源水位会漏掉较慢频道的新条目，因此不按水位提前停止
+# （各频道列表按 URL 分别做条件请求，未变化的频道仍会跳过解析）
 CHANNELS = ["zhongguo", "guandian", "gj"]
 BASE_URL = "https://china.cankaoxiaoxi.com/json/channel/{}/list.json"
 
+# 参考消息的文章正文通常在 .article-content 或类似容器中
+CONTENT_SELECTORS = ("div.article-content", "div.content")
+
 
 async def parse(response: Response, source_config: Dict[str, Any], client: AsyncClient = None, limit: int = 20) -> List[Article]:
     """解析参考消息响应
@@ -39,7 +44,7 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
     for channel in CHANNELS:
         try:
             url = BASE_URL.format(channel)
-            channel_response = await client.get(url)
+            channel_response = await get_list(client, url)
             channel_response.raise_for_status()
             data = channel_response.json()
 
@@ -59,6 +64,9 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
                 )
                 articles.append(article)
 
+        except NotModified:
+            continue  # 频道列表未变化（304 或内容相同），跳过解析
+
         except Exception as e:
             print(f"Error fetching {channel}: {e}")
             continue
@@ -66,6 +74,23 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
     return articles
 
 
+def extract_content(html: str) -> str:
+    """从正文页 HTML 提取正文
+
+    Args:
+        html: 正文页 HTML
+
+    Returns:
+        正文内容
+    """
+    content = extract_paragraphs(html, CONTENT_SELECTORS)
+    if content:
+        return content
+
+    # 如果找不到特定容器，尝试获取主要内容区域
+    return extract_paragraphs(html, ("body",), max_paragraphs=20) or "无法提取文章内容"
+
+
 async def fetch_content(url: str, client: AsyncClient) -> str:
     """获取文章正文内容
 
@@ -77,26 +102,9 @@ async def fetch_content(url: str, client: AsyncClient) -> str:
         正文内容
     """
     try:
-        response = await client.get(url, timeout=15)
+        response = await client.get(url)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # 参考消息的文章正文通常在 .article-content 或类似容器中
-        content_div = soup.find("div", class_="article-content") or soup.find("div", class_="content")
-        if content_div:
-            # 提取段落文本
-            paragraphs = content_div.find_all("p")
-            if paragraphs:
-                return "\n\n".join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
-
-        # 如果找不到特定容器，尝试获取主要内容区域
-        body = soup.find("body")
-        if body:
-            paragraphs = body.find_all("p")
-            if paragraphs:
-                return "\n\n".join(p.get_text(strip=True) for p in paragraphs[:20] if p.get_text(strip=True))
-
-        return "无法提取文章内容"
+        return extract_content(response.text)
     except Exception as e:
         return f"获取内容失败: {e}"
 
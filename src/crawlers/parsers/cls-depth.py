@@ -9,6 +9,10 @@ from httpx import Response, AsyncClient
 from datetime import datetime
 
 from ...models import Article, SourceType
+from .base import NotModified, extract_paragraphs, get_list
+
+# 正文容器（按优先级）
+CONTENT_SELECTORS = ("div.content", "div.article-content", "article")
 
 
 async def parse(response: Response, source_config: Dict[str, Any], client: AsyncClient = None, limit: int = 20) -> List[Article]:
@@ -31,7 +35,7 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
 
     try:
         url = "https://www.cls.cn/v3/depth/home/assembled/1000"
-        resp = await client.get(url, timeout=30)
+        resp = await get_list(client, url)
         resp.raise_for_status()
         data = resp.json()
 
@@ -65,30 +69,24 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
             )
             articles.append(article)
 
+    except NotModified:
+        return []  # 列表未变化（304 或内容相同），跳过解析
     except Exception as e:
         print(f"[CLSDepth] Error: {e}")
 
     return articles
 
 
+def extract_content(html: str) -> str:
+    """从正文页 HTML 提取正文"""
+    return extract_paragraphs(html, CONTENT_SELECTORS) or "无法提取文章内容"
+
+
 async def fetch_content(url: str, client: AsyncClient) -> str:
     """获取文章正文内容"""
     try:
-        response = await client.get(url, timeout=15)
+        response = await client.get(url)
         response.raise_for_status()
-
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        content_div = soup.find("div", class_="content") or \
-                      soup.find("div", class_="article-content") or \
-                      soup.find("article")
-
-        if content_div:
-            paragraphs = content_div.find_all("p")
-            if paragraphs:
-                return "\n\n".join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
-
-        return "无法提取文章内容"
+        return extract_content(response.text)
     except Exception as e:
         return f"获取内容失败: {e}"
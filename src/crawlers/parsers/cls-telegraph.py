@@ -8,9 +8,14 @@ from httpx import Response, AsyncClient
 from datetime import datetime
 
 from ...models import Article, SourceType
+from .base import NotModified, extract_paragraphs, get_list, older_than
 
+# 正文容器（按优先级）
+CONTENT_SELECTORS = ("div.content", "div.article-content", "div.telegraph-content")
 
-async def parse(response: Response, source_config: Dict[str, Any], client: AsyncClient = None, limit: int = 20) -> List[Article]:
+
+async def parse(response: Response, source_config: Dict[str, Any], client: AsyncClient = None, limit: int = 20,
+                since: datetime = None) -> List[Article]:
     """解析财联社电报响应
 
     Args:
@@ -18,6 +23,7 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
         source_config: 新闻源配置
         client: HTTP 客户端
         limit: 抓取的条数限制
+        since: 水位（上次抓取到的最新发布时间），早于它的条目不再解析
 
     Returns:
         文章列表
@@ -30,7 +36,10 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
 
     try:
         url = "https://www.cls.cn/nodeapi/updateTelegraphList"
-        resp = await client.get(url, timeout=30)
+        # 有水位时只请求水位之后更新的电报（lastTime 为 ctime 秒级时间戳）
+        # lastTime 每轮变化，不计入条件请求的缓存键
+        params = {"lastTime": int(since.timestamp())} if since else None
+        resp = await get_list(client, url, params=params, cache_ignore_params=("lastTime",))
         resp.raise_for_status()
         data = resp.json()
 
@@ -60,6 +69,10 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
 
             url = share_url or f"https://www.cls.cn/detail/{item_id}"
 
+            # 列表按时间倒序，到达水位即停止
+            if older_than(publish_time, since):
+                break
+
             article = Article(
                 title=title,
                 url=url,
@@ -68,30 +81,24 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
             )
             articles.append(article)
 
+    except NotModified:
+        return []  # 列表未变化（304 或内容相同），跳过解析
     except Exception as e:
         print(f"[CLSTelegraph] Error: {e}")
 
     return articles
 
 
+def extract_content(html: str) -> str:
+    """从正文页 HTML 提取正文"""
+    return extract_paragraphs(html, CONTENT_SELECTORS) or "无法提取文章内容"
+
+
 async def fetch_content(url: str, client: AsyncClient) -> str:
     """获取文章正文内容"""
     try:
-        response = await client.get(url, timeout=15)
+        response = await client.get(url)
         response.raise_for_status()
-
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        content_div = soup.find("div", class_="content") or \
-                      soup.find("div", class_="article-content") or \
-                      soup.find("div", class_="telegraph-content")
-
-        if content_div:
-            paragraphs = content_div.find_all("p")
-            if paragraphs:
-                return "\n\n".join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
-
-        return "无法提取文章内容"
+        return extract_content(response.text)
     except Exception as e:
         return f"获取内容失败: {e}"
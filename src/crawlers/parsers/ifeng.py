@@ -10,6 +10,10 @@ import re
 import json
 
 from ...models import Article, SourceType
+from .base import NotModified, extract_paragraphs, get_list
+
+# 凤凰网正文容器（按优先级）
+CONTENT_SELECTORS = ("div.main_content", "div.article-content", "article")
 
 
 async def parse(response: Response, source_config: Dict[str, Any], client: AsyncClient = None, limit: int = 20) -> List[Article]:
@@ -32,7 +36,7 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
 
     try:
         url = "https://www.ifeng.com/"
-        resp = await client.get(url, timeout=30)
+        resp = await get_list(client, url)
         resp.raise_for_status()
         html = resp.text
 
@@ -73,6 +77,8 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
             except json.JSONDecodeError as e:
                 print(f"[Ifeng] JSON decode error: {e}")
 
+    except NotModified:
+        return []  # 列表未变化（304 或内容相同），跳过解析
     except Exception as e:
         print(f"[Ifeng] Error: {e}")
 
@@ -104,6 +110,18 @@ def _parse_time(time_str: str) -> datetime | None:
     return None
 
 
+def extract_content(html: str) -> str:
+    """从正文页 HTML 提取正文
+
+    Args:
+        html: 正文页 HTML
+
+    Returns:
+        正文内容
+    """
+    return extract_paragraphs(html, CONTENT_SELECTORS) or "无法提取文章内容"
+
+
 async def fetch_content(url: str, client: AsyncClient) -> str:
     """获取文章正文内容
 
@@ -115,22 +133,8 @@ async def fetch_content(url: str, client: AsyncClient) -> str:
         正文内容
     """
     try:
-        response = await client.get(url, timeout=15)
+        response = await client.get(url)
         response.raise_for_status()
-
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # 凤凰网正文选择器
-        content_div = soup.find("div", class_="main_content") or \
-                      soup.find("div", class_="article-content") or \
-                      soup.find("article")
-
-        if content_div:
-            paragraphs = content_div.find_all("p")
-            if paragraphs:
-                return "\n\n".join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
-
-        return "无法提取文章内容"
+        return extract_content(response.text)
     except Exception as e:
         return f"获取内容失败: {e}"
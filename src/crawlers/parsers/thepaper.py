@@ -8,6 +8,10 @@ from httpx import Response, AsyncClient
 from datetime import datetime
 
 from ...models import Article, SourceType
+from .base import NotModified, extract_paragraphs, get_list
+
+# 澎湃新闻正文容器（按优先级）
+CONTENT_SELECTORS = ("div.index_article__content", "div.news_txt", "article")
 
 
 async def parse(response: Response, source_config: Dict[str, Any], client: AsyncClient = None, limit: int = 20) -> List[Article]:
@@ -30,7 +34,7 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
 
     try:
         url = "https://cache.thepaper.cn/contentapi/wwwIndex/rightSidebar"
-        resp = await client.get(url, timeout=30)
+        resp = await get_list(client, url)
         resp.raise_for_status()
         data = resp.json()
 
@@ -62,12 +66,26 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
             )
             articles.append(article)
 
+    except NotModified:
+        return []  # 列表未变化（304 或内容相同），跳过解析
     except Exception as e:
         print(f"[Thapaper] Error: {e}")
 
     return articles
 
 
+def extract_content(html: str) -> str:
+    """从正文页 HTML 提取正文
+
+    Args:
+        html: 正文页 HTML
+
+    Returns:
+        正文内容
+    """
+    return extract_paragraphs(html, CONTENT_SELECTORS) or "无法提取文章内容"
+
+
 async def fetch_content(url: str, client: AsyncClient) -> str:
     """获取文章正文内容
 
@@ -79,22 +97,8 @@ async def fetch_content(url: str, client: AsyncClient) -> str:
         正文内容
     """
     try:
-        response = await client.get(url, timeout=15)
+        response = await client.get(url)
         response.raise_for_status()
-
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # 澎湃新闻正文选择器
-        content_div = soup.find("div", class_="index_article__content") or \
-                      soup.find("div", class_="news_txt") or \
-                      soup.find("article")
-
-        if content_div:
-            paragraphs = content_div.find_all("p")
-            if paragraphs:
-                return "\n\n".join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
-
-        return "无法提取文章内容"
+        return extract_content(response.text)
     except Exception as e:
         return f"获取内容失败: {e}"
@@ -8,6 +8,10 @@ from httpx import Response, AsyncClient
 from datetime import datetime
 
 from ...models import Article, SourceType
+from .base import NotModified, extract_paragraphs, get_list
+
+# 今日头条正文容器（按优先级）
+CONTENT_SELECTORS = ("div.article-content", "div.syl-article-base", "article")
 
 
 async def parse(response: Response, source_config: Dict[str, Any], client: AsyncClient = None, limit: int = 20) -> List[Article]:
@@ -30,9 +34,9 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
 
     try:
         url = "https://www.toutiao.com/hot-event/hot-board/?origin=toutiao_pc"
-        resp = await client.get(url, headers={
+        resp = await get_list(client, url, headers={
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }, timeout=30)
+        })
         resp.raise_for_status()
         data = resp.json()
 
@@ -59,12 +63,26 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
             )
             articles.append(article)
 
+    except NotModified:
+        return []  # 列表未变化（304 或内容相同），跳过解析
     except Exception as e:
         print(f"[Toutiao] Error: {e}")
 
     return articles
 
 
+def extract_content(html: str) -> str:
+    """从正文页 HTML 提取正文
+
+    Args:
+        html: 正文页 HTML
+
+    Returns:
+        正文内容
+    """
+    return extract_paragraphs(html, CONTENT_SELECTORS) or "无法提取文章内容"
+
+
 async def fetch_content(url: str, client: AsyncClient) -> str:
     """获取文章正文内容
 
@@ -76,22 +94,8 @@ async def fetch_content(url: str, client: AsyncClient) -> str:
         正文内容
     """
     try:
-        response = await client.get(url, timeout=15)
+        response = await client.get(url)
         response.raise_for_status()
-
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # 今日头条正文选择器
-        content_div = soup.find("div", class_="article-content") or \
-                      soup.find("div", class_="syl-article-base") or \
-                      soup.find("article")
-
-        if content_div:
-            paragraphs = content_div.find_all("p")
-            if paragraphs:
-                return "\n\n".join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
-
-        return "无法提取文章内容"
+        return extract_content(response.text)
     except Exception as e:
         return f"获取内容失败: {e}"
@@ -8,15 +8,21 @@ from httpx import Response, AsyncClient
 from datetime import datetime
 
 from ...models import Article, SourceType
+from .base import NotModified, extract_paragraphs, get_list, older_than
 
+# 正文容器（按优先级）
+CONTENT_SELECTORS = ("div.article-content", "div.content", "article")
 
-async def parse(response: Response, source_config: Dict[str, Any], client: AsyncClient = None, limit: int = 20) -> List[Article]:
+
+async def parse(response: Response, source_config: Dict[str, Any], client: AsyncClient = None, limit: int = 20,
+                since: datetime = None) -> List[Article]:
     """解析华尔街见闻快讯响应
 
     Args:
         response: HTTP 响应对象
         source_config: 新闻源配置
         client: HTTP 客户端
+        since: 水位（上次抓取到的最新发布时间），早于它的条目不再解析
 
     Returns:
         文章列表
@@ -29,7 +35,7 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
 
     try:
         url = source_config["url"]
-        resp = await client.get(url, timeout=30)
+        resp = await get_list(client, url)
         resp.raise_for_status()
         data = resp.json()
 
@@ -60,6 +66,10 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
             except (ValueError, TypeError):
                 continue  # 时间解析失败，跳过
 
+            # 列表按时间倒序，到达水位即停止
+            if older_than(publish_time, since):
+                break
+
             article = Article(
                 title=title,
                 url=uri,
@@ -68,30 +78,24 @@ async def parse(response: Response, source_config: Dict[str, Any], client: Async
             )
             articles.append(article)
 
+    except NotModified:
+        return []  # 列表未变化（304 或内容相同），跳过解析
     except Exception as e:
         print(f"[WallstreetcnLive] Error: {e}")
 
     return articles
 
 
+def extract_content(html: str) -> str:
+    """从正文页 HTML 提取正文"""
+    return extract_paragraphs(html, CONTENT_SELECTORS) or "无法提取文章内容"
+
+
 async def fetch_content(url: str, client: AsyncClient) -> str:
     """获取文章正文内容"""
     try:
-        response = await client.get(url, timeout=15)
+        response = await client.get(url)
         response.raise_for_status()
-
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        content_div = soup.find("div", class_="article-content") or \
-                      soup.find("div", class_="content") or \
-                      soup.find("article")
-
-        if content_div:
-            paragraphs = content_div.find_all("p")
-            if paragraphs:
-                return "\n\n".join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
-
-        return "无法提取文章内容"
+        return extract_content(response.text)
     except Exception as e:
         return f"获取内容失败: {e}"
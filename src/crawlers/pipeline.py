@@ -0,0 +1,127 @@
+"""流式抓取流水线
+
+把抓取拆成若干阶段（列表抓取 → 去重筛选 → 正文抓取 → 入库），
+阶段之间用有界 asyncio.Queue 连接：
+- 某个新闻源的结果到达后立即流向下游，不再等待最慢的新闻源
+- 下游处理不过来时队列写满，上游在 put 处等待（背压），内存中只保留有限批次
+- 每个阶段可配置多个 worker 并发处理；worker 数为 1 的阶段按到达顺序串行处理
+
+处理函数返回 None 表示丢弃该条目（不再流向下游）；处理函数抛出的异常
+只影响当前条目，不会中断流水线。
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+# 队列结束标记
+_DONE = object()
+
+Handler = Callable[[Any], Awaitable[Any]]
+
+
+class Stage:
+    """流水线阶段"""
+
+    def __init__(self, name: str, handler: Handler, workers: int = 1):
+        """初始化阶段
+
+        Args:
+            name: 阶段名称（日志与统计用）
+            handler: 异步处理函数，输入上游条目，返回下游条目（None 表示丢弃）
+            workers: 并发 worker 数
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """阶段统计"""
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+class Pipeline:
+    """由有界队列连接的多阶段流水线"""
+
+    def __init__(self, queue_size: int = 4):
+        """初始化流水线
+
+        Args:
+            queue_size: 阶段间队列长度（上限，写满时上游等待）
+        """
+        self.queue_size = max(1, queue_size)
+        self.stages: List[Stage] = []
+
+    def add_stage(self, name: str, handler: Handler, workers: int = 1) -> "Pipeline":
+        """追加阶段（按添加顺序连接）"""
+        self.stages.append(Stage(name, handler, workers))
+        return self
+
+    async def run(self, items: Iterable[Any]) -> List[Any]:
+        """运行流水线直到所有条目处理完成
+
+        Args:
+            items: 输入条目（送入第一个阶段）
+
+        Returns:
+            最后一个阶段的输出（按完成顺序）
+        """
+        if not self.stages:
+            return list(items)
+
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        outputs: List[Any] = []
+
+        async def feed():
+            for item in items:
+                await queues[0].put(item)
+            for _ in range(self.stages[0].workers):
+                await queues[0].put(_DONE)
+
+        async def work(index: int, stage: Stage):
+            inbox = queues[index]
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                try:
+                    result = await stage.handler(item)
+                except Exception as e:
+                    stage.failed += 1
+                    print(f"[Pipeline] {stage.name} 处理失败: {e}")
+                    continue
+                stage.processed += 1
+                if result is None:
+                    stage.dropped += 1
+                elif index + 1 < len(queues):
+                    await queues[index + 1].put(result)
+                else:
+                    outputs.append(result)
+
+        async def run_stage(index: int, stage: Stage):
+            await asyncio.gather(*(work(index, stage) for _ in range(stage.workers)))
+            # 本阶段全部 worker 结束后通知下游结束
+            if index + 1 < len(queues):
+                for _ in range(self.stages[index + 1].workers):
+                    await queues[index + 1].put(_DONE)
+
+        tasks = [asyncio.create_task(feed())]
+        tasks += [asyncio.create_task(run_stage(i, s)) for i, s in enumerate(self.stages)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return outputs
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """各阶段统计"""
+        return [stage.stats() for stage in self.stages]
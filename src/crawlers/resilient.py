@@ -0,0 +1,273 @@
+"""容错请求层（重试 + 熔断 + 请求计时）
+
+解析器通过 ResilientClient 发请求（接口与 httpx.AsyncClient 的 get/post 相同）：
+- 网络错误、超时、429/5xx 按 network.retry 次数重试，
+  间隔为 retry_delay 起步的指数退避并加随机抖动；
+  单次请求（含全部重试与退避）不超过 network.retry_budget 秒
+- 每个新闻源一个熔断器：每次失败的尝试都计数，连续失败达到阈值后熔断
+  （请求中途熔断则不再重试），冷却期内直接跳过该源；
+  冷却期结束后只放行一个试探请求，成功则恢复，失败则重新进入冷却期
+- 每次尝试的耗时与结果计入 request_metrics（按新闻源汇总）与进程内指标（/metrics）
+- 列表接口用 get_list 发条件请求，内容未变化时抛出 NotModified
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Dict, Optional, Sequence
+
+import httpx
+
+from ..config.models import NetworkConfig
+from ..metrics import source_request_duration_seconds, source_requests_total
+from .response_cache import ResponseCache, response_cache
+
+# 可重试的响应状态码
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """新闻源处于熔断状态（冷却期内不发请求）"""
+
+    def __init__(self, source_id: str, retry_after: float):
+        self.source_id = source_id
+        self.retry_after = retry_after
+        super().__init__(f"{source_id} 已熔断，{retry_after:.0f} 秒后重试")
+
+
+class CircuitBreaker:
+    """熔断器：closed（正常）→ open（熔断）→ half-open（试探）"""
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 300):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False  # half-open 时是否已有试探请求在进行
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def retry_after(self) -> float:
+        """距离冷却期结束的秒数"""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """是否允许发出请求（half-open 时只放行一个试探，一次失败即重新熔断）"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open" or self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def release_probe(self) -> None:
+        """试探请求未记录结果就结束（如被取消）时释放，允许下一个试探"""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self._opened_at is not None or self.failures >= self.failure_threshold:
+            # 试探失败或连续失败达到阈值：（重新）进入冷却期
+            self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        self.record_success()
+
+
+class RequestMetrics:
+    """请求计时统计（按新闻源汇总每次尝试）"""
+
+    def __init__(self):
+        self._sources: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, source_id: str, elapsed: float, ok: bool, retried: bool = False,
+               error: str = None) -> None:
+        stats = self._sources.setdefault(source_id, {
+            "attempts": 0, "failures": 0, "retries": 0,
+            "total_seconds": 0.0, "max_seconds": 0.0, "last_error": None,
+        })
+        stats["attempts"] += 1
+        stats["total_seconds"] += elapsed
+        source_requests_total.inc(source=source_id, outcome="success" if ok else "failure")
+        source_request_duration_seconds.observe(elapsed, source=source_id)
+        stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+        if retried:
+            stats["retries"] += 1
+        if not ok:
+            stats["failures"] += 1
+            stats["last_error"] = error
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """各新闻源统计（附平均耗时）"""
+        result = {}
+        for source_id, stats in self._sources.items():
+            avg = stats["total_seconds"] / stats["attempts"] if stats["attempts"] else 0.0
+            result[source_id] = {**stats, "avg_seconds": round(avg, 4)}
+        return result
+
+    def clear(self) -> None:
+        self._sources.clear()
+
+
+class ResilientClient:
+    """带重试与熔断的请求封装（供解析器使用）
+
+    其余属性（headers、cookies 等）透传给底层 httpx.AsyncClient
+    """
+
+    def __init__(self, client: httpx.AsyncClient, source_id: str,
+                 config: NetworkConfig = None, breaker: CircuitBreaker = None,
+                 metrics: RequestMetrics = None, cache: ResponseCache = None):
+        self.client = client
+        self.source_id = source_id
+        self.config = config or NetworkConfig()
+        self.breaker = breaker or get_breaker(source_id, self.config)
+        self.metrics = metrics or request_metrics
+        self.cache = cache or response_cache
+        self.bytes_received = 0  # 成功响应的正文字节数（阶段统计用）
+
+    def _backoff(self, attempt: int) -> float:
+        """第 attempt 次重试前的等待时间（指数退避 + 抖动）"""
+        delay = min(self.config.retry_backoff_max, self.config.retry_delay * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """发送请求（失败按配置重试）
+
+        Raises:
+            CircuitOpenError: 新闻源处于熔断状态
+            httpx.HTTPError: 重试耗尽（或超出 retry_budget、中途熔断）后的最后一个错误
+        """
+        probing = self.breaker.state == "half-open"
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.source_id, self.breaker.retry_after())
+        try:
+            return await self._request(method, url, **kwargs)
+        finally:
+            if probing:
+                self.breaker.release_probe()
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        kwargs.setdefault("timeout", self.config.timeout)
+        retries = max(0, self.config.retry)
+        deadline = time.monotonic() + self.config.retry_budget
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            error: Optional[Exception] = None
+            response: Optional[httpx.Response] = None
+            try:
+                # 单次尝试不超过剩余预算（服务端挂起时 httpx 的读超时按块计算，不能限制总时长）
+                response = await asyncio.wait_for(
+                    self.client.request(method, url, **kwargs),
+                    timeout=max(0.0, deadline - time.monotonic()),
+                )
+            except httpx.TransportError as e:
+                error = e
+            except asyncio.TimeoutError:
+                error = httpx.TimeoutException(f"超出重试时间预算 {self.config.retry_budget}s")
+            elapsed = time.perf_counter() - start
+
+            retryable = error is not None or response.status_code in RETRY_STATUS_CODES
+            if not retryable:
+                self.metrics.record(self.source_id, elapsed, ok=True, retried=attempt > 0)
+                self.breaker.record_success()
+                self.bytes_received += len(response.content)
+                return response
+
+            reason = repr(error) if error is not None else f"HTTP {response.status_code}"
+            self.metrics.record(self.source_id, elapsed, ok=False, retried=attempt > 0, error=reason)
+            self.breaker.record_failure()
+            delay = self._backoff(attempt)
+            # 重试耗尽、已熔断或退避后已无剩余预算：不再重试
+            if (attempt >= retries or self.breaker.state != "closed"
+                    or time.monotonic() + delay >= deadline):
+                if error is not None:
+                    raise error
+                return response  # 交给调用方 raise_for_status
+
+            print(f"[Resilient] {self.source_id} {reason}，{delay:.1f}s 后第 {attempt + 1} 次重试: {url}")
+            if response is not None:
+                await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def get_list(self, url: str, cache_ignore_params: Sequence[str] = (), **kwargs) -> httpx.Response:
+        """请求列表接口（带 If-None-Match / If-Modified-Since）
+
+        内容有变化时新的校验信息按新闻源暂存，入库成功后由调用方
+        response_cache.commit(source_id) 生效
+
+        Args:
+            url: 列表接口 URL
+            cache_ignore_params: 不计入缓存键的查询参数（如每轮变化的增量游标），
+                否则缓存键每轮都变，永远不会命中
+
+        Raises:
+            NotModified: 服务端返回 304，或响应体与上次相同
+        """
+        request_url = httpx.URL(url, params=kwargs.get("params"))
+        for name in cache_ignore_params:
+            request_url = request_url.copy_remove_param(name)
+        key = str(request_url)
+        headers = {**self.cache.conditional_headers(key), **(kwargs.pop("headers", None) or {})}
+        response = await self.get(url, headers=headers, **kwargs)
+        self.cache.check(key, response, owner=self.source_id)
+        return response
+
+    def __getattr__(self, name: str):
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(source_id: str, config: NetworkConfig = None) -> CircuitBreaker:
+    """获取新闻源的熔断器（跨抓取轮次保持状态）"""
+    breaker = _breakers.get(source_id)
+    if breaker is None:
+        config = config or NetworkConfig()
+        breaker = _breakers[source_id] = CircuitBreaker(
+            failure_threshold=config.circuit_failure_threshold,
+            cooldown=config.circuit_cooldown,
+        )
+    return breaker
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """各新闻源熔断器状态"""
+    return {
+        source_id: {
+            "state": breaker.state,
+            "failures": breaker.failures,
+            "retry_after": round(breaker.retry_after(), 1),
+        }
+        for source_id, breaker in _breakers.items()
+    }
+
+
+# 全局单例
+request_metrics = RequestMetrics()
@@ -0,0 +1,146 @@
+"""列表接口的条件请求缓存
+
+多数新闻源的列表接口每轮都被轮询，但两轮之间常常没有新内容。
+按 URL 记录上次响应的校验信息（ETag / Last-Modified / 响应体哈希）：
+- 请求时带上 If-None-Match / If-Modified-Since，服务端返回 304 即可跳过
+- 服务端不支持条件请求时，响应体哈希与上次相同也跳过解析
+
+两种情况都抛出 NotModified，由解析器返回空列表。
+
+内容有变化时，新的校验信息先按新闻源暂存（owner），待该源本轮入库成功后
+由 run_crawl 调用 commit 生效；解析或入库失败时调用 discard 丢弃，
+下轮仍按旧校验信息请求并重新解析，不会因缓存已更新而漏掉这批条目。
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import httpx
+
+
+class NotModified(Exception):
+    """列表内容自上次抓取以来未变化"""
+
+    def __init__(self, url: str, reason: str):
+        self.url = url
+        self.reason = reason  # "304" | "hash"
+        super().__init__(f"列表未变化（{reason}）: {url}")
+
+
+class ResponseCache:
+    """按 URL 保存校验信息（只存响应体哈希，不存响应体本身）"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Optional[str]]]" = OrderedDict()
+        # 待生效的校验信息 {owner: {url: validators}}（内容有变化、尚未入库）
+        self._pending: Dict[str, Dict[str, Dict[str, Optional[str]]]] = {}
+        self.not_modified = 0  # 服务端返回 304
+        self.unchanged = 0  # 响应体哈希未变
+        self.changed = 0  # 内容有变化（需要解析）
+
+    @staticmethod
+    def body_hash(content: bytes) -> str:
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """条件请求头（无缓存记录时为空）"""
+        entry = self._entries.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def check(self, url: str, response: httpx.Response, owner: str = None) -> None:
+        """检查响应是否有变化
+
+        Args:
+            url: 缓存键
+            response: 列表响应
+            owner: 新闻源ID（可选）。指定时内容有变化的校验信息先暂存，
+                commit(owner) 后才生效；未指定时立即生效
+
+        Raises:
+            NotModified: 304 或响应体哈希与上次相同
+        """
+        entry = self._entries.get(url)
+        if response.status_code == 304 and entry is not None:
+            self._entries.move_to_end(url)
+            self.not_modified += 1
+            raise NotModified(url, "304")
+        if not response.is_success:
+            return  # 错误响应不记录，交给调用方 raise_for_status
+
+        digest = self.body_hash(response.content)
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "hash": digest,
+        }
+        if entry is not None and entry.get("hash") == digest:
+            # 内容与已生效的记录相同：直接更新校验信息（可能换了 ETag）
+            self._store(url, validators)
+            self.unchanged += 1
+            raise NotModified(url, "hash")
+
+        self.changed += 1
+        if owner is None:
+            self._store(url, validators)
+        else:
+            self._pending.setdefault(owner, {})[url] = validators
+
+    def _store(self, url: str, validators: Dict[str, Optional[str]]) -> None:
+        self._entries[url] = validators
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def commit(self, owner: str) -> int:
+        """使新闻源暂存的校验信息生效（该源本轮入库成功后调用）
+
+        Returns:
+            生效的记录数
+        """
+        pending = self._pending.pop(owner, {})
+        for url, validators in pending.items():
+            self._store(url, validators)
+        return len(pending)
+
+    def discard(self, owner: str) -> int:
+        """丢弃新闻源暂存的校验信息（解析或入库失败时调用，下轮重新解析）
+
+        Returns:
+            丢弃的记录数
+        """
+        return len(self._pending.pop(owner, {}))
+
+    def invalidate(self, url: str = None) -> None:
+        """删除记录（url 为 None 时清空），下次请求必定重新解析"""
+        if url is None:
+            self._entries.clear()
+            self._pending.clear()
+        else:
+            self._entries.pop(url, None)
+            for pending in self._pending.values():
+                pending.pop(url, None)
+
+    def stats(self) -> Dict[str, float]:
+        total = self.not_modified + self.unchanged + self.changed
+        skipped = self.not_modified + self.unchanged
+        return {
+            "entries": len(self._entries),
+            "pending": sum(len(p) for p in self._pending.values()),
+            "not_modified": self.not_modified,
+            "unchanged": self.unchanged,
+            "changed": self.changed,
+            "skip_ratio": round(skipped / total, 4) if total else 0.0,
+        }
+
+
+# 全局单例
+response_cache = ResponseCache()
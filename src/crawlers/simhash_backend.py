@@ -0,0 +1,96 @@
+"""SimHash 批量比较后端（NumPy 向量化）
+
+把指纹打包成 uint64 数组，一批新指纹与整个候选矩阵一次性做 XOR + popcount，
+替代逐对调用 Simhash.distance。
+
+NumPy 为可选依赖（pip install -e .[fast]），未安装时 HAS_NUMPY 为 False，
+去重器自动回退到 SimhashIndex 分段索引，判定结果相同。
+"""
+
+from typing import Iterable, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 取决于环境
+    np = None
+
+HAS_NUMPY = np is not None
+
+
+def _build_popcount():
+    """选择 popcount 实现：NumPy >= 2.0 自带 bitwise_count，否则按字节查表"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count
+
+    table = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(values):
+        as_bytes = values.view(np.uint8).reshape(values.shape + (8,))
+        return table[as_bytes].sum(axis=-1, dtype=np.uint8)
+
+    return popcount
+
+
+_popcount = _build_popcount() if HAS_NUMPY else None
+
+
+class HammingMatrix:
+    """指纹矩阵：批量计算汉明距离"""
+
+    # 每次参与比较的查询行数（限制 行数 × 候选数 的临时数组大小）
+    CHUNK_ROWS = 256
+
+    def __init__(self, fingerprints: Iterable[int] = ()):
+        if not HAS_NUMPY:
+            raise ImportError("HammingMatrix 需要安装 numpy")
+        self._fps = self._pack(fingerprints)
+
+    @staticmethod
+    def _pack(fingerprints: Iterable[int]):
+        """打包为 uint64 数组"""
+        return np.fromiter(fingerprints, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._fps)
+
+    def distances(self, fingerprints: Sequence[int]):
+        """查询指纹与矩阵内全部指纹的汉明距离（形状 len(fingerprints) × len(self)）"""
+        queries = self._pack(fingerprints)
+        return _popcount(queries[:, None] ^ self._fps[None, :])
+
+    def any_within(self, fingerprints: Sequence[int], threshold: int) -> List[bool]:
+        """每个查询指纹是否存在汉明距离 <= threshold 的候选"""
+        if not len(self._fps):
+            return [False] * len(fingerprints)
+
+        result: List[bool] = []
+        for start in range(0, len(fingerprints), self.CHUNK_ROWS):
+            chunk = fingerprints[start:start + self.CHUNK_ROWS]
+            hits = (self.distances(chunk) <= threshold).any(axis=1)
+            result.extend(hits.tolist())
+        return result
+
+
+def greedy_unique(fingerprints: Sequence[int], threshold: int) -> List[int]:
+    """批次内贪心排重：按顺序保留与已保留指纹都不相似的下标
+
+    与逐篇比较的顺序语义一致：先计算批次内两两相似矩阵，再顺序扫描一遍。
+
+    Returns:
+        保留的下标列表
+    """
+    if not HAS_NUMPY:
+        raise ImportError("greedy_unique 需要安装 numpy")
+
+    n = len(fingerprints)
+    if n == 0:
+        return []
+
+    similar = HammingMatrix(fingerprints).distances(fingerprints) <= threshold
+    kept_mask = np.zeros(n, dtype=bool)
+    kept: List[int] = []
+    for i in range(n):
+        if not (similar[i] & kept_mask).any():
+            kept_mask[i] = True
+            kept.append(i)
+    return kept
@@ -0,0 +1,145 @@
+"""SimHash 近似查找索引
+
+64 位指纹按位切成 k 段，每段建一张 {段值: keys} 表。
+抽屉原理：若两个指纹汉明距离 <= d，则至少有一段的距离 <= d // k。
+查询时对每段枚举距离 <= d // k 的所有段值去查表，得到候选后再精确校验，
+结果与线性两两比较完全一致，但查找次数与已索引的指纹数无关。
+
+默认 4 段 × 16 位、阈值 15：每段半径 3，单次查询约 4 × 697 次查表。
+"""
+
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class SimhashIndex:
+    """SimHash 分段索引（汉明距离近邻查找）"""
+
+    def __init__(self, threshold: int = 15, bits: int = 64, bands: int = 4):
+        """初始化索引
+
+        Args:
+            threshold: 默认汉明距离阈值（<= 视为相似）
+            bits: 指纹位数
+            bands: 分段数
+        """
+        if bands <= 0 or bands > bits:
+            raise ValueError(f"分段数必须在 1~{bits} 之间: {bands}")
+
+        self.threshold = threshold
+        self.bits = bits
+        self.bands = bands
+
+        # 每段的 (起始位, 位宽)，余数分给前几段
+        base, extra = divmod(bits, bands)
+        self._spans: List[Tuple[int, int]] = []
+        offset = 0
+        for i in range(bands):
+            width = base + (1 if i < extra else 0)
+            self._spans.append((offset, width))
+            offset += width
+
+        self._tables: List[Dict[int, Set[str]]] = [defaultdict(set) for _ in range(bands)]
+        self._fingerprints: Dict[str, int] = {}
+        self._masks_cache: Dict[Tuple[int, int], List[int]] = {}
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        """拆分出每段的段值"""
+        return [(fingerprint >> offset) & ((1 << width) - 1) for offset, width in self._spans]
+
+    def _masks(self, width: int, radius: int) -> List[int]:
+        """位宽 width 内 popcount <= radius 的所有异或掩码（缓存）"""
+        cache_key = (width, radius)
+        masks = self._masks_cache.get(cache_key)
+        if masks is None:
+            masks = [0]
+            for r in range(1, min(radius, width) + 1):
+                for positions in combinations(range(width), r):
+                    mask = 0
+                    for pos in positions:
+                        mask |= 1 << pos
+                    masks.append(mask)
+            self._masks_cache[cache_key] = masks
+        return masks
+
+    def add(self, key: str, fingerprint: int) -> None:
+        """添加指纹（同 key 重复添加会覆盖旧指纹）"""
+        if key in self._fingerprints:
+            self.remove(key)
+        self._fingerprints[key] = fingerprint
+        for table, value in zip(self._tables, self._band_values(fingerprint)):
+            table[value].add(key)
+
+    def add_batch(self, items: Iterable[Tuple[str, int]]) -> None:
+        """批量添加 (key, fingerprint)"""
+        for key, fingerprint in items:
+            self.add(key, fingerprint)
+
+    def remove(self, key: str) -> None:
+        """移除指纹"""
+        fingerprint = self._fingerprints.pop(key, None)
+        if fingerprint is None:
+            return
+        for table, value in zip(self._tables, self._band_values(fingerprint)):
+            bucket = table.get(value)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del table[value]
+
+    def near(self, fingerprint: int, threshold: Optional[int] = None) -> List[str]:
+        """查找汉明距离 <= threshold 的所有 key"""
+        threshold = self.threshold if threshold is None else threshold
+        radius = threshold // self.bands
+
+        candidates: Set[str] = set()
+        for table, value, (_, width) in zip(
+            self._tables, self._band_values(fingerprint), self._spans
+        ):
+            for mask in self._masks(width, radius):
+                bucket = table.get(value ^ mask)
+                if bucket:
+                    candidates.update(bucket)
+
+        return [
+            key for key in candidates
+            if (self._fingerprints[key] ^ fingerprint).bit_count() <= threshold
+        ]
+
+    def has_near(self, fingerprint: int, threshold: Optional[int] = None) -> bool:
+        """是否存在汉明距离 <= threshold 的指纹（命中即返回）"""
+        threshold = self.threshold if threshold is None else threshold
+        radius = threshold // self.bands
+
+        for table, value, (_, width) in zip(
+            self._tables, self._band_values(fingerprint), self._spans
+        ):
+            for mask in self._masks(width, radius):
+                bucket = table.get(value ^ mask)
+                if not bucket:
+                    continue
+                for key in bucket:
+                    if (self._fingerprints[key] ^ fingerprint).bit_count() <= threshold:
+                        return True
+        return False
+
+    def fingerprints(self) -> List[int]:
+        """全部指纹（顺序与插入顺序一致）"""
+        return list(self._fingerprints.values())
+
+    def get(self, key: str) -> Optional[int]:
+        """获取 key 对应的指纹"""
+        return self._fingerprints.get(key)
+
+    def clear(self) -> None:
+        """清空索引"""
+        for table in self._tables:
+            table.clear()
+        self._fingerprints.clear()
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._fingerprints
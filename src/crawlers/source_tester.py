@@ -12,24 +12,21 @@ from typing import List, Dict, Any
 from datetime import datetime
 
 from ..config import ConfigReader
+from .http_client import http_client_manager
 
 
 class SourceTester:
     """新闻源测试器"""
 
-    def __init__(self, config_dir: str = "config"):
+    def __init__(self, config_dir: str = "config", client: httpx.AsyncClient = None):
         """初始化测试器
 
         Args:
             config_dir: 配置文件目录
+            client: HTTP 客户端（可选，默认借用进程级共享客户端）
         """
         self.config_dir = config_dir
-        self.client = httpx.AsyncClient(
-            timeout=30,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-        )
+        self.client = client or http_client_manager.get_client()
 
     async def test_all(self) -> Dict[str, Any]:
         """测试所有启用的新闻源
@@ -130,8 +127,8 @@ class SourceTester:
         return result
 
     async def close(self):
-        """关闭 HTTP 客户端"""
-        await self.client.aclose()
+        """释放测试器（客户端为借用的共享客户端，不在此关闭）"""
+        self.client = None
 
     async def __aenter__(self):
         return self
@@ -0,0 +1,99 @@
+"""抓取阶段计时与计数
+
+一轮抓取（run_crawl）对应一个 SpanRecorder，每个阶段执行一次记录一个 span：
+列表抓取（每个新闻源）、正文抓取、各层去重、关键词筛选、正文文件写入、入库。
+每个 span 记录耗时、输入/输出条数与字节数，抓取结束后持久化到调度器数据库
+（见 scheduler.store.CrawlSpanStore），通过 /admin/metrics 查看；
+耗时与条数同时计入进程内指标（/metrics）。
+"""
+
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..metrics import crawl_stage_duration_seconds, crawl_stage_items_total
+from ..models import Article
+
+
+class Span:
+    """单个阶段的一次执行"""
+
+    __slots__ = ("stage", "source_id", "started_at", "duration", "items_in", "items_out",
+                 "bytes", "status", "error")
+
+    def __init__(self, stage: str, source_id: Optional[str] = None, items_in: int = 0):
+        self.stage = stage
+        self.source_id = source_id
+        self.started_at = datetime.now()
+        self.duration = 0.0  # 秒
+        self.items_in = items_in
+        self.items_out = 0
+        self.bytes = 0
+        self.status = "success"
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "source_id": self.source_id,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 3),
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "bytes": self.bytes,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class SpanRecorder:
+    """一轮抓取的阶段记录"""
+
+    def __init__(self, run_id: str = None):
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d%H%M%S-") + uuid.uuid4().hex[:6]
+        self.spans: List[Span] = []
+
+    @contextmanager
+    def span(self, stage: str, source_id: str = None, items_in: int = 0) -> Iterator[Span]:
+        """记录一个阶段（with 块内设置 items_out / bytes，异常时标记 error 并继续抛出）"""
+        span = Span(stage, source_id, items_in)
+        start = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span.status = "error"
+            span.error = str(e)
+            raise
+        finally:
+            span.duration = time.perf_counter() - start
+            self.spans.append(span)
+            crawl_stage_duration_seconds.observe(span.duration, stage=stage)
+            crawl_stage_items_total.inc(span.items_in, stage=stage, direction="in")
+            crawl_stage_items_total.inc(span.items_out, stage=stage, direction="out")
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """按阶段汇总（次数、总耗时、条数、字节数）"""
+        stages: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans:
+            stat = stages.setdefault(span.stage, {
+                "count": 0, "duration_ms": 0.0, "items_in": 0, "items_out": 0, "bytes": 0, "errors": 0,
+            })
+            stat["count"] += 1
+            stat["duration_ms"] = round(stat["duration_ms"] + span.duration * 1000, 3)
+            stat["items_in"] += span.items_in
+            stat["items_out"] += span.items_out
+            stat["bytes"] += span.bytes
+            stat["errors"] += span.status != "success"
+        return stages
+
+
+def article_bytes(articles: List[Article], content: bool = False) -> int:
+    """文章标题（及正文）的 UTF-8 字节数"""
+    total = 0
+    for article in articles:
+        total += len(article.title.encode("utf-8"))
+        if content and article.content:
+            total += len(article.content.encode("utf-8"))
+    return total
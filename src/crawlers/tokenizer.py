@@ -0,0 +1,154 @@
+"""分词服务
+
+统一管理 jieba 分词：
+- 词典预加载：服务启动时在后台线程加载（首次 jieba.cut 需要数秒），
+  不再由第一轮抓取的去重承担
+- 前缀词典缓存：构建好的前缀词典序列化到指定文件（默认在系统临时目录，
+  容器重启后会丢失），之后启动直接加载
+- 分词结果缓存：清理后的标题 → 分词结果（有界 LRU），同一标题每轮抓取都会出现
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import jieba
+
+from ..config.models import TokenizerConfig
+
+
+class Tokenizer:
+    """带预加载与结果缓存的分词器"""
+
+    def __init__(self, config: TokenizerConfig = None):
+        self.config = config or TokenizerConfig()
+        self._cache: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._warmup_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.warmup_seconds: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, config: TokenizerConfig) -> None:
+        """设置配置（词典缓存路径需在预加载前设置）"""
+        self.config = config
+        with self._cache_lock:
+            while len(self._cache) > self.config.cache_size:
+                self._cache.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # 词典预加载
+    # ------------------------------------------------------------------
+
+    @property
+    def ready(self) -> bool:
+        """词典是否已加载"""
+        return self._ready.is_set()
+
+    def warmup(self) -> float:
+        """加载词典（重复调用无副作用）
+
+        Returns:
+            加载耗时（秒）
+        """
+        with self._warmup_lock:
+            if self._ready.is_set():
+                return self.warmup_seconds or 0.0
+            start = time.perf_counter()
+            jieba.setLogLevel(60)
+            if self.config.dict_cache:
+                cache_path = Path(self.config.dict_cache)
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                jieba.dt.tmp_dir = str(cache_path.parent)
+                jieba.dt.cache_file = cache_path.name
+            jieba.initialize()
+            self.warmup_seconds = time.perf_counter() - start
+            self._ready.set()
+        print(f"[Tokenizer] 词典加载完成: {self.warmup_seconds:.2f}s")
+        return self.warmup_seconds
+
+    def start_warmup(self) -> None:
+        """在后台线程加载词典（服务启动时调用，不阻塞启动）"""
+        if self._ready.is_set() or (self._thread and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(target=self._warmup_safely, name="tokenizer-warmup", daemon=True)
+        self._thread.start()
+
+    def _warmup_safely(self) -> None:
+        try:
+            self.warmup()
+        except Exception as e:
+            print(f"[Tokenizer] 词典预加载失败（首次分词时再加载）: {e}")
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """等待词典加载完成"""
+        return self._ready.wait(timeout)
+
+    # ------------------------------------------------------------------
+    # 分词
+    # ------------------------------------------------------------------
+
+    def cut(self, text: str) -> Tuple[str, ...]:
+        """分词（结果缓存，返回不可变元组）"""
+        with self._cache_lock:
+            words = self._cache.get(text)
+            if words is not None:
+                self._cache.move_to_end(text)
+                self.hits += 1
+                return words
+            self.misses += 1
+
+        if not self._ready.is_set():
+            self.warmup()  # 预加载尚未完成：在此等待（与后台线程共用锁，不会重复加载）
+        words = tuple(jieba.cut(text))
+
+        if self.config.cache_size > 0:
+            with self._cache_lock:
+                self._cache[text] = words
+                self._cache.move_to_end(text)
+                while len(self._cache) > self.config.cache_size:
+                    self._cache.popitem(last=False)
+        return words
+
+    def clear_cache(self) -> None:
+        """清空分词结果缓存与计数"""
+        with self._cache_lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self, workers: Dict[str, Any] = None) -> Dict[str, Any]:
+        """预加载状态与缓存命中统计
+
+        Args:
+            workers: 工作进程的缓存计数汇总（WorkerPool.tokenizer_stats()）。
+                启用进程池时标题指纹在工作进程中计算，需合并后才是完整的命中统计
+
+        Returns:
+            entries/hits/misses/hit_ratio 为本进程与工作进程合计；
+            local 为本进程，workers 为工作进程
+        """
+        local = {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
+        workers = workers or {"processes": 0, "entries": 0, "hits": 0, "misses": 0}
+        hits = local["hits"] + workers["hits"]
+        misses = local["misses"] + workers["misses"]
+        return {
+            "ready": self.ready,
+            "warmup_seconds": round(self.warmup_seconds, 3) if self.warmup_seconds is not None else None,
+            "dict_cache": self.config.dict_cache,
+            "cache_size": self.config.cache_size,
+            "entries": local["entries"] + workers["entries"],
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "local": local,
+            "workers": workers,
+        }
+
+
+# 全局单例
+tokenizer = Tokenizer()
@@ -5,70 +5,99 @@
 
 解析器标准接口：
     async def parse(response: httpx.Response, source_config: dict, client: httpx.AsyncClient) -> List[Article]
+
+解析器可选接受 since 参数（增量抓取的水位）
 """
 
 import importlib
+import inspect
+from datetime import datetime
 from typing import List, Dict, Any
 import httpx
 from pathlib import Path
 
 from ..models import Article, SourceType
+from ..config.models import NetworkConfig
 from ..config.reader import ConfigReader
+from .http_client import http_client_manager
+from .body_fetcher import BodyFetcher
+from .resilient import CircuitOpenError, ResilientClient
+from .workers import WorkerPool, worker_pool
 
 
 class UniversalCrawler:
     """通用爬虫 - 根据配置自动加载解析器"""
 
-    def __init__(self, source_config: Any, config_dir: str = "config", news_batch_limit: int = None):
+    def __init__(self, source_config: Any, config_dir: str = "config", news_batch_limit: int = None,
+                 client: httpx.AsyncClient = None, body_fetcher: BodyFetcher = None,
+                 network: NetworkConfig = None, since: datetime = None,
+                 workers: WorkerPool = None):
         """初始化通用爬虫
 
         Args:
             source_config: 新闻源配置对象
             config_dir: 配置文件目录
             news_batch_limit: 每次抓取的条数限制（可选，默认从配置读取）
+            client: HTTP 客户端（可选，默认借用进程级共享客户端）
+            body_fetcher: 正文并发抓取器（可选，多个新闻源共用时按主机统一限速）
+            network: 网络配置（可选，超时/重试/熔断参数，默认从配置读取）
+            since: 水位（可选，上次抓取到的最新发布时间，只解析之后的条目）
+            workers: 进程池（可选，默认使用全局进程池提取正文）
         """
         self.source = source_config
         self.config_dir = config_dir
+        self.since = since
+        self.workers = workers or worker_pool
 
-        # 读取 limit 配置
-        if news_batch_limit is None:
+        # 读取 limit、正文抓取与网络配置
+        if news_batch_limit is None or body_fetcher is None or network is None:
             try:
                 reader = ConfigReader(config_dir)
                 crawler_config = reader.load_crawler_config()
-                news_batch_limit = crawler_config.strategy.news_batch_limit
+                if news_batch_limit is None:
+                    news_batch_limit = crawler_config.strategy.news_batch_limit
+                if body_fetcher is None:
+                    body_fetcher = BodyFetcher(crawler_config.content_fetch)
+                if network is None:
+                    network = crawler_config.network
             except Exception as e:
-                print(f"Warning: Failed to load news_batch_limit: {e}")
-                news_batch_limit = 20  # 默认值
-        self.news_batch_limit = news_batch_limit
-
-        # 使用连接池限制，防止连接泄漏
-        self.client = httpx.AsyncClient(
-            timeout=30,
-            limits=httpx.Limits(
-                max_connections=10,      # 最大连接数
-                max_keepalive_connections=5,  # 保持活动的连接数
-                keepalive_expiry=30.0,    # keepalive 过期时间
-            ),
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-        )
+                print(f"Warning: Failed to load crawler config: {e}")
+        self.news_batch_limit = news_batch_limit if news_batch_limit is not None else 20  # 默认值
+        self.body_fetcher = body_fetcher or BodyFetcher()
+
+        # 借用共享客户端（长连接跨抓取轮次复用），不由爬虫关闭
+        self.client = client or http_client_manager.get_client()
+        # 解析器通过容错层发请求（重试、熔断、计时）
+        self.http = ResilientClient(self.client, self.source.id, network or NetworkConfig())
 
-    async def fetch(self) -> List[Article]:
+    async def fetch(self, fetch_contents: bool = True) -> List[Article]:
         """抓取并解析文章
 
+        Args:
+            fetch_contents: 是否同时抓取正文（False 时只抓列表，正文由调用方在筛选后
+                通过 fetch_contents() 按需抓取）
+
         Returns:
             文章列表
         """
+        # 0. 新闻源处于熔断冷却期时直接跳过，不占用并发名额
+        # （只读状态：half-open 的试探名额留给解析器发出的第一个请求）
+        if self.http.breaker.state == "open":
+            raise CircuitOpenError(self.source.id, self.http.breaker.retry_after())
+
         # 1. 动态加载解析器
         parser = self._load_parser()
 
         # 2. 调用解析器获取文章
+        kwargs = {}
+        if self.since is not None and "since" in inspect.signature(parser.parse).parameters:
+            kwargs["since"] = self.since
         articles = await parser.parse(
             response=None,  # 大多数解析器不需要此参数
             source_config=self._source_to_dict(),
-            client=self.client,
-            limit=self.news_batch_limit
+            client=self.http,
+            limit=self.news_batch_limit,
+            **kwargs
         )
 
         # 3. 设置文章来源
@@ -76,7 +105,8 @@ class UniversalCrawler:
             article.source = SourceType(self.source.id)
 
         # 4. 获取文章正文
-        await self._fetch_contents(articles)
+        if fetch_contents:
+            await self.fetch_contents(articles)
 
         return articles
 
@@ -109,27 +139,49 @@ class UniversalCrawler:
         except ImportError as e:
             raise ImportError(f"解析器不存在: {module_name}. 请创建 src/crawlers/parsers/{self.source.id}.py") from e
 
-    async def _fetch_contents(self, articles: List[Article]):
-        """获取文章正文内容"""
+    async def fetch_contents(self, articles: List[Article]):
+        """获取文章正文内容（有界并发，按主机限速）"""
         # 导入解析器的 fetch_content 函数
         try:
             parser = self._load_parser()
             fetch_func = getattr(parser, "fetch_content", None)
-
-            if fetch_func:
-                for article in articles:
-                    try:
-                        content = await fetch_func(article.url, self.client)
-                        article.content = content
-                    except Exception as e:
-                        print(f"Error fetching content for {article.url}: {e}")
-                        article.content = None
         except Exception as e:
             print(f"Error loading fetch_content: {e}")
+            return
+
+        extract_func = getattr(parser, "extract_content", None)
+        if extract_func and self.workers.enabled:
+            # 事件循环只下载 HTML，正文提取交给工作进程
+            await self._fetch_and_extract(articles)
+        elif fetch_func:
+            http = self.http
+            await self.body_fetcher.fetch_all(articles, lambda url: fetch_func(url, http))
+
+    async def _fetch_and_extract(self, articles: List[Article]):
+        """并发下载正文页，再批量交给进程池提取正文"""
+        http = self.http
+        pages: Dict[str, str] = {}
+
+        async def fetch_html(url: str):
+            try:
+                response = await http.get(url)
+                response.raise_for_status()
+                pages[url] = response.text
+                return None
+            except Exception as e:
+                return f"获取内容失败: {e}"
+
+        await self.body_fetcher.fetch_all(articles, fetch_html)
+
+        downloaded = [a for a in articles if a.url in pages]
+        contents = await self.workers.extract_contents(self.source.id, [pages[a.url] for a in downloaded])
+        for article, content in zip(downloaded, contents):
+            article.content = content
 
     async def close(self):
-        """关闭 HTTP 客户端"""
-        await self.client.aclose()
+        """释放爬虫（客户端为借用的共享客户端，不在此关闭）"""
+        self.client = None
+        self.http = None
 
     async def __aenter__(self):
         return self
@@ -0,0 +1,136 @@
+"""新闻源水位存储（增量抓取）
+
+按新闻源记录上次抓取到的最新条目（发布时间 + URL），保存在调度器数据库中。
+下次抓取时把水位作为 since 传给解析器：按时间倒序的列表到达水位即停止，
+支持增量参数的 API（如财联社电报 lastTime）直接只请求水位之后的条目。
+热榜等非时间序列表与多频道新闻源的解析器不接受 since，仍全量解析。
+"""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..models import Article
+
+
+class WatermarkStore:
+    """新闻源水位存储"""
+
+    def __init__(self, db_path: str = None):
+        """初始化存储
+
+        Args:
+            db_path: 数据库路径，默认从配置读取或使用默认值
+        """
+        if db_path is None:
+            from ..config import ConfigReader
+            reader = ConfigReader()
+            config = reader.load_crawler_config()
+            db_path = getattr(config.storage, 'db_path', 'data/db/scheduler.sqlite')
+
+        self.db_path = db_path
+
+    def _get_conn(self):
+        """获取数据库连接"""
+        db_dir = Path(self.db_path).parent
+        db_dir.mkdir(parents=True, exist_ok=True)
+        return sqlite3.connect(self.db_path)
+
+    def init_db(self) -> None:
+        """初始化数据库"""
+        conn = self._get_conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS source_watermarks (
+                source_id TEXT PRIMARY KEY,
+                last_time TIMESTAMP NOT NULL,
+                last_id TEXT,
+                updated_at TIMESTAMP NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def get(self, source_id: str) -> Optional[Dict[str, Any]]:
+        """获取新闻源水位
+
+        Returns:
+            {"source_id", "last_time", "last_id", "updated_at"}，无记录时为 None
+        """
+        self.init_db()
+        conn = self._get_conn()
+        conn.row_factory = sqlite3.Row
+        row = conn.execute(
+            "SELECT * FROM source_watermarks WHERE source_id = ?", (source_id,)
+        ).fetchone()
+        conn.close()
+        return dict(row) if row else None
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        """获取所有新闻源水位"""
+        self.init_db()
+        conn = self._get_conn()
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute("SELECT * FROM source_watermarks ORDER BY source_id").fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+
+    def since(self, source_id: str) -> Optional[datetime]:
+        """获取新闻源水位时间（无记录时为 None）
+
+        水位晚于当前时间（时钟或时区异常）时按当前时间处理，避免跳过所有条目
+        """
+        watermark = self.get(source_id)
+        if not watermark:
+            return None
+        try:
+            last_time = datetime.fromisoformat(watermark["last_time"])
+        except (TypeError, ValueError):
+            return None
+        now = datetime.now(last_time.tzinfo) if last_time.tzinfo else datetime.now()
+        return min(last_time, now)
+
+    def update(self, source_id: str, last_time: datetime, last_id: str = None) -> bool:
+        """推进水位（只前进不后退）
+
+        Returns:
+            是否更新了水位
+        """
+        self.init_db()
+        conn = self._get_conn()
+        cursor = conn.execute("""
+            INSERT INTO source_watermarks (source_id, last_time, last_id, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(source_id) DO UPDATE SET
+                last_time = excluded.last_time,
+                last_id = excluded.last_id,
+                updated_at = excluded.updated_at
+            WHERE excluded.last_time > source_watermarks.last_time
+        """, (source_id, last_time.isoformat(), last_id, datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
+        return cursor.rowcount > 0
+
+    def advance(self, source_id: str, articles: List[Article]) -> bool:
+        """按本轮抓取到的文章推进水位（取最新一篇）"""
+        dated = [a for a in articles if a.publish_time]
+        if not dated:
+            return False
+        latest = max(dated, key=lambda a: a.publish_time)
+        return self.update(source_id, latest.publish_time, latest.url)
+
+    def reset(self, source_id: str = None) -> int:
+        """清除水位（source_id 为 None 时清除全部），下次抓取全量解析
+
+        Returns:
+            删除的记录数
+        """
+        self.init_db()
+        conn = self._get_conn()
+        if source_id is None:
+            cursor = conn.execute("DELETE FROM source_watermarks")
+        else:
+            cursor = conn.execute("DELETE FROM source_watermarks WHERE source_id = ?", (source_id,))
+        conn.commit()
+        conn.close()
+        return cursor.rowcount
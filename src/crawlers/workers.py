@@ -0,0 +1,174 @@
+"""CPU 密集任务的进程池
+
+run_crawl 运行在 FastAPI 事件循环上，正文 HTML 解析与标题分词/指纹计算
+若在事件循环中同步执行，抓取期间 API 请求会被阻塞。
+这里把一批任务交给工作进程执行，事件循环只负责 I/O：
+- extract_contents：正文页 HTML → 正文文本（调用解析器的 extract_content）
+- fingerprint_titles：标题 → 64 位 SimHash 指纹（jieba 分词）
+
+每个工作进程启动时预加载 jieba 词典，之后的任务不再承担加载开销。
+各工作进程有自己的分词结果缓存，指纹任务随结果带回该进程的缓存计数，
+由 tokenizer_stats() 汇总（/admin/tokenizer/stats 与 /metrics 使用）。
+进程池不可用（禁用 / 进程崩溃）时回退为在当前进程内执行，结果相同。
+"""
+
+import asyncio
+import importlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..config.models import TokenizerConfig, WorkersConfig
+
+
+def _init_worker(tokenizer_config: Optional[TokenizerConfig] = None) -> None:
+    """工作进程初始化：预加载 jieba 词典（与服务进程共用前缀词典缓存文件）"""
+    from .tokenizer import tokenizer
+    if tokenizer_config is not None:
+        tokenizer.configure(tokenizer_config)
+    tokenizer.warmup()
+
+
+def _extract_batch(source_id: str, pages: Sequence[str]) -> List[str]:
+    """（工作进程）用解析器的 extract_content 提取一批正文"""
+    parser = importlib.import_module(f"src.crawlers.parsers.{source_id}")
+    results = []
+    for html in pages:
+        try:
+            results.append(parser.extract_content(html))
+        except Exception as e:
+            results.append(f"获取内容失败: {e}")
+    return results
+
+
+def _fingerprint_batch(titles: Sequence[str]) -> Tuple[List[int], Dict[str, int]]:
+    """（工作进程）计算一批标题指纹
+
+    Returns:
+        (指纹列表, 本进程分词缓存计数 {"pid", "entries", "hits", "misses"})
+    """
+    from .dedup import title_fingerprint
+    from .tokenizer import tokenizer
+    fingerprints = [title_fingerprint(title) for title in titles]
+    stats = tokenizer.stats()
+    return fingerprints, {
+        "pid": os.getpid(),
+        "entries": stats["entries"],
+        "hits": stats["hits"],
+        "misses": stats["misses"],
+    }
+
+
+def _ping() -> bool:
+    return True
+
+
+class WorkerPool:
+    """进程池（懒启动，跨抓取轮次复用）"""
+
+    def __init__(self, config: WorkersConfig = None, tokenizer_config: TokenizerConfig = None):
+        self.config = config or WorkersConfig()
+        self.tokenizer_config = tokenizer_config
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # 各工作进程最近一次带回的分词缓存计数 {pid: {...}}；已关闭进程的命中/未命中累计到 _retired
+        self._tokenizer_counts: Dict[int, Dict[str, int]] = {}
+        self._retired = {"hits": 0, "misses": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled and self.config.max_workers != 0
+
+    def configure(self, config: WorkersConfig, tokenizer_config: TokenizerConfig = None) -> None:
+        """设置配置（下次启动进程池时生效）"""
+        self.config = config
+        if tokenizer_config is not None:
+            self.tokenizer_config = tokenizer_config
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn：服务进程中有后台线程（调度器、关键词监视），fork 不安全
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.config.max_workers or None,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.tokenizer_config,),
+            )
+        return self._executor
+
+    async def start(self, config: WorkersConfig = None, tokenizer_config: TokenizerConfig = None) -> None:
+        """启动进程池并等待工作进程完成预加载（服务启动时调用）"""
+        if config is not None:
+            self.shutdown()
+            self.configure(config, tokenizer_config)
+        if not self.enabled:
+            return
+        try:
+            await self._submit(_ping)
+            print(f"[Workers] 进程池已启动: max_workers={self.config.max_workers or '默认'}")
+        except Exception as e:
+            print(f"[Workers] 进程池启动失败，回退为进程内执行: {e}")
+
+    async def _submit(self, func: Callable, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    async def run(self, func: Callable, *args):
+        """在工作进程中执行（进程池禁用或崩溃时在当前进程内执行）"""
+        if self.enabled:
+            try:
+                return await self._submit(func, *args)
+            except BrokenProcessPool as e:
+                print(f"[Workers] 进程池已损坏，重建后本次在进程内执行: {e}")
+                self.shutdown()
+        return func(*args)
+
+    async def extract_contents(self, source_id: str, pages: Sequence[str]) -> List[str]:
+        """批量提取正文（按批次切分，多个工作进程并行）"""
+        if not pages:
+            return []
+        batches = self._split(list(pages))
+        results = await asyncio.gather(*(self.run(_extract_batch, source_id, b) for b in batches))
+        return [content for batch in results for content in batch]
+
+    async def fingerprint_titles(self, titles: Sequence[str]) -> List[int]:
+        """批量计算标题指纹"""
+        if not titles:
+            return []
+        batches = self._split(list(titles))
+        results = await asyncio.gather(*(self.run(_fingerprint_batch, b) for b in batches))
+        for _, counts in results:
+            # 回退为进程内执行时已计入服务进程的分词器
+            if counts["pid"] != os.getpid():
+                self._tokenizer_counts[counts["pid"]] = counts
+        return [fingerprint for batch, _ in results for fingerprint in batch]
+
+    def tokenizer_stats(self) -> Dict[str, Any]:
+        """工作进程分词缓存计数汇总（截至各进程最近一次指纹任务）"""
+        counts = list(self._tokenizer_counts.values())
+        return {
+            "processes": len(counts),
+            "entries": sum(c["entries"] for c in counts),
+            "hits": self._retired["hits"] + sum(c["hits"] for c in counts),
+            "misses": self._retired["misses"] + sum(c["misses"] for c in counts),
+        }
+
+    def _split(self, items: list) -> List[list]:
+        size = max(1, self.config.batch_size)
+        return [items[i:i + size] for i in range(0, len(items), size)]
+
+    def shutdown(self) -> None:
+        """关闭进程池（服务关闭时调用）"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        # 工作进程退出后缓存随之释放，只保留累计的命中/未命中
+        for counts in self._tokenizer_counts.values():
+            self._retired["hits"] += counts["hits"]
+            self._retired["misses"] += counts["misses"]
+        self._tokenizer_counts.clear()
+
+
+# 全局单例
+worker_pool = WorkerPool()
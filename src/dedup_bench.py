@@ -0,0 +1,108 @@
+"""去重性能基准
+
+对比批次内排重层优化前后的耗时（默认 500 篇）：
+- 优化前：内层循环对每篇已保留文章重复计算 SimHash（jieba 分词 O(n²) 次）
+- 优化后：每篇指纹只算一次，已保留指纹放入分段索引
+
+用法: python -m src.dedup_bench [文章数]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import List
+
+import jieba
+
+from simhash import Simhash
+
+from src.crawlers.dedup import TextDeduplicator
+from src.crawlers.tokenizer import tokenizer
+from src.models import Article, SourceType
+from src.storage import connection_pool
+from src.tools import TitleCleaner
+
+WORDS = [
+    "马斯克", "特斯拉", "发布", "新款", "芯片", "英伟达", "人工智能", "大模型", "融资",
+    "宣布", "计划", "火箭", "星舰", "发射", "成功", "央行", "降息", "市场", "股价",
+    "上涨", "下跌", "公司", "季度", "财报", "营收", "增长", "机器人", "量产", "合作",
+    "签署", "协议", "中国", "美国", "欧洲", "能源", "电池", "突破", "研发", "团队",
+]
+
+
+def make_articles(n: int, seed: int = 42) -> List[Article]:
+    """生成测试文章：约 1/5 为已有标题的轻微改写"""
+    rng = random.Random(seed)
+    titles: List[str] = []
+    for _ in range(n):
+        if titles and rng.random() < 0.2:
+            words = list(jieba.cut(rng.choice(titles)))
+            words[rng.randrange(len(words))] = rng.choice(WORDS)
+            titles.append("".join(words))
+        else:
+            titles.append("".join(rng.choice(WORDS) for _ in range(rng.randint(4, 7))))
+
+    now = datetime.now()
+    return [
+        Article(title=t, url=f"https://example.com/{i}", source=SourceType.CLS_TELEGRAPH, publish_time=now)
+        for i, t in enumerate(titles)
+    ]
+
+
+def legacy_simhash(text: str) -> Simhash:
+    """优化前的 SimHash 计算（每次直接调用 jieba 分词，不经过分词结果缓存）"""
+    return Simhash(jieba.cut(TitleCleaner.for_dedup(text)))
+
+
+def legacy_batch_similarity(articles: List[Article], threshold: int) -> List[Article]:
+    """优化前的批次内排重（内层循环重复计算已保留文章的 SimHash）"""
+    deduped = []
+    for article in articles:
+        hash_value = legacy_simhash(article.title)
+        is_similar = False
+        for kept_article in deduped:
+            kept_hash = legacy_simhash(kept_article.title)
+            if hash_value.distance(kept_hash) <= threshold:
+                is_similar = True
+                break
+        if not is_similar:
+            deduped.append(article)
+    return deduped
+
+
+def main(n: int = 500) -> int:
+    articles = make_articles(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        # 去重器会初始化年度库：建在临时目录，不改动 data/db（基准只用到批次内排重）
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            deduper = TextDeduplicator()
+            connection_pool.release(deduper.db.db_path)
+        finally:
+            os.chdir(cwd)
+    jieba.initialize()  # 词典加载不计入耗时
+
+    start = time.perf_counter()
+    legacy = legacy_batch_similarity(articles, deduper.SIMHASH_THRESHOLD)
+    legacy_cost = time.perf_counter() - start
+
+    tokenizer.clear_cache()  # 优化后从空缓存开始计时
+    start = time.perf_counter()
+    current = deduper._filter_by_batch_similarity(articles, {})
+    current_cost = time.perf_counter() - start
+
+    assert [a.url for a in legacy] == [a.url for a in current], "优化前后结果不一致"
+
+    print(f"批次内排重基准（{n} 篇，保留 {len(current)} 篇）")
+    print(f"  - 优化前: {legacy_cost * 1000:.1f} ms")
+    print(f"  - 优化后: {current_cost * 1000:.1f} ms")
+    print(f"  - 加速比: {legacy_cost / current_cost:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
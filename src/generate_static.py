@@ -4,12 +4,13 @@
 """
 
 import shutil
-import sqlite3
 from datetime import date, datetime
 from pathlib import Path
 
 from jinja2 import Template
 
+from src.storage import TimelineDB
+
 
 def format_time(iso_string: str) -> str:
     """格式化时间为 MM-DD HH:MM
@@ -65,21 +66,11 @@ def generate_static_html():
 
     articles = []
     if db_path.exists():
-        conn = sqlite3.connect(str(db_path))
-        conn.row_factory = sqlite3.Row
-
-        # 检测使用哪个列名
-        cursor = conn.execute("PRAGMA table_info(articles)")
-        columns = {row["name"] for row in cursor.fetchall()}
-        time_column = "publish_time" if "publish_time" in columns else "timestamp"
-
-        # 只读取今日新闻
-        cursor = conn.execute(
-            f"SELECT * FROM articles WHERE date({time_column}) = date(?) ORDER BY {time_column} DESC LIMIT 100",
-            (date.today().isoformat(),)
-        )
-        articles = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        # 只读取今日新闻（日期范围走 publish_time 索引）
+        today = date.today().isoformat()
+        db = TimelineDB(date.today())
+        db.init_db()
+        articles = db.list_articles(limit=100, start_date=today, end_date=today)
     else:
         print(f"[Warning] 数据库不存在: {db_path}")
 
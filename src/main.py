@@ -1,19 +1,34 @@
 """FastAPI 应用入口"""
 
+import time
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from datetime import datetime, timedelta, timezone, date
 from pathlib import Path
 
-from .storage import TimelineDB
+from .storage import TimelineDB, connection_pool
 from .api.crawl import router as crawl_router
 from .api.admin import router as admin_router
 from .api.biz import router as biz_router
 from .scheduler import SchedulerManager
 from .crawlers.dedup import today_news_cache
+from .crawlers.keyword_index import keyword_index
+from .crawlers.http_client import http_client_manager
+from .crawlers.response_cache import response_cache
+from .crawlers.workers import worker_pool
+from .crawlers.tokenizer import tokenizer
+from .config import ConfigReader
+from .metrics import (
+    cache_entries,
+    cache_hit_ratio,
+    cache_lookups,
+    http_request_duration_seconds,
+    http_requests_total,
+    registry,
+)
 
 # FastAPI Cache
 from fastapi_cache import FastAPICache
@@ -31,9 +46,31 @@ async def lifespan(app: FastAPI):
     # 从数据库加载缓存（防止重启后重复抓取）
     today_news_cache.init_from_db(db, limit=100)
 
+    # 编译关键词索引，并在后台监视关键词配置变化（热更新）
+    keyword_index.start()
+
     # 初始化 FastAPI Cache（内存后端）
     FastAPICache.init(InMemoryBackend(), prefix="sfapi-cache")
 
+    # 创建进程级共享 HTTP 客户端（抓取、源测试共用，长连接跨轮次复用）
+    try:
+        crawler_config = ConfigReader("config").load_crawler_config()
+    except Exception as e:
+        print(f"Warning: Failed to load crawler config: {e}")
+        crawler_config = None
+    await http_client_manager.start(crawler_config.network if crawler_config else None)
+
+    # 后台加载 jieba 词典（不阻塞启动），首轮抓取的去重不再承担加载开销
+    if crawler_config:
+        tokenizer.configure(crawler_config.tokenizer)
+    tokenizer.start_warmup()
+
+    # 启动进程池（工作进程预加载 jieba 词典），正文解析与指纹计算不占用事件循环
+    await worker_pool.start(
+        crawler_config.workers if crawler_config else None,
+        crawler_config.tokenizer if crawler_config else None,
+    )
+
     # 初始化并启动调度器
     scheduler = SchedulerManager(config_dir="config")
     await scheduler.start()
@@ -42,6 +79,10 @@ async def lifespan(app: FastAPI):
 
     # 清理资源
     await scheduler.close()
+    await http_client_manager.aclose()
+    worker_pool.shutdown()
+    keyword_index.stop()
+    connection_pool.close_all()
 
 
 app = FastAPI(
@@ -60,6 +101,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """记录每个路由的请求数与耗时（按路由模板统计，不按实际路径）"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        http_request_duration_seconds.observe(time.perf_counter() - start, method=request.method, route=route)
+        http_requests_total.inc(method=request.method, route=route, status=status)
+
+
+def _collect_cache_metrics() -> None:
+    """输出指标前刷新各缓存的命中统计"""
+    stats = response_cache.stats()
+    cache_lookups.set(stats["not_modified"] + stats["unchanged"], cache="response", result="hit")
+    cache_lookups.set(stats["changed"], cache="response", result="miss")
+    cache_hit_ratio.set(stats["skip_ratio"], cache="response")
+    cache_entries.set(stats["entries"], cache="response")
+
+    stats = tokenizer.stats(worker_pool.tokenizer_stats())  # 含工作进程
+    cache_lookups.set(stats["hits"], cache="tokenizer", result="hit")
+    cache_lookups.set(stats["misses"], cache="tokenizer", result="miss")
+    cache_hit_ratio.set(stats["hit_ratio"], cache="tokenizer")
+    cache_entries.set(stats["entries"], cache="tokenizer")
+
+    cache_entries.set(today_news_cache.count, cache="today_news")
+
+
+registry.on_collect(_collect_cache_metrics)
+
 # 挂载静态文件
 static_dir = Path("static")
 static_dir.mkdir(exist_ok=True)
@@ -113,41 +188,88 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """进程内指标（Prometheus 文本格式）"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+# /api/articles 附加返回的列：后台列表页（templates/admin.html）从 tags 渲染标签徽章
+ARTICLES_INCLUDE_COLUMNS = ("tags",)
+
+
+def _articles_response(articles: list, limit: int, after: str = None) -> dict:
+    """文章列表响应（附带键集分页游标）
+
+    - next_cursor: 传给 before 获取更旧的一页（已到末尾时为 None）
+    - prev_cursor: 传给 after 获取更新的文章（轮询增量）
+    """
+    next_cursor = None
+    if articles and len(articles) >= limit and not after:
+        next_cursor = TimelineDB.encode_cursor(articles[-1])
+    prev_cursor = TimelineDB.encode_cursor(articles[0]) if articles else after
+    return {
+        "code": 200,
+        "message": "success",
+        "data": articles,
+        "total": len(articles),
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+    }
+
+
+def _bad_request_response(error: ValueError) -> dict:
+    """参数无效（游标或日期格式错误）时的响应"""
+    return {
+        "code": 400,
+        "message": str(error),
+        "data": [],
+        "total": 0
+    }
+
+
 @app.get("/api/articles/today")
 @cache(expire=30)
-async def list_articles_today(limit: int = 100, legend: str = None):
+async def list_articles_today(limit: int = 100, legend: str = None,
+                              before: str = None, after: str = None):
     """获取今日及以后的新闻"""
     # 使用北京时间（UTC+8）获取今日日期
     beijing_tz = timezone(timedelta(hours=8))
     today = datetime.now(beijing_tz).date().isoformat()
     db = TimelineDB()
-    articles = db.list_articles(limit=limit, legend=legend, start_date=today)
-    return {
-        "code": 200,
-        "message": "success",
-        "data": articles,
-        "total": len(articles)
-    }
+    try:
+        articles = db.list_articles(limit=limit, legend=legend, start_date=today,
+                                    before=before, after=after)
+    except ValueError as e:
+        return _bad_request_response(e)
+    return _articles_response(articles, limit, after)
 
 
 @app.get("/api/articles/latest")
 @cache(expire=60)
-async def list_articles_latest(limit: int = 100, legend: str = None):
-    """获取最新新闻（不限日期）"""
+async def list_articles_latest(limit: int = 100, legend: str = None,
+                               before: str = None, after: str = None):
+    """获取最新新闻（不限日期）
+
+    Args:
+        limit: 返回条数
+        legend: 筛选传奇人物
+        before: 游标，获取更旧的一页（上次响应的 next_cursor）
+        after: 游标，只获取更新的文章（上次响应的 prev_cursor）
+    """
     db = TimelineDB()
-    articles = db.list_articles_latest(limit=limit, legend=legend)
-    return {
-        "code": 200,
-        "message": "success",
-        "data": articles,
-        "total": len(articles)
-    }
+    try:
+        articles = db.list_articles_latest(limit=limit, legend=legend, before=before, after=after)
+    except ValueError as e:
+        return _bad_request_response(e)
+    return _articles_response(articles, limit, after)
 
 
 @app.get("/api/articles")
 @cache(expire=120)
 async def list_articles(limit: int = 100, years: int = 1, legend: str = None,
-                       start_date: str = None, end_date: str = None):
+                       start_date: str = None, end_date: str = None,
+                       before: str = None, after: str = None):
     """获取文章列表（高级查询）
 
     Args:
@@ -156,13 +278,44 @@ async def list_articles(limit: int = 100, years: int = 1, legend: str = None,
         legend: 筛选传奇人物
         start_date: 开始日期 YYYY-MM-DD（可选）
         end_date: 结束日期 YYYY-MM-DD（可选）
+        before: 游标，获取更旧的一页（上次响应的 next_cursor）
+        after: 游标，只获取更新的文章（上次响应的 prev_cursor）
     """
-    if years == 1:
-        db = TimelineDB()
-        articles = db.list_articles(limit=limit, legend=legend, start_date=start_date, end_date=end_date)
-    else:
-        articles = TimelineDB.list_articles_multi_year(years=years, limit=limit, legend=legend,
-                                                         start_date=start_date, end_date=end_date)
+    try:
+        if years == 1:
+            db = TimelineDB()
+            articles = db.list_articles(limit=limit, legend=legend, start_date=start_date,
+                                        end_date=end_date, before=before, after=after,
+                                        include=ARTICLES_INCLUDE_COLUMNS)
+        else:
+            articles = TimelineDB.list_articles_multi_year(years=years, limit=limit, legend=legend,
+                                                             start_date=start_date, end_date=end_date,
+                                                             before=before, after=after,
+                                                             include=ARTICLES_INCLUDE_COLUMNS)
+    except ValueError as e:
+        return _bad_request_response(e)
+    return _articles_response(articles, limit, after)
+
+
+@app.get("/api/articles/label/{label}")
+@cache(expire=60)
+async def list_articles_by_label(label: str, kind: str = "legend", limit: int = 100,
+                                 start_date: str = None, end_date: str = None):
+    """按标签获取文章（包含同时提及多个 legend 的文章）
+
+    Args:
+        label: legend_id 或分类名（新星/涟漪/中国）
+        kind: 标签类型 legend / category
+        limit: 返回条数
+        start_date: 开始日期 YYYY-MM-DD（可选）
+        end_date: 结束日期 YYYY-MM-DD（可选）
+    """
+    db = TimelineDB()
+    try:
+        articles = db.list_articles_by_label(label, kind=kind, limit=limit,
+                                             start_date=start_date, end_date=end_date)
+    except ValueError as e:
+        return _bad_request_response(e)
     return {
         "code": 200,
         "message": "success",
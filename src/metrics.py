@@ -0,0 +1,269 @@
+"""进程内指标（Prometheus 文本格式）
+
+不依赖 prometheus_client，只实现本项目用到的三类指标：
+- Counter：只增计数（请求数、去重丢弃数、关键词命中数）
+- Gauge：可设置的当前值（缓存命中率，抓取接口 /metrics 时刷新）
+- Histogram：耗时分布（固定桶，observe 只做一次二分查找与加法）
+
+所有指标注册在全局 registry 上，由 /metrics 接口按文本格式输出：
+    https://prometheus.io/docs/instrumenting/exposition_formats/
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# 默认耗时桶（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    """指标基类（按标签值分组存储）"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        try:
+            if len(labels) == len(self.labelnames):
+                return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError:
+            pass
+        raise ValueError(f"{self.name} 需要标签 {self.labelnames}，实际为 {tuple(labels)}")
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """只增计数"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError("Counter 只能增加")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(_Metric):
+    """当前值"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    """耗时分布（桶计数 + 总和 + 次数）"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # {标签值: [各桶计数（非累计，最后一个为 +Inf）, 总和, 次数]}
+        self._values: Dict[LabelKey, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def get(self, **labels) -> Dict[str, float]:
+        """{"count", "sum"}（无记录时为 0）"""
+        entry = self._values.get(self._key(labels))
+        if entry is None:
+            return {"count": 0, "sum": 0.0}
+        return {"count": entry[2], "sum": entry[1]}
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(e[0]), e[1], e[2])) for key, e in self._values.items())
+        lines = []
+        names = self.labelnames + ("le",)
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                labels = _format_labels(names, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"指标已注册: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def on_collect(self, collector: Callable[[], None]) -> None:
+        """注册输出前的回调（用于刷新由其他模块统计的 Gauge）"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """按 Prometheus 文本格式输出全部指标"""
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"[Metrics] 指标刷新失败: {e}")
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+    def clear(self) -> None:
+        """清空全部指标值（测试用）"""
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+# 全局注册表
+registry = MetricsRegistry()
+
+# HTTP 接口
+http_requests_total = registry.counter(
+    "sf_http_requests_total", "HTTP 请求数", ("method", "route", "status"))
+http_request_duration_seconds = registry.histogram(
+    "sf_http_request_duration_seconds", "HTTP 请求耗时（秒）", ("method", "route"))
+
+# 抓取
+crawl_stage_duration_seconds = registry.histogram(
+    "sf_crawl_stage_duration_seconds", "抓取各阶段单次耗时（秒）", ("stage",))
+crawl_stage_items_total = registry.counter(
+    "sf_crawl_stage_items_total", "抓取各阶段处理条数", ("stage", "direction"))
+crawl_source_fetches_total = registry.counter(
+    "sf_crawl_source_fetches_total", "新闻源列表抓取次数", ("source", "status"))
+source_requests_total = registry.counter(
+    "sf_source_requests_total", "新闻源 HTTP 请求次数（每次尝试）", ("source", "outcome"))
+source_request_duration_seconds = registry.histogram(
+    "sf_source_request_duration_seconds", "新闻源 HTTP 请求耗时（秒）", ("source",))
+dedup_dropped_total = registry.counter(
+    "sf_dedup_dropped_total", "各层去重丢弃条数", ("layer",))
+keyword_hits_total = registry.counter(
+    "sf_keyword_hits_total", "关键词筛选命中条数（front 为非 legend 命中）", ("legend",))
+
+# 缓存
+cache_lookups = registry.gauge(
+    "sf_cache_lookups", "缓存查询次数（累计值，由各缓存自身统计）", ("cache", "result"))
+cache_hit_ratio = registry.gauge(
+    "sf_cache_hit_ratio", "缓存命中率", ("cache",))
+cache_entries = registry.gauge(
+    "sf_cache_entries", "缓存条目数", ("cache",))
+
+# SQLite
+sqlite_query_duration_seconds = registry.histogram(
+    "sf_sqlite_query_duration_seconds", "SQLite 操作耗时（秒，含事务）", ("db", "op"),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
@@ -0,0 +1,28 @@
+"""数据库迁移 CLI 入口
+
+一次性将所有仍使用 timestamp 列的年度库迁移到 publish_time：
+    python -m src.migrate_cli [db_dir]
+"""
+
+import sys
+
+from src.storage import TimelineDB
+
+
+def main(db_dir: str = "data/db") -> int:
+    """迁移 db_dir 下的所有年度库"""
+    migrated = TimelineDB.migrate_legacy_dbs(db_dir)
+
+    if migrated:
+        print(f"\n迁移完成: {len(migrated)} 个库")
+        for path in migrated:
+            print(f"  - {path}")
+    else:
+        print("\n无需迁移: 所有库已使用 publish_time")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main(*sys.argv[1:2])
+    sys.exit(exit_code)
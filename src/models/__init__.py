@@ -21,6 +21,14 @@ class SourceType(str, Enum):
     TOUTIAO = "toutiao"
 
 
+class KeywordHit(BaseModel):
+    """关键词命中记录"""
+    kind: str  # legend / category
+    label: str  # legend_id 或 新星/涟漪/中国
+    keyword: str  # 命中的关键词（小写）
+    offset: int  # 在标题中的起始位置
+
+
 class Article(BaseModel):
     """文章数据模型
 
@@ -37,6 +45,7 @@ class Article(BaseModel):
     tags: List[str] = Field(default_factory=list)
     entities: List[str] = Field(default_factory=list)
     legend: Optional[str] = None  # 传奇人物 ID（如 musk, huang, altman）
+    keyword_hits: List[KeywordHit] = Field(default_factory=list)  # 全部关键词命中（写入 article_labels）
 
     # 不做时区转换，直接使用原始时间戳
 
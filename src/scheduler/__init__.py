@@ -1,9 +1,10 @@
 """调度器模块"""
 
 from .scheduler import SchedulerManager
-from .store import JobExecutionStore
+from .store import CrawlSpanStore, JobExecutionStore
 
 __all__ = [
     "SchedulerManager",
     "JobExecutionStore",
+    "CrawlSpanStore",
 ]
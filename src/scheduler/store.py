@@ -189,6 +189,153 @@ class JobExecutionStore:
         }
 
 
+class CrawlSpanStore:
+    """抓取阶段记录存储
+
+    每轮抓取的阶段 span（见 crawlers.spans）存储在调度器数据库的 crawl_spans 表，
+    与 job_executions 同库，按 run_id 关联（run_crawl 结果中的 run_id）
+    """
+
+    def __init__(self, db_path: str = None):
+        """初始化存储
+
+        Args:
+            db_path: 数据库路径，默认从配置读取或使用默认值
+        """
+        if db_path is None:
+            from ..config import ConfigReader
+            reader = ConfigReader()
+            config = reader.load_crawler_config()
+            db_path = getattr(config.storage, 'db_path', 'data/db/scheduler.sqlite')
+
+        self.db_path = db_path
+
+    def _get_conn(self):
+        """获取数据库连接"""
+        db_dir = Path(self.db_path).parent
+        db_dir.mkdir(parents=True, exist_ok=True)
+        return sqlite3.connect(self.db_path)
+
+    def init_db(self) -> None:
+        """初始化数据库"""
+        conn = self._get_conn()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_spans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                source_id TEXT,
+                started_at TIMESTAMP NOT NULL,
+                duration_ms REAL NOT NULL,
+                items_in INTEGER DEFAULT 0,
+                items_out INTEGER DEFAULT 0,
+                bytes INTEGER DEFAULT 0,
+                status TEXT NOT NULL,
+                error_message TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_crawl_spans_run ON crawl_spans(run_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_crawl_spans_started ON crawl_spans(started_at)")
+        conn.commit()
+        conn.close()
+
+    def record_spans(self, recorder) -> int:
+        """保存一轮抓取的全部 span
+
+        Args:
+            recorder: SpanRecorder
+
+        Returns:
+            保存的条数
+        """
+        self.init_db()
+        rows = [
+            (
+                recorder.run_id,
+                span.stage,
+                span.source_id,
+                span.started_at.isoformat(),
+                span.duration * 1000,
+                span.items_in,
+                span.items_out,
+                span.bytes,
+                span.status,
+                span.error,
+            )
+            for span in recorder.spans
+        ]
+        conn = self._get_conn()
+        conn.executemany("""
+            INSERT INTO crawl_spans (
+                run_id, stage, source_id, started_at, duration_ms,
+                items_in, items_out, bytes, status, error_message
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        conn.commit()
+        conn.close()
+        return len(rows)
+
+    def get_run_spans(self, run_id: str) -> List[Dict[str, Any]]:
+        """获取某轮抓取的全部 span（按开始时间）"""
+        self.init_db()
+        conn = self._get_conn()
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute("""
+            SELECT run_id, stage, source_id, started_at, duration_ms,
+                   items_in, items_out, bytes, status, error_message AS error
+            FROM crawl_spans
+            WHERE run_id = ?
+            ORDER BY started_at, id
+        """, (run_id,)).fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+
+    def get_recent_runs(self, limit: int = 10) -> List[str]:
+        """获取最近几轮抓取的 run_id（最新在前）"""
+        self.init_db()
+        conn = self._get_conn()
+        rows = conn.execute("""
+            SELECT run_id, MIN(started_at) AS started
+            FROM crawl_spans
+            GROUP BY run_id
+            ORDER BY started DESC
+            LIMIT ?
+        """, (limit,)).fetchall()
+        conn.close()
+        return [row[0] for row in rows]
+
+    def get_stage_stats(self, runs: int = 20) -> List[Dict[str, Any]]:
+        """最近 runs 轮抓取按阶段汇总
+
+        Returns:
+            [{"stage", "count", "avg_ms", "max_ms", "total_ms", "items_in", "items_out",
+              "bytes", "errors"}, ...]
+        """
+        run_ids = self.get_recent_runs(runs)
+        if not run_ids:
+            return []
+        placeholders = ",".join("?" * len(run_ids))
+        conn = self._get_conn()
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(f"""
+            SELECT stage,
+                   COUNT(*) AS count,
+                   ROUND(AVG(duration_ms), 3) AS avg_ms,
+                   ROUND(MAX(duration_ms), 3) AS max_ms,
+                   ROUND(SUM(duration_ms), 3) AS total_ms,
+                   SUM(items_in) AS items_in,
+                   SUM(items_out) AS items_out,
+                   SUM(bytes) AS bytes,
+                   SUM(status != 'success') AS errors
+            FROM crawl_spans
+            WHERE run_id IN ({placeholders})
+            GROUP BY stage
+            ORDER BY total_ms DESC
+        """, run_ids).fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+
+
 # 类方法便捷接口（向后兼容）
 def record_execution(job_id: str, result: Dict[str, Any], error: Optional[str] = None) -> int:
     """记录任务执行结果（便捷函数）"""
@@ -1,5 +1,14 @@
 """存储模块"""
 
+from .pool import ConnectionPool, connection_pool
+from .schema import SchemaRegistry, TableSchema, schema_registry
 from .timeline_db import TimelineDB
 
-__all__ = ["TimelineDB"]
+__all__ = [
+    "TimelineDB",
+    "ConnectionPool",
+    "connection_pool",
+    "SchemaRegistry",
+    "TableSchema",
+    "schema_registry",
+]
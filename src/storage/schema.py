@@ -0,0 +1,84 @@
+"""表结构注册表
+
+每个年度库只检查一次 articles 表结构并缓存，避免每次查询前都执行 PRAGMA table_info。
+缓存按 (PRAGMA schema_version, PRAGMA user_version) 失效：其他进程（如迁移命令）
+修改表结构或数据版本后即可感知（WAL 模式下库文件 mtime 要到 checkpoint 才变化，
+不能作为依据）；本进程内的迁移仍会主动调用 invalidate。
+"""
+
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Tuple, Union
+
+from .pool import connection_pool
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    """articles 表结构快照"""
+
+    columns: FrozenSet[str]
+    user_version: int = 0  # PRAGMA user_version，记录数据迁移进度
+
+    @property
+    def time_column(self) -> str:
+        """时间列名（新库 publish_time，旧库 timestamp）"""
+        if "publish_time" in self.columns or "timestamp" not in self.columns:
+            return "publish_time"
+        return "timestamp"
+
+    @property
+    def is_legacy(self) -> bool:
+        """是否为仍使用 timestamp 列的旧库"""
+        return "timestamp" in self.columns and "publish_time" not in self.columns
+
+    def has_column(self, name: str) -> bool:
+        return name in self.columns
+
+
+class SchemaRegistry:
+    """按库文件缓存 articles 表结构"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[Tuple[int, int], TableSchema]] = {}
+
+    def get(self, db_path: Union[str, Path]) -> TableSchema:
+        """获取库的表结构（命中缓存时只读取两个 PRAGMA 计数，不执行 table_info）"""
+        key = connection_pool.key(db_path)
+        if not Path(key).exists():
+            # 库尚未创建：init_db 会按新结构建表
+            return TableSchema(columns=frozenset())
+
+        conn = connection_pool.acquire(key)
+        version = (
+            conn.execute("PRAGMA schema_version").fetchone()[0],
+            conn.execute("PRAGMA user_version").fetchone()[0],
+        )
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        cursor = conn.execute("PRAGMA table_info(articles)")
+        columns = frozenset(row["name"] for row in cursor.fetchall())
+        schema = TableSchema(columns=columns, user_version=version[1])
+
+        # 空表结构（表尚未创建）不缓存
+        if schema.columns:
+            with self._lock:
+                self._cache[key] = (version, schema)
+        return schema
+
+    def invalidate(self, db_path: Union[str, Path] = None) -> None:
+        """使缓存失效（不传路径则全部清空）"""
+        with self._lock:
+            if db_path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(connection_pool.key(db_path), None)
+
+
+# 全局单例
+schema_registry = SchemaRegistry()
@@ -2,16 +2,41 @@
 
 from datetime import date, datetime, timezone, timedelta
 from pathlib import Path
-from typing import Optional, List
+from itertools import islice
+from typing import Optional, List, Dict, Sequence, Set, Iterator
+import base64
+import heapq
 import sqlite3
+import time
 from contextlib import contextmanager
 
+from ..metrics import sqlite_query_duration_seconds
 from ..models import Article
+from .pool import connection_pool
+from .schema import schema_registry
+
+
+# 北京时间（publish_time 统一按北京时间存储）
+BEIJING_TZ = timezone(timedelta(hours=8))
 
 
 class TimelineDB:
     """Timeline 数据库管理（一年一个 DB）"""
 
+    # 数据版本（PRAGMA user_version）
+    # 1: publish_time 统一为 YYYY-MM-DDTHH:MM:SS（北京时间，无时区后缀），可按字符串范围走索引
+    # 2: 已有文章按 legend 与 tags 回填 article_labels
+    DATA_VERSION = 2
+
+    # tags 中的分类标签（与 crawlers.keyword_index.FRONT_CATEGORIES 一致），其余 tags 为 legend
+    LABEL_CATEGORIES = ("新星", "涟漪", "中国")
+
+    # 列表视图需要的列（不取 tags/entities 等 JSON 大字段）
+    # 与 idx_articles_legend_publish_time 的列一致，按 legend 筛选的列表查询可只读索引
+    LIST_COLUMNS = ("id", "title", "url", "source", "{time_column}", "legend")
+    # 列表查询可按需附加的列（如后台列表页从 tags 渲染标签徽章）
+    LIST_EXTRA_COLUMNS = ("tags", "entities", "file_path")
+
     def __init__(self, db_date: Optional[date] = None):
         self.db_date = db_date or date.today()
         # 按年分库：timeline_2025.sqlite
@@ -19,29 +44,35 @@ class TimelineDB:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
     @contextmanager
-    def get_connection(self):
-        """获取数据库连接（上下文管理器）"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
+    def get_connection(self, op: str = "query"):
+        """获取数据库连接（上下文管理器）
+
+        连接来自按年分库的连接池，退出时不关闭；出错时回滚未提交的事务
+
+        Args:
+            op: 操作名（计入 SQLite 耗时指标）
+        """
+        conn = connection_pool.acquire(self.db_path)
+        start = time.perf_counter()
         try:
             yield conn
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
         finally:
-            conn.close()
+            sqlite_query_duration_seconds.observe(time.perf_counter() - start, db=self.db_path.name, op=op)
 
     def init_db(self) -> None:
         """初始化数据库表结构"""
-        with self.get_connection() as conn:
-            # 检查表是否存在
-            cursor = conn.execute("""
-                SELECT name FROM sqlite_master
-                WHERE type='table' AND name='articles'
-            """)
-            table_exists = cursor.fetchone() is not None
+        schema = schema_registry.get(self.db_path)
+        with self.get_connection("init_db") as conn:
+            # 检查表是否存在（表结构来自注册表缓存）
+            table_exists = bool(schema.columns)
 
             if table_exists:
                 # 检查列名，进行迁移
-                cursor = conn.execute("PRAGMA table_info(articles)")
-                columns = {row["name"] for row in cursor.fetchall()}
+                columns = schema.columns
 
                 # 迁移：添加 legend 列
                 if "legend" not in columns:
@@ -69,15 +100,13 @@ class TimelineDB:
                 """)
                 print("[DB] 已创建新表")
 
-            # 创建索引（兼容旧列名和新列名）
-            for column in ["publish_time", "timestamp"]:
-                try:
-                    conn.execute(f"""
-                        CREATE INDEX IF NOT EXISTS idx_articles_{column}
-                        ON articles({column})
-                    """)
-                except sqlite3.OperationalError:
-                    pass  # 列不存在，跳过
+            # 时间索引（上面已完成 timestamp -> publish_time 迁移）
+            # 含 id 以支持 (publish_time, id) 键集分页的范围扫描与排序；替代原单列时间索引
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_articles_publish_time_id
+                ON articles(publish_time, id)
+            """)
+            conn.execute("DROP INDEX IF EXISTS idx_articles_publish_time")
 
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_articles_source
@@ -87,8 +116,42 @@ class TimelineDB:
                 CREATE INDEX IF NOT EXISTS idx_articles_legend
                 ON articles(legend)
             """)
+            # legend 时间线：复合覆盖索引（legend 等值 + 时间倒序 + 列表列），免排序且无需回表
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_articles_legend_publish_time
+                ON articles(legend, publish_time, id, title, url, source)
+            """)
+
+            # 文章标签关联表：每篇文章命中的每个 legend / 分类一行
+            # 主键即 (标签, 时间) 有序索引，"某 legend 的全部文章"（含共同提及）为索引范围扫描
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS article_labels (
+                    kind TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    publish_time DATETIME NOT NULL,
+                    article_id TEXT NOT NULL,
+                    hits TEXT,
+                    PRIMARY KEY (kind, label, publish_time, article_id)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_article_labels_article
+                ON article_labels(article_id)
+            """)
+
+            # 数据迁移：publish_time 标准化
+            if schema.user_version < 1:
+                self._normalize_stored_publish_times(conn)
+            # 数据迁移：回填标签关联表（依赖标准化后的 publish_time）
+            if schema.user_version < 2:
+                self._backfill_labels(conn)
+            if schema.user_version < self.DATA_VERSION:
+                conn.execute(f"PRAGMA user_version = {self.DATA_VERSION}")
             conn.commit()
 
+        # 表结构可能已变化（建表/加列/迁移），下次查询时重新检查
+        schema_registry.invalidate(self.db_path)
+
     def _migrate_timestamp_to_publish_time(self, conn) -> None:
         """迁移 timestamp 列为 publish_time
 
@@ -127,13 +190,89 @@ class TimelineDB:
 
         print(f"[DB] 已迁移 {conn.total_changes} 条记录 timestamp -> publish_time")
 
-    def insert_article(self, article: Article) -> None:
-        """插入文章"""
+    def _normalize_stored_publish_times(self, conn) -> None:
+        """将已存储的时间统一为标准格式（带时区/微秒/空格分隔的旧数据）
+
+        在 timestamp -> publish_time 迁移之后执行，此时时间列一定是 publish_time
+        """
+        cursor = conn.execute("""
+            SELECT id, publish_time AS value FROM articles
+            WHERE publish_time NOT GLOB
+                '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]T[0-9][0-9]:[0-9][0-9]:[0-9][0-9]'
+        """)
+        updates = []
+        for row in cursor.fetchall():
+            normalized = self._normalize_publish_time(row["value"])
+            if normalized != row["value"]:
+                updates.append((normalized, row["id"]))
+
+        if updates:
+            conn.executemany("UPDATE articles SET publish_time = ? WHERE id = ?", updates)
+            print(f"[DB] 已标准化 {len(updates)} 条记录的发布时间")
+
+    @classmethod
+    def _list_select(cls, time_column: str, include: Sequence[str] = ()) -> str:
+        """列表查询的 SELECT 列（投影，默认不含 JSON 大字段）
+
+        Args:
+            time_column: 时间列名
+            include: 附加列（须在 LIST_EXTRA_COLUMNS 中）
+        """
+        unknown = [col for col in include if col not in cls.LIST_EXTRA_COLUMNS]
+        if unknown:
+            raise ValueError(f"不支持的列表附加列: {', '.join(unknown)}")
+        columns = [col.format(time_column=time_column) for col in cls.LIST_COLUMNS]
+        return ", ".join(columns + [col for col in include if col not in columns])
+
+    @staticmethod
+    def _normalize_publish_time(value) -> str:
+        """统一发布时间格式：YYYY-MM-DDTHH:MM:SS（北京时间，去掉时区与微秒）
+
+        统一后字符串顺序即时间顺序，日期范围可直接比较字符串并走索引
+        """
+        if isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                return value  # 无法解析的保持原样
+        if isinstance(value, datetime):
+            if value.tzinfo is not None:
+                value = value.astimezone(BEIJING_TZ).replace(tzinfo=None)
+            return value.replace(microsecond=0).isoformat()
+        if isinstance(value, date):
+            return datetime.combine(value, datetime.min.time()).isoformat()
+        return str(value)
+
+    @staticmethod
+    def _date_range_conditions(time_column: str, start_date: str = None,
+                               end_date: str = None) -> tuple:
+        """构建日期范围条件（可走时间列索引的范围扫描）
+
+        不对列套用 date()，而是比较标准化后的字符串：
+        start_date -> col >= 'YYYY-MM-DD'，end_date -> col < 次日 'YYYY-MM-DD'
+
+        Returns:
+            (条件列表, 参数列表)
+        """
+        conditions = []
+        params = []
+        if start_date:
+            conditions.append(f"{time_column} >= ?")
+            params.append(date.fromisoformat(start_date).isoformat())
+        if end_date:
+            conditions.append(f"{time_column} < ?")
+            params.append((date.fromisoformat(end_date) + timedelta(days=1)).isoformat())
+        return conditions, params
+
+    # IN (...) 查询单次绑定参数上限（低于 SQLite 默认的 999）
+    _IN_CHUNK_SIZE = 500
+
+    def _article_to_row(self, article: Article) -> tuple:
+        """将文章转换为入库行（列顺序与 INSERT 语句一致）"""
         import json
 
         # 获取北京时间
-        beijing_tz = timezone(timedelta(hours=8))
-        created_at = datetime.now(beijing_tz).isoformat()
+        created_at = datetime.now(BEIJING_TZ).isoformat()
 
         # 处理 source - 可能是枚举或字符串
         source_value = article.source
@@ -142,14 +281,88 @@ class TimelineDB:
         elif isinstance(article.source, str):
             source_value = article.source
 
-        # 处理 publish_time - 必须从 article.publish_time 获取
-        publish_time_value = article.publish_time
-        if hasattr(publish_time_value, 'isoformat'):
-            publish_time_value = publish_time_value.isoformat()
-        else:
-            publish_time_value = str(publish_time_value)
+        # 处理 publish_time - 必须从 article.publish_time 获取，统一为可排序格式
+        publish_time_value = self._normalize_publish_time(article.publish_time)
+
+        return (
+            article.id,
+            article.title,
+            article.url,
+            source_value,
+            publish_time_value,
+            article.file_path,
+            json.dumps(article.tags) if article.tags else None,
+            json.dumps(article.entities) if article.entities else None,
+            article.legend,
+            created_at
+        )
+
+    def _backfill_labels(self, conn) -> None:
+        """为已有文章回填标签关联行（article_labels 引入之前写入的文章）
+
+        legend 列与 tags 中的 legend / 分类各写一行；历史数据没有命中位置，hits 为空
+        """
+        import json
 
-        with self.get_connection() as conn:
+        rows = []
+        cursor = conn.execute("SELECT id, publish_time, legend, tags FROM articles")
+        for row in cursor.fetchall():
+            labels = set()
+            if row["legend"]:
+                labels.add(("legend", row["legend"]))
+            try:
+                tags = json.loads(row["tags"]) if row["tags"] else []
+            except (TypeError, ValueError):
+                tags = []
+            if isinstance(tags, list):
+                for tag in tags:
+                    if isinstance(tag, str) and tag:
+                        kind = "category" if tag in self.LABEL_CATEGORIES else "legend"
+                        labels.add((kind, tag))
+            rows.extend((kind, label, row["publish_time"], row["id"]) for kind, label in labels)
+
+        if rows:
+            conn.executemany("""
+                INSERT OR IGNORE INTO article_labels (kind, label, publish_time, article_id)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            print(f"[DB] 已回填 {len(rows)} 条标签关联")
+
+    def _label_rows(self, article: Article) -> List[tuple]:
+        """文章的标签关联行 (kind, label, publish_time, article_id, hits)
+
+        按 (kind, label) 聚合关键词命中；仅设置了 legend 而无命中记录的文章也写入一行
+        """
+        import json
+
+        grouped: Dict[tuple, List[list]] = {}
+        for hit in article.keyword_hits:
+            grouped.setdefault((hit.kind, hit.label), []).append([hit.keyword, hit.offset])
+        if article.legend and ("legend", article.legend) not in grouped:
+            grouped[("legend", article.legend)] = []
+
+        publish_time = self._normalize_publish_time(article.publish_time)
+        return [
+            (kind, label, publish_time, article.id,
+             json.dumps(hits, ensure_ascii=False) if hits else None)
+            for (kind, label), hits in grouped.items()
+        ]
+
+    def _insert_labels(self, conn, articles: List[Article]) -> None:
+        """写入标签关联行（调用方负责事务）"""
+        rows = [row for article in articles for row in self._label_rows(article)]
+        if rows:
+            conn.executemany("""
+                INSERT OR REPLACE INTO article_labels
+                (kind, label, publish_time, article_id, hits)
+                VALUES (?, ?, ?, ?, ?)
+            """, rows)
+
+    def insert_article(self, article: Article) -> None:
+        """插入文章"""
+        row = self._article_to_row(article)
+
+        with self.get_connection("insert_article") as conn:
             # 优先使用 publish_time，回退到 timestamp（兼容旧数据）
             column_name = "publish_time"
             try:
@@ -157,41 +370,88 @@ class TimelineDB:
                     INSERT OR REPLACE INTO articles
                     (id, title, url, source, {column_name}, file_path, tags, entities, legend, created_at)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    article.id,
-                    article.title,
-                    article.url,
-                    source_value,
-                    publish_time_value,
-                    article.file_path,
-                    json.dumps(article.tags) if article.tags else None,
-                    json.dumps(article.entities) if article.entities else None,
-                    article.legend,
-                    created_at
-                ))
+                """, row)
             except sqlite3.OperationalError:
                 # 回退到 timestamp（旧数据库）
                 conn.execute("""
                     INSERT OR REPLACE INTO articles
                     (id, title, url, source, timestamp, file_path, tags, entities, legend, created_at)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    article.id,
-                    article.title,
-                    article.url,
-                    source_value,
-                    publish_time_value,
-                    article.file_path,
-                    json.dumps(article.tags) if article.tags else None,
-                    json.dumps(article.entities) if article.entities else None,
-                    article.legend,
-                    created_at
-                ))
+                """, row)
+            conn.execute("DELETE FROM article_labels WHERE article_id = ?", (article.id,))
+            self._insert_labels(conn, [article])
             conn.commit()
 
+    def insert_articles_bulk(self, articles: List[Article]) -> Dict[str, List[Article]]:
+        """批量插入文章（单事务）
+
+        先用一次 IN 查询（走 url UNIQUE 索引）找出已存在的 URL，
+        再在同一事务中逐条插入其余文章（按 rowcount 确认实际写入），整批只提交一次。
+
+        Args:
+            articles: 待插入的文章列表
+
+        Returns:
+            {"inserted": [...], "skipped": [...]}，skipped 为 URL 已存在（含本批重复）的文章
+        """
+        inserted: List[Article] = []
+        skipped: List[Article] = []
+        if not articles:
+            return {"inserted": inserted, "skipped": skipped}
+
+        with self.get_connection("insert_articles_bulk") as conn:
+            existing = self._query_existing_urls(conn, [a.url for a in articles])
+            for article in articles:
+                if article.url in existing:
+                    skipped.append(article)
+                else:
+                    existing.add(article.url)  # 本批内重复的 URL 只保留第一条
+                    inserted.append(article)
+
+            if inserted:
+                time_column = self._get_time_column()
+                sql = f"""
+                    INSERT OR IGNORE INTO articles
+                    (id, title, url, source, {time_column}, file_path, tags, entities, legend, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """
+                written: List[Article] = []
+                with conn:  # 单事务，成功提交、失败回滚
+                    for article in inserted:
+                        # 被 OR IGNORE 跳过的行（id 冲突或并发写入的同 URL）不写标签
+                        if conn.execute(sql, self._article_to_row(article)).rowcount:
+                            written.append(article)
+                        else:
+                            skipped.append(article)
+                    self._insert_labels(conn, written)
+                inserted = written
+
+        return {"inserted": inserted, "skipped": skipped}
+
+    def existing_urls(self, urls: List[str]) -> Set[str]:
+        """批量检查 URL，返回其中已存在的 URL 集合"""
+        if not urls:
+            return set()
+        with self.get_connection("existing_urls") as conn:
+            return self._query_existing_urls(conn, urls)
+
+    def _query_existing_urls(self, conn, urls: List[str]) -> Set[str]:
+        """分批 IN 查询已存在的 URL"""
+        unique_urls = list(dict.fromkeys(urls))
+        existing: Set[str] = set()
+        for i in range(0, len(unique_urls), self._IN_CHUNK_SIZE):
+            chunk = unique_urls[i:i + self._IN_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(
+                f"SELECT url FROM articles WHERE url IN ({placeholders})",
+                chunk
+            )
+            existing.update(row["url"] for row in cursor.fetchall())
+        return existing
+
     def get_article(self, article_id: str) -> Optional[dict]:
         """获取单篇文章"""
-        with self.get_connection() as conn:
+        with self.get_connection("get_article") as conn:
             cursor = conn.execute(
                 "SELECT * FROM articles WHERE id = ?",
                 (article_id,)
@@ -199,101 +459,145 @@ class TimelineDB:
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    @staticmethod
+    def encode_cursor(article: dict) -> str:
+        """生成分页游标（publish_time + id，对前端不透明）"""
+        time_value = article.get("publish_time") or article.get("timestamp")
+        raw = f"{time_value}|{article['id']}".encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple:
+        """解析分页游标
+
+        Returns:
+            (publish_time, id)
+
+        Raises:
+            ValueError: 游标格式错误
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+            time_value, article_id = raw.split("|", 1)
+        except (ValueError, UnicodeError) as e:
+            raise ValueError(f"无效的分页游标: {cursor}") from e
+        return time_value, article_id
+
+    @classmethod
+    def _build_list_query(cls, time_column: str, limit: int, offset: int = 0,
+                          legend: str = None, start_date: str = None, end_date: str = None,
+                          before: str = None, after: str = None, include: Sequence[str] = ()) -> tuple:
+        """构建列表查询（日期范围 + legend + 游标）
+
+        按 (time, id) 键集分页：
+        - before: 比游标更旧的记录，时间倒序
+        - after: 比游标更新的记录，按时间正序取紧邻游标的 limit 条（调用方需反转）
+        传入游标时忽略 offset。
+
+        Returns:
+            (sql, params, ascending)
+        """
+        where_conditions, params = cls._date_range_conditions(time_column, start_date, end_date)
+
+        if legend:
+            where_conditions.append("legend = ?")
+            params.append(legend)
+
+        ascending = False
+        if before:
+            where_conditions.append(f"({time_column}, id) < (?, ?)")
+            params.extend(cls.decode_cursor(before))
+            offset = 0
+        if after:
+            where_conditions.append(f"({time_column}, id) > (?, ?)")
+            params.extend(cls.decode_cursor(after))
+            ascending = not before
+            offset = 0
+
+        where_sql = f"WHERE {' AND '.join(where_conditions)}" if where_conditions else ""
+        direction = "ASC" if ascending else "DESC"
+        sql = f"""
+            SELECT {cls._list_select(time_column, include)} FROM articles
+            {where_sql}
+            ORDER BY {time_column} {direction}, id {direction}
+            LIMIT ? OFFSET ?
+        """
+        params.extend([limit, offset])
+        return sql, params, ascending
+
     def list_articles(self, limit: int = 100, offset: int = 0, legend: str = None,
-                      start_date: str = None, end_date: str = None) -> List[dict]:
+                      start_date: str = None, end_date: str = None,
+                      before: str = None, after: str = None,
+                      include: Sequence[str] = ()) -> List[dict]:
         """列出文章
 
         Args:
             limit: 返回条数
-            offset: 偏移量
+            offset: 偏移量（传入游标时忽略）
             legend: 筛选传奇人物（可选）
             start_date: 开始日期 YYYY-MM-DD（可选）
             end_date: 结束日期 YYYY-MM-DD（可选）
+            before: 游标，只返回比它更旧的文章（可选）
+            after: 游标，只返回比它更新的文章（可选）
+            include: 附加列（可选，见 LIST_EXTRA_COLUMNS）
+
+        Returns:
+            文章列表，按时间倒序
         """
-        with self.get_connection() as conn:
+        with self.get_connection("list_articles") as conn:
             # 检测使用哪个列名
-            time_column = self._get_time_column(conn)
-
-            # 构建 WHERE 条件
-            where_conditions = []
-            params = []
-
-            if start_date:
-                where_conditions.append(f"date({time_column}) >= date(?)")
-                params.append(start_date)
-
-            if end_date:
-                where_conditions.append(f"date({time_column}) <= date(?)")
-                params.append(end_date)
-
-            if legend:
-                where_conditions.append("legend = ?")
-                params.append(legend)
-
-            # 如果没有条件，返回所有
-            if where_conditions:
-                where_sql = " AND ".join(where_conditions)
-                params.extend([limit, offset])
-                sql = f"""
-                    SELECT * FROM articles
-                    WHERE {where_sql}
-                    ORDER BY {time_column} DESC
-                    LIMIT ? OFFSET ?
-                """
-            else:
-                sql = f"""
-                    SELECT * FROM articles
-                    ORDER BY {time_column} DESC
-                    LIMIT ? OFFSET ?
-                """
-                params = [limit, offset]
+            time_column = self._get_time_column()
 
+            sql, params, ascending = self._build_list_query(
+                time_column, limit, offset, legend=legend,
+                start_date=start_date, end_date=end_date, before=before, after=after,
+                include=include
+            )
             cursor = conn.execute(sql, params)
-            return [self._normalize_article(dict(row)) for row in cursor.fetchall()]
+            articles = [self._normalize_article(dict(row)) for row in cursor.fetchall()]
 
-    def list_articles_latest(self, limit: int = 100, legend: str = None) -> List[dict]:
+        if ascending:
+            articles.reverse()
+        return articles
+
+    def list_articles_latest(self, limit: int = 100, legend: str = None,
+                             before: str = None, after: str = None) -> List[dict]:
         """获取最新新闻（不限日期）
 
         Args:
             limit: 返回条数
             legend: 筛选传奇人物（可选）
+            before: 游标，只返回比它更旧的文章（可选）
+            after: 游标，只返回比它更新的文章（可选）
         """
-        with self.get_connection() as conn:
-            time_column = self._get_time_column(conn)
-
-            if legend:
-                cursor = conn.execute(f"""
-                    SELECT * FROM articles
-                    WHERE legend = ?
-                    ORDER BY {time_column} DESC
-                    LIMIT ?
-                """, (legend, limit))
-            else:
-                cursor = conn.execute(f"""
-                    SELECT * FROM articles
-                    ORDER BY {time_column} DESC
-                    LIMIT ?
-                """, (limit,))
-            return [self._normalize_article(dict(row)) for row in cursor.fetchall()]
+        return self.list_articles(limit=limit, legend=legend, before=before, after=after)
 
     @staticmethod
     def list_articles_multi_year(years: int = 2, limit: int = 100, legend: str = None,
-                                start_date: str = None, end_date: str = None) -> List[dict]:
+                                start_date: str = None, end_date: str = None,
+                                before: str = None, after: str = None,
+                                include: Sequence[str] = ()) -> List[dict]:
         """列出多年文章（跨库查询）
 
+        每个年度库按 (时间, id) 有序返回游标，用堆做 k 路归并，
+        只读取 limit 条（外加每库一条预读），游标分页可跨年份边界。
+
         Args:
             years: 查询最近几年
             limit: 总共返回多少条
             legend: 筛选传奇人物（可选）
             start_date: 开始日期 YYYY-MM-DD（可选，默认今日）
             end_date: 结束日期 YYYY-MM-DD（可选）
+            before: 游标，只返回比它更旧的文章（可选）
+            after: 游标，只返回比它更新的文章（可选）
+            include: 附加列（可选，见 LIST_EXTRA_COLUMNS）
 
         Returns:
             文章列表，按时间倒序
         """
         from datetime import date
 
-        all_articles = []
         db_dir = Path("data/db")
 
         # 默认查询今日及以后
@@ -309,48 +613,101 @@ class TimelineDB:
             if db_path.exists():
                 query_years.append(year)
 
-        # 构建 WHERE 条件
-        where_conditions = [f"date({TimelineDB._detect_time_column_for_db(db_dir / f'timeline_{query_years[0]}.sqlite')}) >= date(?)"]
-        params = [start_date]
+        # after 游标按时间正序取，最后反转
+        ascending = bool(after and not before)
 
-        if end_date:
-            where_conditions.append(f"date({TimelineDB._detect_time_column_for_db(db_dir / f'timeline_{query_years[0]}.sqlite')}) <= date(?)")
-            params.append(end_date)
+        # 每个年度库一个有序流（各库时间列可能不同，分别构建查询）
+        streams = []
+        for year in query_years:
+            db_path = db_dir / f"timeline_{year}.sqlite"
+            time_column = TimelineDB._detect_time_column_for_db(db_path)
 
-        if legend:
-            where_conditions.append("legend = ?")
-            params.append(legend)
+            # 单库最多贡献 limit 条，LIMIT limit 即可保证结果正确
+            sql, params, _ = TimelineDB._build_list_query(
+                time_column, limit, legend=legend, start_date=start_date,
+                end_date=end_date, before=before, after=after, include=include
+            )
+            streams.append(TimelineDB(date(year, 1, 1))._iter_rows(sql, params))
+
+        # k 路归并：按 (时间, id) 有序，取前 limit 条
+        merged = heapq.merge(
+            *streams,
+            key=lambda x: (x['publish_time'], x['id']),
+            reverse=not ascending
+        )
+        try:
+            articles = list(islice(merged, limit))
+        finally:
+            for stream in streams:
+                stream.close()
 
-        params.append(limit * 2)
+        if ascending:
+            articles.reverse()
+        return articles
 
-        where_sql = " AND ".join(where_conditions)
-        sql = f"""
-            SELECT * FROM articles
-            WHERE {where_sql}
-            ORDER BY {TimelineDB._detect_time_column_for_db(db_dir / f'timeline_{query_years[0]}.sqlite')} DESC
-            LIMIT ?
+    def list_articles_by_label(self, label: str, kind: str = "legend", limit: int = 100,
+                               start_date: str = None, end_date: str = None) -> List[dict]:
+        """按标签查询文章（含共同提及：文章命中多个 legend 时每个 legend 都能查到）
+
+        走 article_labels 主键的范围扫描，按发布时间倒序
+
+        Args:
+            label: legend_id 或分类名（新星/涟漪/中国）
+            kind: 标签类型 legend / category
+            limit: 返回条数
+            start_date: 开始日期 YYYY-MM-DD（可选）
+            end_date: 结束日期 YYYY-MM-DD（可选）
         """
+        time_column = self._get_time_column()
+        columns = ", ".join(f"a.{col.format(time_column=time_column)}" for col in self.LIST_COLUMNS)
+        conditions, params = self._date_range_conditions("l.publish_time", start_date, end_date)
+        where_sql = " AND ".join(["l.kind = ?", "l.label = ?", *conditions])
+
+        with self.get_connection("list_articles_by_label") as conn:
+            cursor = conn.execute(f"""
+                SELECT {columns}, l.hits AS label_hits
+                FROM article_labels l
+                JOIN articles a ON a.id = l.article_id
+                WHERE {where_sql}
+                ORDER BY l.publish_time DESC, l.article_id DESC
+                LIMIT ?
+            """, [kind, label, *params, limit])
+            return [self._normalize_article(dict(row)) for row in cursor.fetchall()]
 
-        # 从每个数据库读取
-        for year in query_years:
-            temp_date = date(year, 1, 1)
-            db = TimelineDB(temp_date)
-            with db.get_connection() as conn:
-                cursor = conn.execute(sql, params)
-                articles = [dict(row) for row in cursor.fetchall()]
-                all_articles.extend(articles)
-
-        # 按时间排序并限制数量
-        if all_articles:
-            time_key = 'publish_time' if 'publish_time' in all_articles[0] else 'timestamp'
-        else:
-            time_key = 'timestamp'
-        all_articles.sort(key=lambda x: x[time_key], reverse=True)
-        return all_articles[:limit]
+    def _iter_rows(self, sql: str, params: list) -> Iterator[dict]:
+        """逐行读取查询结果（按需从游标取行，不一次性载入）"""
+        with self.get_connection("iter_rows") as conn:
+            cursor = conn.execute(sql, params)
+            try:
+                for row in cursor:
+                    yield self._normalize_article(dict(row))
+            finally:
+                cursor.close()
+
+    def count_articles(self, legend: str = None, start_date: str = None,
+                       end_date: str = None) -> int:
+        """统计文章数（日期范围走索引）
+
+        Args:
+            legend: 筛选传奇人物（可选）
+            start_date: 开始日期 YYYY-MM-DD（可选）
+            end_date: 结束日期 YYYY-MM-DD（可选）
+        """
+        with self.get_connection("count_articles") as conn:
+            where_conditions, params = self._date_range_conditions(
+                self._get_time_column(), start_date, end_date
+            )
+            if legend:
+                where_conditions.append("legend = ?")
+                params.append(legend)
+
+            where_sql = f"WHERE {' AND '.join(where_conditions)}" if where_conditions else ""
+            cursor = conn.execute(f"SELECT COUNT(*) FROM articles {where_sql}", params)
+            return cursor.fetchone()[0]
 
     def article_exists(self, url: str) -> bool:
         """检查文章是否已存在"""
-        with self.get_connection() as conn:
+        with self.get_connection("article_exists") as conn:
             cursor = conn.execute(
                 "SELECT 1 FROM articles WHERE url = ?",
                 (url,)
@@ -363,30 +720,41 @@ class TimelineDB:
         Returns:
             删除的行数
         """
-        with self.get_connection() as conn:
+        with self.get_connection("clear_all") as conn:
             cursor = conn.execute("DELETE FROM articles")
+            conn.execute("DELETE FROM article_labels")
             conn.commit()
             return cursor.rowcount
 
-    def _get_time_column(self, conn) -> str:
-        """获取时间列名（兼容新旧数据库）"""
-        cursor = conn.execute("PRAGMA table_info(articles)")
-        columns = {row["name"] for row in cursor.fetchall()}
-        return "publish_time" if "publish_time" in columns else "timestamp"
+    def _get_time_column(self) -> str:
+        """获取时间列名（兼容新旧数据库，结构来自注册表缓存）"""
+        return schema_registry.get(self.db_path).time_column
 
     @staticmethod
     def _detect_time_column_for_db(db_path: Path) -> str:
         """检测指定数据库使用的时间列名"""
-        if not db_path.exists():
-            return "timestamp"  # 默认旧列名
-        try:
-            conn = sqlite3.connect(str(db_path))
-            cursor = conn.execute("PRAGMA table_info(articles)")
-            columns = {row["name"] for row in cursor.fetchall()}
-            conn.close()
-            return "publish_time" if "publish_time" in columns else "timestamp"
-        except Exception:
-            return "timestamp"
+        return schema_registry.get(db_path).time_column
+
+    @staticmethod
+    def migrate_legacy_dbs(db_dir: str = "data/db") -> List[str]:
+        """一次性迁移：将所有仍使用 timestamp 列的年度库迁移到 publish_time
+
+        Args:
+            db_dir: 年度库所在目录
+
+        Returns:
+            已迁移的库路径列表
+        """
+        migrated = []
+        for db_path in sorted(Path(db_dir).glob("timeline_*.sqlite")):
+            if not schema_registry.get(db_path).is_legacy:
+                continue
+            year = int(db_path.stem.split("_")[-1])
+            db = TimelineDB(date(year, 1, 1))
+            db.db_path = db_path
+            db.init_db()  # init_db 内部完成 timestamp -> publish_time 迁移
+            migrated.append(str(db_path))
+        return migrated
 
     def _normalize_article(self, article: dict) -> dict:
         """标准化文章数据（兼容新旧列名）"""
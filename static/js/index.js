@@ -110,6 +110,13 @@ function renderTrendingCard(article) {
 }
 
 // ========== 加载新闻（按 legend 分发） ==========
+// 首页展示条数
+const NEWS_LIMIT = 50;
+// 已加载的文章（按时间倒序）
+let loadedArticles = [];
+// 增量游标：只拉取比它更新的文章
+let latestCursor = null;
+
 async function loadNews() {
     const timelineCard = document.getElementById('timelineCard');
     const trendingList = document.getElementById('trendingList');
@@ -117,11 +124,30 @@ async function loadNews() {
     if (!timelineCard || !trendingList) return;
 
     try {
-        const response = await fetch('/api/articles/latest?limit=50');
+        let url = `/api/articles/latest?limit=${NEWS_LIMIT}`;
+        if (latestCursor) {
+            url += `&after=${encodeURIComponent(latestCursor)}`;
+        }
+        const response = await fetch(url);
         const result = await response.json();
 
         if (result.code === 200) {
-            const articles = result.data || [];
+            const fetched = result.data || [];
+
+            if (latestCursor) {
+                // 增量：没有新文章则不重绘
+                if (fetched.length === 0) return;
+                // 新文章超过一页，说明间隔太久，改为全量刷新
+                if (fetched.length >= NEWS_LIMIT) {
+                    latestCursor = null;
+                    return loadNews();
+                }
+                loadedArticles = fetched.concat(loadedArticles).slice(0, NEWS_LIMIT);
+            } else {
+                loadedArticles = fetched;
+            }
+            latestCursor = result.prev_cursor || latestCursor;
+            const articles = loadedArticles;
 
             // 按 legend 字段分发
             const timelineArticles = [];
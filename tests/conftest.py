@@ -46,3 +46,14 @@ def sample_article():
         source=SourceType.CANKAOXIAOXI,
         timestamp=datetime.now(),
     )
+
+
+@pytest.fixture
+def isolated_data_dir(tmp_path, monkeypatch):
+    """在临时目录下运行，data/db 等相对路径写入临时目录（不改动仓库中的数据库）
+
+    config 目录链接到仓库配置，配置读取不受影响
+    """
+    (tmp_path / "config").symlink_to(Path(__file__).resolve().parent.parent / "config")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
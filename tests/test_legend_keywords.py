@@ -229,6 +229,144 @@ class TestFiltering:
         assert all(a.legend == "huang" for a in filtered), "都应该标注为 huang"
 
 
+class TestKeywordMatcher:
+    """测试 Aho-Corasick 关键词自动机"""
+
+    def test_all_matches_with_offsets(self):
+        """单次扫描返回全部命中（含重叠）及起始偏移"""
+        from src.crawlers.keyword_matcher import KeywordMatcher
+
+        matcher = KeywordMatcher()
+        matcher.add("he", "a")
+        matcher.add("she", "b")
+        matcher.add("hers", "c")
+        matcher.add("马斯克", ("legend", "musk"))
+        matcher.add("大模型", ("category", "新星"))
+
+        assert sorted(matcher.iter_matches("ushers")) == [(1, "she", "b"), (2, "he", "a"), (2, "hers", "c")]
+        assert matcher.labels("马斯克谈大模型") == {("legend", "musk"), ("category", "新星")}
+        assert matcher.labels("无关标题") == set()
+
+    def test_same_as_substring_scan(self):
+        """与逐关键词子串扫描结果一致（legend 按配置顺序优先）"""
+        from src.crawlers import keywords_filter
+
+        keywords_filter._init_keywords()
+        cache = keywords_filter._KEYWORDS_CACHE
+        titles = [
+            "马斯克宣布星舰最新发射计划", "英伟达发布新一代AI芯片H200", "ChatGPT迎来重大更新",
+            "中国大模型deepseek发布新版本", "马斯克谈大模型发展前景", "日经225指数低开0.2%",
+            "NVIDIA发布新GPU", "具身智能领域迎来新突破",
+        ]
+
+        for title in titles:
+            text = title.lower()
+            expected_legend = next(
+                (lid for lid, kws in cache["legend"].items() if any(kw in text for kw in kws)),
+                None,
+            )
+            expected_front = any(kw in text for kw in cache["front"])
+            assert keywords_filter._match_legend(text) == expected_legend, title
+            assert keywords_filter._match_front(text) == expected_front, title
+
+    def test_filter_legend_priority(self):
+        """legend 与 front 同时命中时 legend 优先"""
+        articles = [
+            Article(
+                title="马斯克谈大模型发展前景",
+                url="https://example.com/musk-ai",
+                source=SourceType.IFENG,
+                publish_time=datetime.now()
+            ),
+            Article(
+                title="日经225指数低开0.2%",
+                url="https://example.com/finance",
+                source=SourceType.TOUTIAO,
+                publish_time=datetime.now()
+            ),
+        ]
+
+        filtered = filter_by_keywords(articles)
+
+        assert [a.legend for a in filtered] == ["musk"]
+
+
+class TestKeywordIndex:
+    """测试可热更新的关键词索引"""
+
+    def _write_yaml(self, config_dir, text, bump=0):
+        import os
+        path = config_dir / "news_keywords.yaml"
+        path.write_text(text, encoding="utf-8")
+        # 保证 mtime 变化（部分文件系统 mtime 精度较低）
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump * 1_000_000_000))
+
+    def test_reload_on_yaml_change(self, tmp_path):
+        """YAML 变化后重建并递增版本，未变化不重建"""
+        from src.crawlers.keyword_index import KeywordIndex
+
+        self._write_yaml(tmp_path, "legend:\n  musk:\n    - [马斯克]\n新星:\n  - [大模型]\n")
+        index = KeywordIndex(str(tmp_path), legend_db_path=str(tmp_path / "legend.sqlite"))
+
+        first = index.snapshot()
+        assert first.version == 1
+        assert first.matcher.labels("马斯克谈大模型") == {("legend", "musk"), ("category", "新星")}
+        assert index.refresh() is False
+
+        self._write_yaml(tmp_path, "legend:\n  huang:\n    - [黄仁勋]\n", bump=1)
+        assert index.refresh() is True
+        second = index.snapshot()
+        assert second.version == 2
+        assert second.matcher.labels("马斯克") == set()
+        assert second.matcher.labels("黄仁勋") == {("legend", "huang")}
+        # 旧快照不受影响
+        assert first.matcher.labels("马斯克") == {("legend", "musk")}
+
+    def test_broken_yaml_keeps_previous_snapshot(self, tmp_path):
+        """重建失败时保留旧版本"""
+        from src.crawlers.keyword_index import KeywordIndex
+
+        self._write_yaml(tmp_path, "legend:\n  musk:\n    - [马斯克]\n")
+        index = KeywordIndex(str(tmp_path), legend_db_path=str(tmp_path / "legend.sqlite"))
+        assert index.snapshot().version == 1
+
+        self._write_yaml(tmp_path, "legend: [unclosed\n", bump=1)
+        assert index.refresh() is False
+        assert index.snapshot().version == 1
+        assert index.snapshot().legend_order == {"musk": 0}
+
+    def test_merge_legend_db_keywords(self, tmp_path):
+        """LegendDB 中的关键词并入对应 legend，变化后触发重建"""
+        from src.crawlers.keyword_index import KeywordIndex
+        from src.services.legend_db import LegendDB
+
+        self._write_yaml(tmp_path, "legend:\n  musk:\n    - [马斯克]\n")
+        db_path = tmp_path / "legend.sqlite"
+        legend_db = LegendDB(str(db_path))
+        legend_db.init_db()
+        legend_db.set_keywords("musk", [{"group_name": "公司", "keywords": ["SpaceX"]}])
+
+        index = KeywordIndex(str(tmp_path), legend_db_path=str(db_path))
+        assert index.snapshot().matcher.labels("spacex发射") == {("legend", "musk")}
+
+        legend_db.set_keywords("altman", [{"group_name": "人物", "keywords": ["奥尔特曼"]}])
+        assert index.refresh() is True
+        snapshot = index.snapshot()
+        assert snapshot.version == 2
+        assert list(snapshot.legend_order) == ["musk", "altman"]
+        assert snapshot.matcher.labels("奥尔特曼") == {("legend", "altman")}
+
+    def test_filter_uses_index_snapshot(self):
+        """兼容接口与索引当前版本一致"""
+        from src.crawlers.keyword_index import keyword_index
+
+        result = _load_keywords()
+        snapshot = keyword_index.snapshot()
+        assert result["front"] == snapshot.original["front"]
+        assert set(result["legend"]) == set(snapshot.legend)
+
+
 class TestArticleModel:
     """测试 Article 模型"""
 
@@ -1,12 +1,15 @@
 """测试新功能：去重、URL 缓存、通用爬虫"""
 
+import asyncio
 import pytest
+from types import SimpleNamespace
 from datetime import datetime, date
 from simhash import Simhash
 
 from src.models import Article, SourceType
 from src.crawlers.dedup import TextDeduplicator
 from src.crawlers.url_cache import URLCache, url_cache
+from src.crawlers.simhash_index import SimhashIndex
 
 
 class TestURLCache:
@@ -51,6 +54,7 @@ class TestURLCache:
         assert url_cache.count == 0
 
 
+@pytest.mark.usefixtures("isolated_data_dir")
 class TestTextDeduplicator:
     """测试文本去重器"""
 
@@ -129,6 +133,207 @@ class TestTextDeduplicator:
         assert "某科技公司发布新品" in titles
 
 
+class TestSimhashIndex:
+    """测试 SimHash 分段索引"""
+
+    def test_near_matches_linear_scan(self):
+        """索引查找结果与线性两两比较一致"""
+        import random
+
+        rng = random.Random(42)
+        base = [rng.getrandbits(64) for _ in range(50)]
+        fingerprints = {}
+        for i, fp in enumerate(base):
+            fingerprints[f"u{i}"] = fp
+            # 为每个指纹造一个翻转若干位的近邻
+            flipped = fp
+            for pos in rng.sample(range(64), rng.randint(0, 20)):
+                flipped ^= 1 << pos
+            fingerprints[f"v{i}"] = flipped
+
+        index = SimhashIndex(threshold=15)
+        index.add_batch(fingerprints.items())
+
+        for query in base:
+            expected = {k for k, v in fingerprints.items() if (v ^ query).bit_count() <= 15}
+            assert set(index.near(query)) == expected
+            assert index.has_near(query) is bool(expected)
+
+    def test_custom_threshold(self):
+        """查询时可指定阈值"""
+        index = SimhashIndex(threshold=15)
+        index.add("a", 0)
+        assert index.has_near(0b111, threshold=3) is True
+        assert index.has_near(0b1111, threshold=3) is False
+
+    def test_add_remove(self):
+        """重复添加覆盖旧指纹，移除后不再命中"""
+        index = SimhashIndex()
+        index.add("a", 0)
+        index.add("a", (1 << 64) - 1)
+        assert len(index) == 1
+        assert index.near(0) == []
+        index.remove("a")
+        assert "a" not in index
+        assert index.near((1 << 64) - 1) == []
+
+
+class TestTodayNewsCacheIndex:
+    """测试今日新闻缓存的标题指纹索引"""
+
+    def setup_method(self):
+        from src.crawlers.dedup import today_news_cache
+        today_news_cache.clear()
+
+    def teardown_method(self):
+        from src.crawlers.dedup import today_news_cache
+        today_news_cache.clear()
+
+    @pytest.mark.usefixtures("isolated_data_dir")
+    def test_filter_by_cache_title(self):
+        """与缓存中相似的标题被过滤"""
+        from src.crawlers.dedup import today_news_cache
+
+        today_news_cache.add("https://example.com/old", "马斯克宣布新计划")
+        deduper = TextDeduplicator()
+
+        articles = [
+            Article(
+                title="马斯克宣布新计划",
+                url="https://example.com/1",
+                source=SourceType.CANKAOXIAOXI,
+                publish_time=datetime.now()
+            ),
+            Article(
+                title="某科技公司发布新品",
+                url="https://example.com/2",
+                source=SourceType.CANKAOXIAOXI,
+                publish_time=datetime.now()
+            ),
+        ]
+
+        filtered = deduper._filter_by_cache_title(articles)
+        assert [a.title for a in filtered] == ["某科技公司发布新品"]
+
+    def test_clear_resets_index(self):
+        """清空缓存同时清空指纹索引"""
+        from src.crawlers.dedup import today_news_cache, title_fingerprint
+
+        fingerprint = title_fingerprint("马斯克宣布新计划")
+        today_news_cache.add("https://example.com/old", "马斯克宣布新计划")
+        assert today_news_cache.find_similar_urls(fingerprint) == ["https://example.com/old"]
+
+        today_news_cache.clear()
+        assert today_news_cache.has_similar_title(fingerprint) is False
+
+    @pytest.mark.usefixtures("isolated_data_dir")
+    def test_dedup_fingerprints_each_title_once(self, monkeypatch):
+        """四层去重中每篇文章只计算一次指纹，并写入缓存复用"""
+        from src.crawlers.dedup import today_news_cache
+
+        deduper = TextDeduplicator()
+        calls = []
+        original = deduper._compute_simhash
+
+        def counting(text):
+            calls.append(text)
+            return original(text)
+
+        monkeypatch.setattr(deduper, "_compute_simhash", counting)
+        today_news_cache.add("https://example.com/old", "旧闻标题占位")
+
+        titles = ["马斯克宣布新计划", "马斯克宣布新计划", "某科技公司发布新品", "央行宣布降息"]
+        articles = [
+            Article(
+                title=t,
+                url=f"https://example.com/{i}",
+                source=SourceType.CANKAOXIAOXI,
+                publish_time=datetime.now()
+            )
+            for i, t in enumerate(titles)
+        ]
+
+        deduped = deduper.dedup(articles)
+        assert len(deduped) == 3
+        assert len(calls) == len(titles)
+
+        calls.clear()
+        assert deduper._filter_by_cache_title(articles) == []
+        assert today_news_cache.count == 4
+
+
+class TestNumpyBackend:
+    """测试 numpy 向量化后端与分段索引后端判定一致"""
+
+    def setup_method(self):
+        pytest.importorskip("numpy")
+        from src.crawlers.dedup import today_news_cache
+        today_news_cache.clear()
+
+    def teardown_method(self):
+        from src.crawlers.dedup import today_news_cache
+        today_news_cache.clear()
+
+    def _articles(self, titles, prefix):
+        return [
+            Article(
+                title=t,
+                url=f"https://example.com/{prefix}/{i}",
+                source=SourceType.CANKAOXIAOXI,
+                publish_time=datetime.now()
+            )
+            for i, t in enumerate(titles)
+        ]
+
+    def test_popcount_fallback_matches_bitwise_count(self, monkeypatch):
+        """无 bitwise_count 时的查表 popcount 结果一致"""
+        import random
+        import numpy as np
+        from src.crawlers import simhash_backend
+
+        values = np.array([random.getrandbits(64) for _ in range(200)], dtype=np.uint64)
+        expected = [bin(int(v)).count("1") for v in values]
+
+        monkeypatch.delattr(np, "bitwise_count", raising=False)
+        fallback = simhash_backend._build_popcount()
+        assert fallback(values).tolist() == expected
+
+    @pytest.mark.usefixtures("isolated_data_dir")
+    def test_backend_parity(self):
+        """两种后端在缓存层与批次层的保留/丢弃决定完全一致"""
+        import random
+        from src.crawlers.dedup import today_news_cache
+
+        rng = random.Random(7)
+        words = ["马斯克", "特斯拉", "发布", "芯片", "英伟达", "大模型", "融资", "宣布",
+                 "火箭", "发射", "央行", "降息", "股价", "上涨", "财报", "机器人"]
+        cached = ["".join(rng.choice(words) for _ in range(5)) for _ in range(120)]
+        batch = ["".join(rng.choice(words) for _ in range(5)) for _ in range(120)]
+        batch += cached[:20]
+
+        for i, title in enumerate(cached):
+            today_news_cache.add(f"https://example.com/cached/{i}", title)
+
+        index_deduper = TextDeduplicator(backend="index")
+        numpy_deduper = TextDeduplicator(backend="numpy")
+        articles = self._articles(batch, "batch")
+
+        by_index = index_deduper._filter_by_cache_title(articles)
+        by_numpy = numpy_deduper._filter_by_cache_title(articles)
+        assert [a.url for a in by_index] == [a.url for a in by_numpy]
+        assert len(by_index) < len(articles)
+
+        by_index = index_deduper._filter_by_batch_similarity(articles)
+        by_numpy = numpy_deduper._filter_by_batch_similarity(articles)
+        assert [a.url for a in by_index] == [a.url for a in by_numpy]
+        assert len(by_index) < len(articles)
+
+    def test_unknown_backend(self):
+        """未知后端报错"""
+        with pytest.raises(ValueError):
+            TextDeduplicator(backend="gpu")
+
+
 class TestUniversalCrawler:
     """测试通用爬虫"""
 
@@ -145,6 +350,705 @@ class TestUniversalCrawler:
         assert "musk" in keywords_data["legend"]
         assert len(keywords_data["front"]) > 0
 
+    @pytest.mark.asyncio
+    async def test_bodies_fetched_only_for_survivors(self, monkeypatch):
+        """只抓列表时不请求正文，正文只为筛选后的文章抓取"""
+        from types import SimpleNamespace
+        from src.api.crawl import _fetch_survivor_bodies
+        from src.config.models import ContentFetchConfig
+        from src.crawlers.body_fetcher import BodyFetcher
+        from src.crawlers.universal import UniversalCrawler
+
+        requested = []
+
+        async def parse(response, source_config, client, limit):
+            return [
+                Article(title=f"标题{i}", url=f"https://example.com/{i}",
+                        source=SourceType.CANKAOXIAOXI, publish_time=datetime.now())
+                for i in range(5)
+            ]
+
+        async def fetch_content(url, client):
+            requested.append(url)
+            return f"正文 {url}"
+
+        parser = SimpleNamespace(parse=parse, fetch_content=fetch_content)
+        monkeypatch.setattr(UniversalCrawler, "_load_parser", lambda self: parser)
+
+        source = SimpleNamespace(id="cankaoxiaoxi", name="参考消息")
+        body_fetcher = BodyFetcher(ContentFetchConfig(rate_per_host=0))
+
+        def create_crawler(src):
+            return UniversalCrawler(src, news_batch_limit=5, client=object(),
+                                    body_fetcher=body_fetcher)
+
+        articles = await create_crawler(source).fetch(fetch_contents=False)
+        assert len(articles) == 5
+        assert requested == []
+        assert all(a.content is None for a in articles)
+
+        survivors = articles[:2]
+        await _fetch_survivor_bodies(survivors, {"cankaoxiaoxi": source}, create_crawler)
+        assert sorted(requested) == [a.url for a in survivors]
+        assert [a.content for a in survivors] == [f"正文 {a.url}" for a in survivors]
+        assert all(a.content is None for a in articles[2:])
+
+
+class TestHTTPClientManager:
+    """测试进程级共享 HTTP 客户端"""
+
+    @pytest.mark.asyncio
+    async def test_shared_client_borrowed(self):
+        """爬虫借用共享客户端，关闭爬虫不关闭客户端"""
+        from types import SimpleNamespace
+        from src.crawlers.http_client import HTTPClientManager, http_client_manager
+        from src.crawlers.universal import UniversalCrawler
+
+        manager = HTTPClientManager()
+        client = manager.get_client()
+        assert manager.get_client() is client
+        await manager.aclose()
+        assert client.is_closed
+
+        source = SimpleNamespace(id="cankaoxiaoxi", name="参考消息")
+        crawler = UniversalCrawler(source, news_batch_limit=5)
+        shared = crawler.client
+        assert shared is http_client_manager.get_client()
+        await crawler.close()
+        assert not shared.is_closed
+        await http_client_manager.aclose()
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self):
+        """同一主机的并发请求不超过上限，不同主机互不影响"""
+        import asyncio
+        import httpx
+        from src.crawlers.http_client import PerHostLimitTransport
+
+        active = {}
+        peak = {}
+
+        class Body(httpx.AsyncByteStream):
+            """流式响应体（由客户端读取并关闭，走名额归还路径）"""
+
+            async def __aiter__(self):
+                yield b"ok"
+
+        async def handler(request):
+            host = request.url.host
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+            return httpx.Response(200, stream=Body())
+
+        transport = PerHostLimitTransport(httpx.MockTransport(handler), per_host=2)
+        async with httpx.AsyncClient(transport=transport) as client:
+            urls = [f"https://a.example.com/{i}" for i in range(6)]
+            urls += [f"https://b.example.com/{i}" for i in range(6)]
+            responses = await asyncio.gather(*(client.get(u) for u in urls))
+
+        assert all(r.text == "ok" for r in responses)
+        assert peak == {"a.example.com": 2, "b.example.com": 2}
+        # 响应关闭后名额全部归还
+        assert all(s._value == 2 for s in transport._semaphores.values())
+
+    @pytest.mark.asyncio
+    async def test_dns_cache(self, monkeypatch):
+        """同一主机只解析一次，连接使用解析出的地址"""
+        import asyncio
+        from src.crawlers.http_client import CachingDNSBackend
+
+        lookups = []
+        connected = []
+
+        async def fake_getaddrinfo(host, port, **kwargs):
+            lookups.append(host)
+            return [(None, None, None, "", ("10.0.0.1", port))]
+
+        class FakeBackend:
+            async def connect_tcp(self, host, port, **kwargs):
+                connected.append(host)
+                return object()
+
+        loop = asyncio.get_running_loop()
+        monkeypatch.setattr(loop, "getaddrinfo", fake_getaddrinfo)
+
+        backend = CachingDNSBackend(FakeBackend(), ttl=60)
+        await backend.connect_tcp("news.example.com", 443)
+        await backend.connect_tcp("news.example.com", 443)
+
+        assert lookups == ["news.example.com"]
+        assert connected == ["10.0.0.1", "10.0.0.1"]
+        assert (backend.hits, backend.misses) == (1, 1)
+
+
+class TestBodyFetcher:
+    """测试正文并发抓取"""
+
+    @staticmethod
+    def _articles(urls):
+        return [
+            Article(title=f"标题{i}", url=url, source=SourceType.CANKAOXIAOXI,
+                    publish_time=datetime.now())
+            for i, url in enumerate(urls)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_with_per_host_limit(self):
+        """并发抓取，同一主机不超过 per_host，耗时接近最慢的一批"""
+        import asyncio
+        import time
+        from src.config.models import ContentFetchConfig
+        from src.crawlers.body_fetcher import BodyFetcher
+
+        active = {}
+        peak = {}
+
+        async def fetch(url):
+            host = url.split("/")[2]
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+            await asyncio.sleep(0.05)
+            active[host] -= 1
+            return f"正文 {url}"
+
+        urls = [f"https://a.example.com/{i}" for i in range(4)]
+        urls += [f"https://b.example.com/{i}" for i in range(4)]
+        articles = self._articles(urls)
+        fetcher = BodyFetcher(ContentFetchConfig(concurrency=8, per_host=2, rate_per_host=0))
+
+        start = time.monotonic()
+        stats = await fetcher.fetch_all(articles, fetch)
+        elapsed = time.monotonic() - start
+
+        assert stats == {"fetched": 8, "failed": 0, "cancelled": 0}
+        assert all(a.content == f"正文 {a.url}" for a in articles)
+        assert peak == {"a.example.com": 2, "b.example.com": 2}
+        assert elapsed < 0.3  # 串行需 0.4s，每主机 2 并发约 0.1s
+
+    @pytest.mark.asyncio
+    async def test_timeouts_and_errors(self):
+        """单篇超时或出错时正文为 None，超过总截止时间的请求被取消"""
+        import asyncio
+        from src.config.models import ContentFetchConfig
+        from src.crawlers.body_fetcher import BodyFetcher
+
+        async def fetch(url):
+            if url.endswith("slow"):
+                await asyncio.sleep(1)
+            if url.endswith("bad"):
+                raise ValueError("boom")
+            return "ok"
+
+        articles = self._articles([
+            "https://a.example.com/ok",
+            "https://a.example.com/slow",
+            "https://a.example.com/bad",
+        ])
+        fetcher = BodyFetcher(ContentFetchConfig(request_timeout=0.05, rate_per_host=0))
+        stats = await fetcher.fetch_all(articles, fetch)
+        assert stats == {"fetched": 1, "failed": 2, "cancelled": 0}
+        assert [a.content for a in articles] == ["ok", None, None]
+
+        articles = self._articles(["https://a.example.com/slow"])
+        fetcher = BodyFetcher(ContentFetchConfig(request_timeout=5, total_timeout=0.05))
+        stats = await fetcher.fetch_all(articles, fetch)
+        assert stats == {"fetched": 0, "failed": 0, "cancelled": 1}
+        assert articles[0].content is None
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_rate(self):
+        """令牌用完后按速率补充"""
+        import time
+        from src.crawlers.body_fetcher import TokenBucket
+
+        bucket = TokenBucket(rate=50, capacity=2)
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        # 前 2 个立即取得，后 2 个各需约 20ms
+        assert time.monotonic() - start >= 0.03
+
+
+class TestResilientClient:
+    """测试重试与熔断"""
+
+    @staticmethod
+    def _client(handler, **network):
+        import httpx
+        from src.config.models import NetworkConfig
+        from src.crawlers.resilient import CircuitBreaker, RequestMetrics, ResilientClient
+
+        config = NetworkConfig(retry_delay=0, **network)
+        return ResilientClient(
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            "test-source",
+            config,
+            breaker=CircuitBreaker(config.circuit_failure_threshold, config.circuit_cooldown),
+            metrics=RequestMetrics(),
+        )
+
+    @pytest.mark.asyncio
+    async def test_retry_then_success(self):
+        """5xx 与网络错误重试，4xx 不重试"""
+        import httpx
+
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            if request.url.path == "/missing":
+                return httpx.Response(404)
+            if len(calls) == 1:
+                raise httpx.ConnectError("refused")
+            if len(calls) == 2:
+                return httpx.Response(503)
+            return httpx.Response(200, text="ok")
+
+        http = self._client(handler, retry=3)
+        response = await http.get("https://example.com/list")
+        assert response.text == "ok"
+        assert calls == ["/list"] * 3
+
+        response = await http.get("https://example.com/missing")
+        assert response.status_code == 404
+        assert len(calls) == 4
+
+        stats = http.metrics.snapshot()["test-source"]
+        assert (stats["attempts"], stats["failures"], stats["retries"]) == (4, 2, 2)
+        assert http.breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker(self):
+        """每次失败的尝试都计入熔断器，请求中途熔断即停止重试，冷却期内不再发请求"""
+        import httpx
+        from src.crawlers.resilient import CircuitOpenError
+
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            raise httpx.ConnectTimeout("timeout")
+
+        http = self._client(handler, retry=3, circuit_failure_threshold=2, circuit_cooldown=60)
+        with pytest.raises(httpx.ConnectTimeout):
+            await http.get("https://down.example.com/")
+        assert len(calls) == 2  # 第 2 次失败即熔断，剩余重试不再发出
+        assert http.breaker.state == "open"
+
+        with pytest.raises(CircuitOpenError):
+            await http.get("https://down.example.com/")
+        assert len(calls) == 2
+
+        # 冷却期结束：放行试探，失败立即重新熔断（试探请求不重试）
+        http.breaker._opened_at -= 60
+        assert http.breaker.state == "half-open"
+        with pytest.raises(httpx.ConnectTimeout):
+            await http.get("https://down.example.com/")
+        assert len(calls) == 3
+        assert http.breaker.state == "open"
+
+    @pytest.mark.asyncio
+    async def test_half_open_single_probe(self):
+        """half-open 时只放行一个试探请求，其余请求直接跳过"""
+        import httpx
+        from src.crawlers.resilient import CircuitOpenError
+
+        release = asyncio.Event()
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.path)
+            await release.wait()
+            return httpx.Response(200, text="ok")
+
+        http = self._client(handler, circuit_failure_threshold=1, circuit_cooldown=60)
+        http.breaker.record_failure()
+        http.breaker._opened_at -= 60
+        assert http.breaker.state == "half-open"
+
+        probe = asyncio.create_task(http.get("https://example.com/"))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            await http.get("https://example.com/")
+        release.set()
+        assert (await probe).text == "ok"
+        assert http.breaker.state == "closed"
+        assert len(calls) == 1
+
+        # 试探被取消（未记录结果）时释放，下一个请求可以继续试探
+        release.clear()
+        http.breaker.record_failure()
+        http.breaker._opened_at -= 60
+        probe = asyncio.create_task(http.get("https://example.com/"))
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        assert http.breaker.allow()
+
+    @pytest.mark.asyncio
+    async def test_crawler_recovers_after_cooldown(self, monkeypatch):
+        """经 UniversalCrawler.fetch：熔断 → 冷却 → 试探失败重新熔断 → 试探成功恢复"""
+        import httpx
+        import src.crawlers.resilient as resilient
+        from src.config.models import NetworkConfig, NewsSource
+        from src.crawlers.resilient import CircuitOpenError
+        from src.crawlers.response_cache import ResponseCache
+        from src.crawlers.universal import UniversalCrawler
+
+        monkeypatch.setattr(resilient, "_breakers", {})
+        monkeypatch.setattr(resilient, "response_cache", ResponseCache())
+        state = {"down": True}
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            if state["down"]:
+                return httpx.Response(503)
+            base = int(datetime(2026, 1, 1, 12, 0).timestamp())
+            return httpx.Response(200, json={"data": {"items": [
+                {"title": "快讯", "uri": "https://wallstreetcn.com/live/1", "display_time": base},
+            ]}})
+
+        def fetch():
+            crawler = UniversalCrawler(
+                NewsSource(id="wallstreetcn-live", name="华尔街见闻", type="financial",
+                           url="https://api.example.com/live"),
+                news_batch_limit=5,
+                client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+                network=NetworkConfig(retry=0, circuit_failure_threshold=1, circuit_cooldown=60),
+            )
+            return crawler, crawler.fetch(fetch_contents=False)
+
+        crawler, run = fetch()
+        assert await run == []
+        breaker = crawler.http.breaker
+        assert breaker.state == "open"
+
+        _, run = fetch()
+        with pytest.raises(CircuitOpenError):
+            await run
+        assert len(calls) == 1
+
+        # 冷却期结束，源仍不可用：试探请求真实发出，失败后重新熔断并释放试探名额
+        breaker._opened_at -= 60
+        _, run = fetch()
+        assert await run == []
+        assert len(calls) == 2
+        assert breaker.state == "open" and not breaker._probing
+
+        # 源恢复：试探成功，熔断器关闭
+        breaker._opened_at -= 60
+        state["down"] = False
+        _, run = fetch()
+        assert [a.title for a in await run] == ["快讯"]
+        assert len(calls) == 3
+        assert breaker.state == "closed" and not breaker._probing
+
+    @pytest.mark.asyncio
+    async def test_down_source_worst_case_time(self):
+        """新闻源挂起不响应时，单次请求（含重试与退避）不超过 retry_budget"""
+        import time
+        import httpx
+        from src.config.models import NetworkConfig
+        from src.crawlers.resilient import CircuitBreaker, RequestMetrics, ResilientClient
+
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.path)
+            await asyncio.sleep(10)  # 连接建立后不再响应
+            return httpx.Response(200)
+
+        # 按线上配置（timeout 20 / retry 3 / 退避 5→10→20），只把预算缩小以便测试
+        config = NetworkConfig(timeout=20, retry=3, retry_delay=5, retry_backoff_max=30,
+                               retry_budget=0.25, circuit_failure_threshold=10)
+        http = ResilientClient(
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)), "test-source", config,
+            breaker=CircuitBreaker(config.circuit_failure_threshold, config.circuit_cooldown),
+            metrics=RequestMetrics(),
+        )
+        start = time.perf_counter()
+        with pytest.raises(httpx.TimeoutException):
+            await http.get("https://down.example.com/")
+        elapsed = time.perf_counter() - start
+        assert elapsed < config.retry_budget + 0.1
+        assert len(calls) == 1  # 第一次尝试就用完了预算，不再重试
+
+        # 默认配置下宕机新闻源单次请求占用不超过 30 秒
+        assert NetworkConfig().retry_budget < 30
+
+    @pytest.mark.asyncio
+    async def test_conditional_list_requests(self):
+        """列表接口：304 与响应体未变化都跳过解析，内容变化后重新解析"""
+        import httpx
+        from src.crawlers.response_cache import NotModified, ResponseCache
+        from src.crawlers.parsers.base import get_list
+
+        bodies = {"/etag": b'{"v": 1}', "/plain": b'{"v": 1}'}
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(request.headers.get("If-None-Match"))
+            if request.url.path == "/etag":
+                if request.headers.get("If-None-Match") == '"v1"':
+                    return httpx.Response(304)
+                return httpx.Response(200, content=bodies["/etag"], headers={"ETag": '"v1"'})
+            return httpx.Response(200, content=bodies["/plain"])
+
+        http = self._client(handler)
+        http.cache = ResponseCache()
+
+        assert (await get_list(http, "https://example.com/etag")).json() == {"v": 1}
+        http.cache.commit(http.source_id)  # 入库成功后生效
+        with pytest.raises(NotModified) as exc:
+            await get_list(http, "https://example.com/etag")
+        assert exc.value.reason == "304"
+        assert seen_headers == [None, '"v1"']
+
+        await get_list(http, "https://example.com/plain")
+        http.cache.commit(http.source_id)
+        with pytest.raises(NotModified) as exc:
+            await get_list(http, "https://example.com/plain")
+        assert exc.value.reason == "hash"
+
+        bodies["/plain"] = b'{"v": 2}'
+        assert (await get_list(http, "https://example.com/plain")).json() == {"v": 2}
+        assert http.cache.stats()["not_modified"] == 1
+        assert http.cache.stats()["unchanged"] == 1
+        assert http.cache.stats()["changed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_volatile_params_excluded_from_cache_key(self):
+        """每轮变化的游标参数不计入缓存键：响应未变化时命中，缓存不随轮次增长"""
+        import httpx
+        from src.crawlers.response_cache import NotModified, ResponseCache
+        from src.crawlers.parsers.base import get_list
+
+        seen = []
+
+        def handler(request):
+            seen.append(request.url.params.get("lastTime"))
+            return httpx.Response(200, json={"data": {"roll_data": []}})
+
+        http = self._client(handler)
+        http.cache = ResponseCache()
+        url = "https://example.com/telegraph"
+
+        await get_list(http, url, params={"lastTime": 100}, cache_ignore_params=("lastTime",))
+        http.cache.commit(http.source_id)
+        with pytest.raises(NotModified):
+            await get_list(http, url, params={"lastTime": 200}, cache_ignore_params=("lastTime",))
+        assert seen == ["100", "200"]  # 请求本身仍带上游标
+        assert http.cache.stats()["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_insert_reparses_unchanged_list(self, monkeypatch):
+        """入库失败后列表校验信息不生效：下轮响应未变化也重新解析"""
+        import httpx
+        import src.api.crawl as crawl
+        import src.crawlers.keywords_filter as keywords_filter
+        from src.config.models import NetworkConfig
+        from src.crawlers.parsers.base import get_list
+        from src.crawlers.resilient import CircuitBreaker, RequestMetrics, ResilientClient
+        from src.crawlers.response_cache import NotModified, ResponseCache
+
+        cache = ResponseCache()
+        parsed = []
+        inserts = []
+
+        def handler(request):
+            return httpx.Response(200, json=[{"title": "快讯一"}, {"title": "快讯二"}])
+
+        class FakeCrawler:
+            def __init__(self, source, **kwargs):
+                self.source = source
+                self.http = ResilientClient(
+                    httpx.AsyncClient(transport=httpx.MockTransport(handler)), source.id,
+                    NetworkConfig(retry_delay=0), breaker=CircuitBreaker(), metrics=RequestMetrics(),
+                    cache=cache,
+                )
+
+            async def fetch(self, fetch_contents=True):
+                try:
+                    response = await get_list(self.http, "https://example.com/list")
+                except NotModified:
+                    return []
+                parsed.append(len(response.json()))
+                return [
+                    Article(title=item["title"], url=f"https://example.com/{i}",
+                            source=SourceType.CLS_TELEGRAPH, publish_time=datetime.now())
+                    for i, item in enumerate(response.json())
+                ]
+
+            async def close(self):
+                pass
+
+        class FakeDB:
+            def __init__(self, *args):
+                pass
+
+            def init_db(self):
+                pass
+
+            def existing_urls(self, urls):
+                return set()
+
+            def insert_articles_bulk(self, articles):
+                inserts.append(len(articles))
+                if len(inserts) == 1:
+                    raise RuntimeError("database is locked")
+                return {"inserted": list(articles), "skipped": []}
+
+        class PassThroughDedup:
+            def dedup(self, articles, fingerprints=None, spans=None):
+                return articles
+
+        monkeypatch.setattr(crawl, "response_cache", cache)
+        monkeypatch.setattr(crawl, "UniversalCrawler", FakeCrawler)
+        monkeypatch.setattr(crawl, "TimelineDB", FakeDB)
+        monkeypatch.setattr(crawl, "TextDeduplicator", PassThroughDedup)
+        monkeypatch.setattr(crawl, "worker_pool", SimpleNamespace(enabled=False))
+        monkeypatch.setattr(crawl, "WatermarkStore", lambda *a: SimpleNamespace(
+            since=lambda source_id: None, advance=lambda source_id, articles: True))
+        monkeypatch.setattr(crawl, "CrawlSpanStore", lambda *a: SimpleNamespace(record_spans=lambda r: 0))
+        monkeypatch.setattr(keywords_filter, "filter_by_keywords", lambda articles: articles)
+
+        first = await crawl.run_crawl("cls-telegraph", fetch_bodies="none")
+        assert first["total_saved"] == 0
+        assert cache.stats()["entries"] == 0 and cache.stats()["pending"] == 0
+
+        # 响应与上轮完全相同，但上轮入库失败：仍需重新解析并入库
+        second = await crawl.run_crawl("cls-telegraph", fetch_bodies="none")
+        assert parsed == [2, 2]
+        assert second["total_saved"] == 2
+
+        # 入库成功后校验信息生效：再次相同响应跳过解析
+        third = await crawl.run_crawl("cls-telegraph", fetch_bodies="none")
+        assert parsed == [2, 2]
+        assert third["total_fetched"] == 0
+        assert inserts == [2, 2, 0]
+
+
+class TestWatermark:
+    """测试增量抓取水位"""
+
+    def test_store_only_advances(self, tmp_path):
+        """水位只前进不后退，可按源清除"""
+        from src.crawlers.watermark import WatermarkStore
+
+        store = WatermarkStore(str(tmp_path / "scheduler.sqlite"))
+        assert store.since("cls-telegraph") is None
+
+        t1 = datetime(2026, 1, 1, 10, 0)
+        t2 = datetime(2026, 1, 1, 11, 0)
+        assert store.update("cls-telegraph", t2, "https://example.com/2")
+        assert not store.update("cls-telegraph", t1, "https://example.com/1")
+        assert store.since("cls-telegraph") == t2
+        assert store.get("cls-telegraph")["last_id"] == "https://example.com/2"
+
+        articles = [
+            Article(title="新", url="https://example.com/3", source=SourceType.CLS_TELEGRAPH,
+                    publish_time=datetime(2026, 1, 1, 12, 0)),
+            Article(title="旧", url="https://example.com/0", source=SourceType.CLS_TELEGRAPH,
+                    publish_time=t1),
+        ]
+        assert store.advance("cls-telegraph", articles)
+        assert store.get("cls-telegraph")["last_id"] == "https://example.com/3"
+
+        assert store.reset("cls-telegraph") == 1
+        assert store.get_all() == []
+
+    @pytest.mark.asyncio
+    async def test_parser_stops_at_watermark(self):
+        """按时间倒序的列表到达水位即停止解析"""
+        import httpx
+        from src.config.models import NewsSource
+        from src.crawlers.universal import UniversalCrawler
+
+        base = int(datetime(2026, 1, 1, 12, 0).timestamp())
+        items = [
+            {"title": f"快讯{i}", "uri": f"https://wallstreetcn.com/live/{i}",
+             "display_time": base - i * 60}
+            for i in range(5)
+        ]
+
+        def handler(request):
+            return httpx.Response(200, json={"data": {"items": items}})
+
+        crawler = UniversalCrawler(
+            NewsSource(id="wallstreetcn-live", name="华尔街见闻", type="financial",
+                       url="https://api.example.com/live"),
+            news_batch_limit=5,
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            since=datetime.fromtimestamp(base - 2 * 60),
+        )
+        articles = await crawler.fetch(fetch_contents=False)
+        # 与水位同一时刻的条目保留给去重判断
+        assert [a.title for a in articles] == ["快讯0", "快讯1", "快讯2"]
+
+    @pytest.mark.asyncio
+    async def test_hot_list_ignores_watermark(self, monkeypatch):
+        """热榜按热度排序：新上榜但早于水位的条目仍然解析"""
+        import httpx
+        import src.crawlers.resilient as resilient
+        from src.config.models import NewsSource
+        from src.crawlers.response_cache import ResponseCache
+        from src.crawlers.universal import UniversalCrawler
+
+        monkeypatch.setattr(resilient, "response_cache", ResponseCache())
+        base = int(datetime(2026, 1, 1, 12, 0).timestamp()) * 1000
+        hot_news = [
+            {"contId": "1", "name": "热榜第一", "pubTimeLong": base},
+            {"contId": "2", "name": "新上榜的旧闻", "pubTimeLong": base - 3600 * 1000},
+        ]
+
+        def handler(request):
+            return httpx.Response(200, json={"data": {"hotNews": hot_news}})
+
+        crawler = UniversalCrawler(
+            NewsSource(id="thepaper", name="澎湃新闻", type="portal",
+                       url="https://www.thepaper.cn/"),
+            news_batch_limit=5,
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            since=datetime(2026, 1, 1, 12, 0),
+        )
+        articles = await crawler.fetch(fetch_contents=False)
+        assert [a.title for a in articles] == ["热榜第一", "新上榜的旧闻"]
+
+    @pytest.mark.asyncio
+    async def test_multi_channel_source_ignores_watermark(self, monkeypatch):
+        """多频道新闻源不按新闻源水位停止：较慢频道中早于水位的新条目不丢失"""
+        import httpx
+        import src.crawlers.resilient as resilient
+        from src.config.models import NewsSource
+        from src.crawlers.response_cache import ResponseCache
+        from src.crawlers.universal import UniversalCrawler
+
+        monkeypatch.setattr(resilient, "response_cache", ResponseCache())
+        # 最忙频道 12:00 有新条目（水位），gj 频道的新条目在 11:00
+        times = {"zhongguo": "2026-01-01 12:00:00", "guandian": "2026-01-01 11:30:00",
+                 "gj": "2026-01-01 11:00:00"}
+
+        def handler(request):
+            channel = request.url.path.split("/")[3]
+            return httpx.Response(200, json={"list": [{"data": {
+                "title": f"{channel}新闻", "url": f"https://example.com/{channel}",
+                "publishTime": times[channel],
+            }}]})
+
+        crawler = UniversalCrawler(
+            NewsSource(id="cankaoxiaoxi", name="参考消息", type="portal",
+                       url="https://china.cankaoxiaoxi.com/"),
+            news_batch_limit=5,
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            since=datetime(2026, 1, 1, 12, 0),
+        )
+        articles = await crawler.fetch(fetch_contents=False)
+        assert sorted(a.title for a in articles) == ["gj新闻", "guandian新闻", "zhongguo新闻"]
+
 
 class TestParserInterface:
     """测试解析器接口"""
@@ -166,3 +1070,290 @@ class TestParserInterface:
         # 应该返回关键词列表
         if features:
             assert isinstance(features[0], tuple) or isinstance(features[0], str)
+
+    @pytest.mark.parametrize("backend", ["lxml", "html.parser"])
+    def test_extract_paragraphs_backends(self, backend):
+        """各解析后端提取结果一致：按优先级选容器，跳过注释与脚本"""
+        from src.crawlers.parsers import base
+
+        html = (
+            "<html><head><script>var s = '<p>x</p>';</script></head><body>"
+            "<div class='nav'><p>导航</p></div>"
+            "<div class='main content'>"
+            "<p> 第一段 <b>加粗</b> <!-- 注释 -->尾巴 </p><p>  </p>"
+            "<p>第二段<script>track()</script></p>"
+            "</div><article><p>次选容器</p></article></body></html>"
+        )
+        previous = base.set_parse_backend(backend)
+        try:
+            assert base.extract_paragraphs(html, ("div.content", "article")) == "第一段加粗尾巴\n\n第二段"
+            assert base.extract_paragraphs(html, ("div.missing", "article")) == "次选容器"
+            assert base.extract_paragraphs(html, ("div.missing",)) is None
+            assert base.extract_paragraphs(html, ("body",), max_paragraphs=1) == "导航"
+            if backend == "lxml":
+                assert base.extract_paragraphs(html, ("div.content", "article"), stream=True) == \
+                    "第一段加粗尾巴\n\n第二段"
+                assert base.extract_paragraphs(html, ("div.missing", "article"), stream=True) == "次选容器"
+        finally:
+            base.set_parse_backend(previous)
+
+    def test_extract_content_fallback(self):
+        """参考消息：找不到正文容器时取 body 中的段落"""
+        from src.crawlers.parsers import cankaoxiaoxi
+
+        html = "<html><body>" + "".join(f"<p>段落{i}</p>" for i in range(30)) + "</body></html>"
+        content = cankaoxiaoxi.extract_content(html)
+        assert content.split("\n\n") == [f"段落{i}" for i in range(20)]
+        assert cankaoxiaoxi.extract_content("<html><body></body></html>") == "无法提取文章内容"
+
+
+class TestWorkerPool:
+    """测试进程池执行阶段"""
+
+    @pytest.mark.asyncio
+    async def test_worker_results_match_in_process(self):
+        """工作进程中的正文提取与指纹计算与进程内结果一致"""
+        from src.config.models import WorkersConfig
+        from src.crawlers.dedup import title_fingerprint
+        from src.crawlers.workers import WorkerPool
+
+        pages = [
+            "<html><body><div class='content'><p>第一段</p><p>第二段</p></div></body></html>",
+            "<html><body><p>无容器</p></body></html>",
+        ]
+        titles = ["马斯克宣布新计划", "某科技公司发布新品", "OpenAI 发布新模型"]
+
+        pool = WorkerPool(WorkersConfig(max_workers=1, batch_size=1))
+        inline = WorkerPool(WorkersConfig(enabled=False))
+        try:
+            contents = await pool.extract_contents("cls-telegraph", pages)
+            fingerprints = await pool.fingerprint_titles(titles)
+        finally:
+            pool.shutdown()
+
+        assert contents == ["第一段\n\n第二段", "无法提取文章内容"]
+        assert contents == await inline.extract_contents("cls-telegraph", pages)
+        assert fingerprints == [title_fingerprint(t) for t in titles]
+
+    @pytest.mark.asyncio
+    async def test_tokenizer_stats_include_workers(self):
+        """工作进程中的分词缓存命中计入分词统计"""
+        from src.config.models import WorkersConfig
+        from src.crawlers.tokenizer import Tokenizer
+        from src.crawlers.workers import WorkerPool
+
+        titles = ["马斯克宣布新计划", "某科技公司发布新品", "OpenAI 发布新模型"]
+        pool = WorkerPool(WorkersConfig(max_workers=1, batch_size=10))
+        try:
+            await pool.fingerprint_titles(titles)
+            await pool.fingerprint_titles(titles)
+            assert pool.tokenizer_stats() == {"processes": 1, "entries": 3, "hits": 3, "misses": 3}
+        finally:
+            pool.shutdown()
+        # 进程退出后缓存条目释放，累计命中保留
+        assert pool.tokenizer_stats() == {"processes": 0, "entries": 0, "hits": 3, "misses": 3}
+
+        stats = Tokenizer().stats(pool.tokenizer_stats())
+        assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (3, 3, 0.5)
+        assert stats["local"] == {"entries": 0, "hits": 0, "misses": 0}
+
+        # 进程池禁用时在本进程内执行，不重复计入工作进程
+        inline = WorkerPool(WorkersConfig(enabled=False))
+        await inline.fingerprint_titles(titles)
+        assert inline.tokenizer_stats()["processes"] == 0
+
+    @pytest.mark.usefixtures("isolated_data_dir")
+    def test_dedup_uses_precomputed_fingerprints(self, monkeypatch):
+        """去重复用预先算好的指纹，不再在事件循环中分词"""
+        from src.crawlers.dedup import today_news_cache, title_fingerprint
+
+        today_news_cache.clear()
+        articles = [
+            Article(title=title, url=f"https://example.com/{i}",
+                    source=SourceType.CANKAOXIAOXI, publish_time=datetime.now())
+            for i, title in enumerate(["马斯克宣布新计划", "马斯克宣布新计划！", "某科技公司发布新品"])
+        ]
+        fingerprints = {id(a): title_fingerprint(a.title) for a in articles}
+
+        deduper = TextDeduplicator()
+        monkeypatch.setattr(deduper, "_compute_simhash", lambda text: pytest.fail("不应重新计算指纹"))
+        try:
+            deduped = deduper.dedup(articles, fingerprints)
+        finally:
+            today_news_cache.clear()
+        assert [a.url for a in deduped] == ["https://example.com/0", "https://example.com/2"]
+
+
+class TestTokenizer:
+    """测试分词服务"""
+
+    def test_cut_matches_jieba_and_caches(self):
+        """分词结果与 jieba 一致，重复标题命中缓存"""
+        import jieba
+        from src.config.models import TokenizerConfig
+        from src.crawlers.tokenizer import Tokenizer
+
+        tok = Tokenizer(TokenizerConfig(cache_size=2))
+        text = "马斯克宣布新计划"
+        assert tok.cut(text) == tuple(jieba.cut(text))
+        assert tok.cut(text) == tuple(jieba.cut(text))
+        stats = tok.stats()
+        assert stats["ready"] is True
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    def test_lru_eviction(self):
+        """超过容量时淘汰最久未使用的标题"""
+        from src.config.models import TokenizerConfig
+        from src.crawlers.tokenizer import Tokenizer
+
+        tok = Tokenizer(TokenizerConfig(cache_size=2))
+        tok.cut("第一条")
+        tok.cut("第二条")
+        tok.cut("第一条")  # 第一条变为最近使用
+        tok.cut("第三条")  # 淘汰第二条
+        tok.cut("第二条")
+        assert tok.stats()["misses"] == 4
+        assert tok.stats()["entries"] == 2
+        tok.clear_cache()
+        assert tok.stats()["entries"] == 0 and tok.stats()["hits"] == 0
+
+
+class TestPipeline:
+    """测试流式抓取流水线"""
+
+    @pytest.mark.asyncio
+    async def test_fast_item_not_blocked_by_slow_item(self):
+        """快的条目先完成全部阶段，不等待慢的条目"""
+        from src.crawlers.pipeline import Pipeline
+
+        stored = []
+
+        async def fetch(item):
+            await asyncio.sleep(item["delay"])
+            return item
+
+        async def store(item):
+            stored.append(item["name"])
+            return item
+
+        pipeline = Pipeline(queue_size=1)
+        pipeline.add_stage("fetch", fetch, workers=2).add_stage("store", store)
+        slow = asyncio.create_task(pipeline.run([{"name": "slow", "delay": 0.3}, {"name": "fast", "delay": 0}]))
+        await asyncio.sleep(0.1)
+        assert stored == ["fast"]
+        outputs = await slow
+        assert stored == ["fast", "slow"]
+        assert [o["name"] for o in outputs] == ["fast", "slow"]
+
+    @pytest.mark.asyncio
+    async def test_backpressure_and_failure_isolation(self):
+        """下游阻塞时上游最多领先队列长度；单条失败不影响其他条目"""
+        from src.crawlers.pipeline import Pipeline
+
+        produced = []
+        gate = asyncio.Event()
+
+        async def produce(item):
+            produced.append(item)
+            if item == 3:
+                raise ValueError("bad item")
+            return item
+
+        async def consume(item):
+            await gate.wait()
+            return item if item % 2 else None
+
+        pipeline = Pipeline(queue_size=1)
+        pipeline.add_stage("produce", produce).add_stage("consume", consume)
+        task = asyncio.create_task(pipeline.run(range(10)))
+        await asyncio.sleep(0.05)
+        # consume 持有 1 条 + 队列 1 条 + produce 阻塞在 put 的 1 条
+        assert len(produced) == 3
+        gate.set()
+        outputs = await task
+        assert sorted(outputs) == [1, 5, 7, 9]
+        stats = {s["name"]: s for s in pipeline.stats()}
+        assert stats["produce"]["failed"] == 1
+        assert stats["consume"]["dropped"] == 5
+
+
+@pytest.mark.usefixtures("isolated_data_dir")
+class TestCrawlSpans:
+    """测试抓取阶段记录"""
+
+    def test_dedup_records_span_per_layer(self):
+        """四层去重各记录一个 span，条数逐层衔接"""
+        from src.crawlers.dedup import today_news_cache
+        from src.crawlers.spans import SpanRecorder
+
+        today_news_cache.clear()
+        articles = [
+            Article(title=title, url=f"https://example.com/{i}",
+                    source=SourceType.CANKAOXIAOXI, publish_time=datetime.now())
+            for i, title in enumerate(["马斯克宣布新计划", "马斯克宣布新计划！", "某科技公司发布新品"])
+        ]
+        spans = SpanRecorder()
+        try:
+            TextDeduplicator().dedup(articles, spans=spans)
+        finally:
+            today_news_cache.clear()
+
+        assert [s.stage for s in spans.spans] == ["dedup.date", "dedup.url", "dedup.title", "dedup.batch"]
+        assert all(s.source_id == "cankaoxiaoxi" for s in spans.spans)
+        assert spans.spans[0].items_in == 3
+        assert spans.spans[-1].items_out == 2
+        assert spans.spans[0].bytes == sum(len(a.title.encode("utf-8")) for a in articles)
+        assert spans.summary()["dedup.batch"]["items_in"] == 3
+
+
+class TestMetrics:
+    """测试进程内指标"""
+
+    def test_text_exposition_format(self):
+        """Counter / Gauge / Histogram 按 Prometheus 文本格式输出"""
+        from src.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        requests = registry.counter("t_requests_total", "请求数", ("route",))
+        ratio = registry.gauge("t_ratio", "命中率")
+        latency = registry.histogram("t_seconds", "耗时", ("route",), buckets=(0.1, 1.0))
+
+        requests.inc(route='/a"b')
+        requests.inc(2, route='/a"b')
+        ratio.set(0.25)
+        for value in (0.05, 0.1, 0.5, 3):
+            latency.observe(value, route="/a")
+
+        text = registry.render()
+        assert "# TYPE t_requests_total counter" in text
+        assert 't_requests_total{route="/a\\"b"} 3' in text
+        assert "t_ratio 0.25" in text
+        assert 't_seconds_bucket{route="/a",le="0.1"} 2' in text
+        assert 't_seconds_bucket{route="/a",le="1"} 3' in text
+        assert 't_seconds_bucket{route="/a",le="+Inf"} 4' in text
+        assert 't_seconds_count{route="/a"} 4' in text
+        assert 't_seconds_sum{route="/a"} 3.65' in text
+
+        with pytest.raises(ValueError):
+            requests.inc(-1, route="/a")
+        with pytest.raises(ValueError):
+            requests.inc(method="GET")
+
+    @pytest.mark.usefixtures("isolated_data_dir")
+    def test_dedup_drops_counted_per_layer(self):
+        """各层去重丢弃条数计入指标"""
+        from src.crawlers.dedup import today_news_cache
+        from src.metrics import dedup_dropped_total
+
+        before = dedup_dropped_total.get(layer="dedup.batch")
+        today_news_cache.clear()
+        articles = [
+            Article(title=title, url=f"https://example.com/{i}",
+                    source=SourceType.CANKAOXIAOXI, publish_time=datetime.now())
+            for i, title in enumerate(["马斯克宣布新计划", "马斯克宣布新计划！", "某科技公司发布新品"])
+        ]
+        try:
+            TextDeduplicator().dedup(articles)
+        finally:
+            today_news_cache.clear()
+        assert dedup_dropped_total.get(layer="dedup.batch") - before == 1
@@ -6,7 +6,7 @@ import shutil
 from pathlib import Path
 from datetime import date
 
-from src.scheduler import SchedulerManager, JobExecutionStore
+from src.scheduler import SchedulerManager, JobExecutionStore, CrawlSpanStore
 from src.config import ConfigReader
 
 
@@ -186,3 +186,37 @@ class TestJobExecutionStore:
         assert status["success_count"] == 2
         assert status["failure_count"] == 1
         assert status["last_execution"]["total_saved"] == 20
+
+
+class TestCrawlSpanStore:
+    """测试 CrawlSpanStore"""
+
+    def test_record_and_aggregate_spans(self, temp_db):
+        """测试保存阶段记录并按阶段汇总"""
+        from src.crawlers.spans import SpanRecorder
+
+        store = CrawlSpanStore(db_path=temp_db)
+        for run in range(2):
+            recorder = SpanRecorder(run_id=f"run_{run}")
+            with recorder.span("list_fetch", "cls-telegraph") as span:
+                span.items_out = 10
+                span.bytes = 2048
+            with recorder.span("dedup.url", items_in=10) as span:
+                span.items_out = 4
+            with pytest.raises(ValueError):
+                with recorder.span("db_insert", items_in=4):
+                    raise ValueError("disk full")
+            assert store.record_spans(recorder) == 3
+
+        assert store.get_recent_runs(limit=5) == ["run_1", "run_0"]
+
+        spans = store.get_run_spans("run_1")
+        assert [s["stage"] for s in spans] == ["list_fetch", "dedup.url", "db_insert"]
+        assert spans[2]["status"] == "error" and spans[2]["error"] == "disk full"
+
+        stats = {s["stage"]: s for s in store.get_stage_stats(runs=5)}
+        assert stats["list_fetch"]["count"] == 2
+        assert stats["list_fetch"]["bytes"] == 4096
+        assert stats["dedup.url"]["items_in"] == 20
+        assert stats["dedup.url"]["items_out"] == 8
+        assert stats["db_insert"]["errors"] == 2
@@ -1,5 +1,7 @@
 """测试存储模块"""
 
+import json
+
 import pytest
 
 from src.storage import TimelineDB
@@ -39,3 +41,476 @@ class TestTimelineDB:
         """测试获取不存在的文章"""
         result = test_db.get_article("nonexistent-id")
         assert result is None
+
+
+class TestBulkInsert:
+    """测试批量入库"""
+
+    def _make(self, n):
+        return Article(
+            title=f"标题{n}",
+            url=f"https://example.com/{n}",
+            source=SourceType.KR36,
+            publish_time=datetime(2026, 1, 1, 8, n)
+        )
+
+    def test_insert_articles_bulk(self, test_db):
+        """新文章全部入库"""
+        articles = [self._make(i) for i in range(3)]
+        result = test_db.insert_articles_bulk(articles)
+        assert len(result["inserted"]) == 3
+        assert result["skipped"] == []
+        assert all(test_db.article_exists(a.url) for a in articles)
+
+    def test_skip_existing_and_duplicates(self, test_db):
+        """已存在的 URL 与本批重复 URL 被跳过"""
+        test_db.insert_articles_bulk([self._make(0)])
+        dup = self._make(1)
+        result = test_db.insert_articles_bulk([self._make(0), self._make(1), dup])
+        assert [a.url for a in result["inserted"]] == ["https://example.com/1"]
+        assert len(result["skipped"]) == 2
+
+    def test_existing_urls(self, test_db):
+        """批量检查已存在 URL"""
+        test_db.insert_articles_bulk([self._make(0)])
+        existing = test_db.existing_urls(["https://example.com/0", "https://example.com/9"])
+        assert existing == {"https://example.com/0"}
+
+    def test_empty_batch(self, test_db):
+        """空列表直接返回"""
+        assert test_db.insert_articles_bulk([]) == {"inserted": [], "skipped": []}
+
+
+class TestConnectionPool:
+    """测试连接池"""
+
+    def test_connection_reused(self, test_db):
+        """同一线程多次获取复用同一条连接"""
+        with test_db.get_connection() as conn1:
+            pass
+        with test_db.get_connection() as conn2:
+            pass
+        assert conn1 is conn2
+
+    def test_wal_mode_enabled(self, test_db):
+        """连接开启 WAL 日志"""
+        with test_db.get_connection() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_rollback_on_error(self, test_db):
+        """出错时回滚未提交的写入"""
+        with pytest.raises(RuntimeError):
+            with test_db.get_connection() as conn:
+                conn.execute(
+                    "INSERT INTO articles (id, title, url, source, publish_time) VALUES (?, ?, ?, ?, ?)",
+                    ("a1", "标题", "https://example.com/a1", "36kr", "2026-01-01T00:00:00")
+                )
+                raise RuntimeError("boom")
+        assert test_db.get_article("a1") is None
+
+    def test_release(self, test_db):
+        """释放后重新获取得到新连接"""
+        from src.storage import connection_pool
+
+        with test_db.get_connection() as conn1:
+            pass
+        connection_pool.release(test_db.db_path)
+        with test_db.get_connection() as conn2:
+            pass
+        assert conn1 is not conn2
+
+
+class TestSchemaRegistry:
+    """测试表结构注册表"""
+
+    def _make_legacy_db(self, db_path):
+        import sqlite3
+
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("""
+            CREATE TABLE articles (
+                id TEXT PRIMARY KEY, title TEXT NOT NULL, url TEXT UNIQUE,
+                source TEXT NOT NULL, timestamp DATETIME NOT NULL, file_path TEXT,
+                tags TEXT, entities TEXT, legend TEXT, created_at DATETIME
+            )
+        """)
+        conn.execute(
+            "INSERT INTO articles (id, title, url, source, timestamp) VALUES (?, ?, ?, ?, ?)",
+            ("old1", "旧文章", "https://example.com/old1", "36kr", "2024-05-01T10:00:00")
+        )
+        conn.commit()
+        conn.close()
+
+    def test_time_column_cached(self, test_db):
+        """结构只检查一次，之后命中缓存"""
+        from src.storage import schema_registry
+
+        schema = schema_registry.get(test_db.db_path)
+        assert schema.time_column == "publish_time"
+        assert schema_registry.get(test_db.db_path) is schema
+
+    def test_sees_changes_from_other_connections(self, test_db):
+        """其他连接（如迁移命令所在进程）修改表结构或数据版本后缓存失效"""
+        import sqlite3
+        from src.storage import schema_registry
+
+        schema = schema_registry.get(test_db.db_path)
+        other = sqlite3.connect(str(test_db.db_path))
+        try:
+            other.execute("ALTER TABLE articles ADD COLUMN summary TEXT")
+            other.execute(f"PRAGMA user_version = {schema.user_version + 1}")
+            other.commit()
+        finally:
+            other.close()
+
+        updated = schema_registry.get(test_db.db_path)
+        assert updated.has_column("summary")
+        assert updated.user_version == schema.user_version + 1
+
+    def test_detect_legacy(self, tmp_path):
+        """识别 timestamp 旧库"""
+        from src.storage import schema_registry
+
+        db_path = tmp_path / "timeline_2024.sqlite"
+        self._make_legacy_db(db_path)
+        schema = schema_registry.get(db_path)
+        assert schema.is_legacy
+        assert schema.time_column == "timestamp"
+
+    def test_migrate_legacy_dbs(self, tmp_path):
+        """一次性迁移旧库到 publish_time"""
+        from src.storage import schema_registry
+
+        db_path = tmp_path / "timeline_2024.sqlite"
+        self._make_legacy_db(db_path)
+
+        migrated = TimelineDB.migrate_legacy_dbs(str(tmp_path))
+        assert migrated == [str(db_path)]
+        assert schema_registry.get(db_path).time_column == "publish_time"
+        # 再次执行无需迁移
+        assert TimelineDB.migrate_legacy_dbs(str(tmp_path)) == []
+
+
+class TestDateRange:
+    """测试日期范围查询（标准化时间 + 索引范围扫描）"""
+
+    def _make(self, n, publish_time):
+        return Article(
+            title=f"标题{n}",
+            url=f"https://example.com/{n}",
+            source=SourceType.KR36,
+            publish_time=publish_time
+        )
+
+    def test_normalize_publish_time(self):
+        """时区/微秒统一为北京时间标准格式"""
+        from datetime import timezone
+
+        normalize = TimelineDB._normalize_publish_time
+        assert normalize(datetime(2026, 1, 1, 8, 0, 0, 123456)) == "2026-01-01T08:00:00"
+        assert normalize(datetime(2026, 1, 1, 0, 0, tzinfo=timezone.utc)) == "2026-01-01T08:00:00"
+        assert normalize("2026-01-01 08:00:00+08:00") == "2026-01-01T08:00:00"
+
+    def test_list_by_date_range(self, test_db):
+        """start_date/end_date 包含边界日"""
+        test_db.insert_articles_bulk([
+            self._make(1, datetime(2026, 1, 1, 23, 59, 59)),
+            self._make(2, datetime(2026, 1, 2, 0, 0, 0)),
+            self._make(3, datetime(2026, 1, 3, 12, 0, 0)),
+        ])
+        articles = test_db.list_articles(start_date="2026-01-02", end_date="2026-01-02")
+        assert [a["title"] for a in articles] == ["标题2"]
+        assert test_db.count_articles(start_date="2026-01-01", end_date="2026-01-02") == 2
+        assert test_db.count_articles(start_date="2026-01-02") == 2
+
+    def test_range_uses_index(self, test_db):
+        """日期范围条件可使用 publish_time 索引"""
+        conditions, params = TimelineDB._date_range_conditions(
+            "publish_time", "2026-01-02", "2026-01-02"
+        )
+        with test_db.get_connection() as conn:
+            plan = conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT id FROM articles WHERE {' AND '.join(conditions)}",
+                params
+            ).fetchall()
+        assert any("idx_articles_publish_time" in row[-1] for row in plan)
+
+    def test_init_db_normalizes_existing_rows(self, test_db):
+        """init_db 将旧格式时间标准化一次"""
+        with test_db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO articles (id, title, url, source, publish_time) VALUES (?, ?, ?, ?, ?)",
+                ("x1", "旧格式", "https://example.com/x1", "36kr", "2026-01-02T08:00:00.500000+08:00")
+            )
+            conn.execute("PRAGMA user_version = 0")
+            conn.commit()
+        from src.storage import schema_registry
+        schema_registry.invalidate(test_db.db_path)
+
+        test_db.init_db()
+        assert test_db.get_article("x1")["publish_time"] == "2026-01-02T08:00:00"
+
+
+class TestLegendListQuery:
+    """测试 legend 时间线查询（复合覆盖索引 + 投影）"""
+
+    def test_legend_query_uses_covering_index(self, test_db):
+        """按 legend 筛选 + 时间倒序：只读索引、无需排序"""
+        select_columns = TimelineDB._list_select("publish_time")
+        with test_db.get_connection() as conn:
+            plan = conn.execute(f"""
+                EXPLAIN QUERY PLAN
+                SELECT {select_columns} FROM articles
+                WHERE legend = ? ORDER BY publish_time DESC LIMIT ?
+            """, ("musk", 10)).fetchall()
+        details = " ".join(row[-1] for row in plan)
+        assert "COVERING INDEX idx_articles_legend_publish_time" in details
+        assert "TEMP B-TREE" not in details
+
+    def test_list_skips_json_columns(self, test_db):
+        """列表结果不包含 tags/entities"""
+        article = Article(
+            title="马斯克宣布星舰发射计划",
+            url="https://example.com/musk",
+            source=SourceType.KR36,
+            publish_time=datetime(2026, 1, 1, 8, 0),
+            tags=["星舰"],
+            legend="musk"
+        )
+        test_db.insert_article(article)
+        rows = test_db.list_articles_latest(limit=10, legend="musk")
+        assert rows[0]["title"] == article.title
+        assert "tags" not in rows[0] and "entities" not in rows[0]
+        # 详情仍返回完整字段
+        assert json.loads(test_db.get_article(article.id)["tags"]) == ["星舰"]
+
+    @pytest.mark.usefixtures("isolated_data_dir")
+    def test_admin_list_columns(self, test_db):
+        """/api/articles 的列表投影包含后台列表页渲染所需的列（含 tags 徽章）"""
+        from src.main import ARTICLES_INCLUDE_COLUMNS
+
+        article = Article(
+            title="马斯克宣布星舰发射计划",
+            url="https://example.com/musk",
+            source=SourceType.KR36,
+            publish_time=datetime(2026, 1, 1, 8, 0),
+            tags=["星舰"],
+            legend="musk"
+        )
+        test_db.insert_article(article)
+        rows = test_db.list_articles(limit=10, include=ARTICLES_INCLUDE_COLUMNS)
+        assert {"id", "title", "url", "source", "publish_time", "legend", "tags"} <= set(rows[0])
+        # admin.html 中为 JSON.parse(article.tags)
+        assert json.loads(rows[0]["tags"]) == ["星舰"]
+
+    def test_list_include_rejects_unknown_column(self, test_db):
+        """附加列只接受白名单中的列名"""
+        with pytest.raises(ValueError):
+            test_db.list_articles(limit=10, include=("content; DROP TABLE articles",))
+
+
+class TestArticleLabels:
+    """测试多标签关联表"""
+
+    def _labeled_article(self, title, url, hour):
+        from src.crawlers.keywords_filter import filter_by_keywords
+
+        article = Article(
+            title=title,
+            url=url,
+            source=SourceType.KR36,
+            publish_time=datetime(2026, 1, 1, hour, 0),
+        )
+        return filter_by_keywords([article])[0]
+
+    def test_filter_records_all_labels(self):
+        """同时提及多个 legend 与分类时全部记录"""
+        article = self._labeled_article("马斯克与黄仁勋谈大模型", "https://example.com/1", 8)
+
+        assert article.legend == "musk"
+        assert article.tags[:2] == ["musk", "huang"]
+        assert {(h.kind, h.label) for h in article.keyword_hits} >= {
+            ("legend", "musk"), ("legend", "huang")
+        }
+        assert "马斯克@0" in article.entities
+        assert "黄仁勋@4" in article.entities
+
+    def test_lookup_includes_co_mentions(self, test_db):
+        """按 legend 查询能查到次要提及的文章"""
+        co_mention = self._labeled_article("马斯克与黄仁勋谈大模型", "https://example.com/1", 8)
+        huang_only = self._labeled_article("英伟达发布新一代AI芯片", "https://example.com/2", 9)
+        test_db.insert_articles_bulk([co_mention, huang_only])
+
+        rows = test_db.list_articles_by_label("huang", limit=10)
+        assert [r["id"] for r in rows] == [huang_only.id, co_mention.id]
+        assert json.loads(rows[1]["label_hits"]) == [["黄仁勋", 4]]
+        # 主 legend 列不变
+        assert rows[1]["legend"] == "musk"
+        assert [r["id"] for r in test_db.list_articles_by_label("musk")] == [co_mention.id]
+
+    def test_lookup_uses_primary_key_index(self, test_db):
+        """标签查询走主键范围扫描、无需排序"""
+        with test_db.get_connection() as conn:
+            plan = conn.execute("""
+                EXPLAIN QUERY PLAN
+                SELECT article_id FROM article_labels
+                WHERE kind = ? AND label = ? ORDER BY publish_time DESC LIMIT 10
+            """, ("legend", "musk")).fetchall()
+        details = " ".join(row[-1] for row in plan)
+        assert "PRIMARY KEY" in details
+        assert "TEMP B-TREE" not in details
+
+    def test_legend_without_hits_and_replace(self, test_db):
+        """仅设置 legend 的文章也写入关联行；覆盖插入时重建"""
+        article = Article(
+            title="无关键词标题",
+            url="https://example.com/plain",
+            source=SourceType.KR36,
+            publish_time=datetime(2026, 1, 1, 8, 0),
+            legend="altman",
+        )
+        test_db.insert_article(article)
+        assert len(test_db.list_articles_by_label("altman")) == 1
+
+        article.legend = "musk"
+        test_db.insert_article(article)
+        assert test_db.list_articles_by_label("altman") == []
+        assert len(test_db.list_articles_by_label("musk")) == 1
+
+
+    def test_backfill_existing_articles(self, test_db):
+        """升级前已入库的文章按 legend 与 tags 回填，可按标签查询"""
+        from src.crawlers.keyword_index import FRONT_CATEGORIES
+        from src.storage import schema_registry
+
+        assert TimelineDB.LABEL_CATEGORIES == FRONT_CATEGORIES
+        with test_db.get_connection() as conn:
+            conn.execute("""
+                INSERT INTO articles (id, title, url, source, publish_time, tags, legend)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, ("old1", "马斯克与黄仁勋谈大模型", "https://example.com/old1", "36kr",
+                  "2026-01-01T08:00:00", json.dumps(["musk", "huang", "新星"], ensure_ascii=False),
+                  "musk"))
+            conn.execute("DELETE FROM article_labels")
+            conn.execute("PRAGMA user_version = 1")  # 引入标签关联表之前的库
+            conn.commit()
+        schema_registry.invalidate(test_db.db_path)
+        assert test_db.list_articles_by_label("musk") == []
+
+        test_db.init_db()
+        assert [r["id"] for r in test_db.list_articles_by_label("musk")] == ["old1"]
+        assert [r["id"] for r in test_db.list_articles_by_label("huang")] == ["old1"]
+        assert [r["id"] for r in test_db.list_articles_by_label("新星", kind="category")] == ["old1"]
+
+    def test_bulk_insert_labels_only_written_rows(self, test_db):
+        """被 INSERT OR IGNORE 跳过的文章不写标签关联行"""
+        first = Article(title="原文章", url="https://example.com/a", source=SourceType.KR36,
+                        publish_time=datetime(2026, 1, 1, 8, 0), legend="musk")
+        test_db.insert_article(first)
+        # id 冲突（URL 不同，不会被已存在 URL 检查拦下）
+        clash = Article(id=first.id, title="冲突文章", url="https://example.com/b",
+                        source=SourceType.KR36, publish_time=datetime(2026, 1, 1, 9, 0),
+                        legend="altman")
+        result = test_db.insert_articles_bulk([clash])
+        assert result["inserted"] == [] and result["skipped"] == [clash]
+        assert test_db.list_articles_by_label("altman") == []
+
+
+class TestKeysetPagination:
+    """测试键集（游标）分页"""
+
+    def _fill(self, db, n):
+        db.insert_articles_bulk([
+            Article(
+                title=f"标题{i}",
+                url=f"https://example.com/{i}",
+                source=SourceType.KR36,
+                publish_time=datetime(2026, 1, 1, 8, i)
+            )
+            for i in range(n)
+        ])
+
+    def test_cursor_roundtrip(self):
+        """游标编码可还原"""
+        cursor = TimelineDB.encode_cursor({"publish_time": "2026-01-01T08:00:00", "id": "abc"})
+        assert TimelineDB.decode_cursor(cursor) == ("2026-01-01T08:00:00", "abc")
+
+    def test_invalid_cursor(self):
+        """无效游标抛出 ValueError"""
+        with pytest.raises(ValueError):
+            TimelineDB.decode_cursor("not-a-cursor")
+
+    def test_before_pages_through_all(self, test_db):
+        """before 逐页向后翻，不重不漏"""
+        self._fill(test_db, 7)
+        seen = []
+        cursor = None
+        while True:
+            page = test_db.list_articles(limit=3, before=cursor)
+            if not page:
+                break
+            seen.extend(a["title"] for a in page)
+            cursor = TimelineDB.encode_cursor(page[-1])
+        assert seen == [f"标题{i}" for i in range(6, -1, -1)]
+
+    def test_after_returns_newer(self, test_db):
+        """after 只返回更新的文章，仍按时间倒序"""
+        self._fill(test_db, 5)
+        oldest = test_db.list_articles(limit=5)[-1]
+        newer = test_db.list_articles(limit=2, after=TimelineDB.encode_cursor(oldest))
+        # 紧邻游标的两条
+        assert [a["title"] for a in newer] == ["标题2", "标题1"]
+
+
+class TestMultiYear:
+    """测试跨年度库查询（k 路归并）"""
+
+    @pytest.fixture
+    def two_years(self, tmp_path, monkeypatch):
+        """在临时目录下创建今年和去年两个库"""
+        from datetime import date
+
+        monkeypatch.chdir(tmp_path)
+        this_year = date.today().year
+        for year in (this_year, this_year - 1):
+            db = TimelineDB(date(year, 1, 1))
+            db.init_db()
+            db.insert_articles_bulk([
+                Article(
+                    title=f"{year}-{i}",
+                    url=f"https://example.com/{year}/{i}",
+                    source=SourceType.KR36,
+                    publish_time=datetime(year, 6, 1, 8, i)
+                )
+                for i in range(4)
+            ])
+        return this_year
+
+    def test_merge_across_years(self, two_years):
+        """结果按时间倒序跨库合并"""
+        start = f"{two_years - 1}-01-01"
+        articles = TimelineDB.list_articles_multi_year(years=2, limit=6, start_date=start)
+        assert [a["title"] for a in articles] == (
+            [f"{two_years}-{i}" for i in range(3, -1, -1)]
+            + [f"{two_years - 1}-3", f"{two_years - 1}-2"]
+        )
+
+    def test_multi_year_include_tags(self, two_years):
+        """跨库列表同样返回附加列"""
+        start = f"{two_years - 1}-01-01"
+        articles = TimelineDB.list_articles_multi_year(years=2, limit=6, start_date=start,
+                                                       include=("tags",))
+        assert len(articles) == 6
+        assert all("tags" in a for a in articles)
+
+    def test_cursor_across_year_boundary(self, two_years):
+        """before 游标可跨年份边界继续翻页"""
+        start = f"{two_years - 1}-01-01"
+        first = TimelineDB.list_articles_multi_year(years=2, limit=3, start_date=start)
+        cursor = TimelineDB.encode_cursor(first[-1])
+        second = TimelineDB.list_articles_multi_year(years=2, limit=3, start_date=start,
+                                                     before=cursor)
+        assert [a["title"] for a in second] == [
+            f"{two_years}-0", f"{two_years - 1}-3", f"{two_years - 1}-2"
+        ]